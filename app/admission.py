@@ -0,0 +1,164 @@
+"""
+Agent Ethos - Admission Control
+Per-route concurrency limits with a bounded wait queue. Requests that
+cannot be admitted in time get a fast 503 with Retry-After instead of
+piling up on database pool checkout. Writes and reads have separate
+limits; while the connection pool is saturated, reads are shed outright.
+"""
+import asyncio
+from typing import Dict
+
+from fastapi import HTTPException, status
+
+from app.config import get_settings
+
+WRITE = "write"
+READ = "read"
+
+
+def pool_saturated(pool) -> bool:
+    """True when every connection a QueuePool may open is checked out."""
+    size = getattr(pool, "size", None)
+    if not callable(size):
+        return False
+    max_overflow = getattr(pool, "_max_overflow", -1)
+    if max_overflow < 0:
+        return False
+    return pool.checkedout() >= size() + max_overflow
+
+
+class AdmissionLimiter:
+    """At most `limit` requests in flight, `max_queue` waiting up to `queue_timeout` seconds."""
+
+    def __init__(self, name: str, priority: str, limit: int, max_queue: int, queue_timeout: float):
+        self.name = name
+        self.priority = priority
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(limit)
+        self.active = 0
+        self.waiting = 0
+        self.clear()
+
+    def clear(self):
+        """Reset the counters, and the slots too when none are held or awaited."""
+        if self.active == 0 and self.waiting == 0:
+            self._slots = asyncio.Semaphore(self.limit)
+        self.admitted = 0
+        self.shed = 0
+
+    def reject(self):
+        """Count a request shed without trying for a slot."""
+        self.shed += 1
+
+    async def acquire(self) -> bool:
+        """Take a slot, queueing if allowed. False means the request should be shed."""
+        if self._slots.locked() and self.waiting >= self.max_queue:
+            self.shed += 1
+            return False
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            return False
+        finally:
+            self.waiting -= 1
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    def release(self):
+        self.active -= 1
+        self._slots.release()
+
+    def stats(self) -> dict:
+        return {
+            "priority": self.priority,
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": self.waiting,
+            "admitted": self.admitted,
+            "shed": self.shed,
+        }
+
+
+class AdmissionController:
+    """Registry of route limiters, sharing the engine pool for saturation checks."""
+
+    def __init__(self):
+        self.limiters: Dict[str, AdmissionLimiter] = {}
+        self.pool = None
+        self.enabled = get_settings().admission_enabled
+
+    def limiter(self, name: str, priority: str) -> AdmissionLimiter:
+        settings = get_settings()
+        if priority == WRITE:
+            limiter = AdmissionLimiter(
+                name, priority,
+                settings.write_concurrency,
+                settings.write_queue_size,
+                settings.write_queue_timeout_ms / 1000,
+            )
+        else:
+            limiter = AdmissionLimiter(
+                name, priority,
+                settings.read_concurrency,
+                settings.read_queue_size,
+                settings.read_queue_timeout_ms / 1000,
+            )
+        self.limiters[name] = limiter
+        return limiter
+
+    def saturated(self) -> bool:
+        return self.pool is not None and pool_saturated(self.pool)
+
+    def clear(self):
+        for limiter in self.limiters.values():
+            limiter.clear()
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "pool_saturated": self.saturated(),
+            "routes": {name: limiter.stats() for name, limiter in self.limiters.items()},
+        }
+
+
+# Process-wide controller; app.database attaches the engine pool
+admission = AdmissionController()
+
+
+def overloaded(detail: str = "Server is busy, retry later") -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+        headers={"Retry-After": str(get_settings().retry_after_seconds)},
+    )
+
+
+def admit(name: str, priority: str = READ):
+    """
+    Route dependency enforcing a concurrency limit for one route. List it in
+    the decorator's `dependencies` so it runs before the session is opened.
+    """
+    limiter = admission.limiter(name, priority)
+
+    async def dependency():
+        if not admission.enabled:
+            yield
+            return
+        # With every pooled connection checked out a read would only wait on
+        # checkout, so shed it now; writes still wait their turn
+        if priority == READ and admission.saturated():
+            limiter.reject()
+            raise overloaded()
+        if not await limiter.acquire():
+            raise overloaded()
+        try:
+            yield
+        finally:
+            limiter.release()
+
+    return dependency
@@ -4,13 +4,15 @@ Agent Ethos - Authentication & Security
 import secrets
 import hashlib
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, status, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
+from app.context import set_request_agent
 from app.database import get_session
 from app.models import Agent
+from app.queries import agent_by_api_key_hash
 
 # Bearer token security scheme
 security = HTTPBearer(
@@ -54,11 +56,7 @@ async def get_agent_by_api_key(
     if not verify_api_key_format(api_key):
         return None
     
-    key_hash = hash_api_key(api_key)
-    result = await session.execute(
-        select(Agent).where(Agent.api_key_hash == key_hash)
-    )
-    return result.scalar_one_or_none()
+    return await agent_by_api_key_hash(session, hash_api_key(api_key))
 
 
 async def get_current_agent(
@@ -80,6 +78,7 @@ async def get_current_agent(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    set_request_agent(agent.id)
     return agent
 
 
@@ -96,5 +95,22 @@ async def get_optional_agent(
     if not credentials:
         return None
     
-    return await get_agent_by_api_key(session, credentials.credentials)
+    agent = await get_agent_by_api_key(session, credentials.credentials)
+    if agent:
+        set_request_agent(agent.id)
+    return agent
+
 
+async def require_admin(
+    x_admin_token: Optional[str] = Header(None, description="Admin token")
+):
+    """
+    Dependency guarding operational endpoints.
+    Raises 403 unless ADMIN_TOKEN is configured and matches X-Admin-Token.
+    """
+    admin_token = get_settings().admin_token
+    if not admin_token or not x_admin_token or not secrets.compare_digest(x_admin_token, admin_token):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
@@ -0,0 +1,126 @@
+"""
+Agent Ethos - Name Autocomplete Index
+In-process sorted array of lowercased agent names searched with bisect.
+"""
+import heapq
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+from sqlmodel import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Agent
+
+# Prefix ranges wider than this are ranked once and memoized
+SCAN_LIMIT = 256
+
+# Max suggestions per lookup (also the size of memoized rankings)
+MAX_RESULTS = 20
+
+
+class PrefixIndex:
+    """
+    Maps lowercased agent names to (id, name, reputation).
+
+    Names are kept sorted so a prefix is one contiguous slice found with
+    two bisects. Wide slices (short prefixes) are ranked once and memoized
+    until an agent inside them changes.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self):
+        self._keys: List[str] = []
+        self._ids: List[int] = []
+        self._names: Dict[int, str] = {}
+        self._reputation: Dict[int, int] = {}
+        self._ranked: Dict[str, List[int]] = {}
+        self.loaded = False
+
+    def load(self, rows: List[Tuple[int, str, int]]):
+        """Replace the index contents with (id, name, reputation) rows."""
+        self.clear()
+        pairs = sorted((name.lower(), agent_id) for agent_id, name, _ in rows)
+        self._keys = [key for key, _ in pairs]
+        self._ids = [agent_id for _, agent_id in pairs]
+        for agent_id, name, reputation in rows:
+            self._names[agent_id] = name
+            self._reputation[agent_id] = reputation
+        self.loaded = True
+
+    def add(self, agent_id: int, name: str, reputation: int = 0):
+        """Insert a newly registered agent."""
+        if agent_id in self._names:
+            return
+        key = name.lower()
+        position = bisect_left(self._keys, key)
+        self._keys.insert(position, key)
+        self._ids.insert(position, agent_id)
+        self._names[agent_id] = name
+        self._reputation[agent_id] = reputation
+        self._invalidate(key)
+
+    def set_reputation(self, agent_id: int, reputation: int):
+        """Record a new reputation for an indexed agent."""
+        name = self._names.get(agent_id)
+        if name is None or self._reputation[agent_id] == reputation:
+            return
+        self._reputation[agent_id] = reputation
+        self._invalidate(name.lower())
+
+    def complete(self, prefix: str, limit: int = 10) -> List[dict]:
+        """
+        Return up to `limit` agents whose name starts with `prefix`,
+        highest reputation first.
+        """
+        prefix = prefix.lower()
+        limit = min(limit, MAX_RESULTS)
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + "\U0010ffff", lo)
+
+        if hi - lo <= SCAN_LIMIT:
+            ranked = self._rank(self._ids[lo:hi], limit)
+        else:
+            ranked = self._ranked.get(prefix)
+            if ranked is None:
+                ranked = self._rank(self._ids[lo:hi], MAX_RESULTS)
+                self._ranked[prefix] = ranked
+            ranked = ranked[:limit]
+
+        return [
+            {
+                "id": agent_id,
+                "name": self._names[agent_id],
+                "reputation": self._reputation[agent_id],
+            }
+            for agent_id in ranked
+        ]
+
+    def _rank(self, ids: List[int], limit: int) -> List[int]:
+        return heapq.nsmallest(
+            limit,
+            ids,
+            key=lambda agent_id: (-self._reputation[agent_id], self._names[agent_id].lower()),
+        )
+
+    def _invalidate(self, key: str):
+        stale = [prefix for prefix in self._ranked if key.startswith(prefix)]
+        for prefix in stale:
+            del self._ranked[prefix]
+
+
+# Process-wide index, loaded in the app lifespan
+name_index = PrefixIndex()
+
+
+async def load_name_index(session: AsyncSession, index: Optional[PrefixIndex] = None):
+    """Populate the index from the agents table."""
+    if index is None:
+        index = name_index
+    result = await session.execute(
+        select(Agent.id, Agent.name, Agent.reputation)
+    )
+    index.load(result.all())
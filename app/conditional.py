@@ -0,0 +1,35 @@
+"""
+Agent Ethos - Conditional Requests
+ETags for agent-scoped reads, derived from Agent.version. Every vouch or
+flag that touches an agent bumps its version, so a matching If-None-Match
+can be answered with 304 from the agent row alone.
+"""
+from typing import Optional
+from fastapi import Response, status
+
+
+def agent_etag(agent_id: int, version: int, scope: str) -> str:
+    """Strong ETag for a `scope` representation of one agent's data."""
+    return f'"{scope}-{agent_id}-{version}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag` (RFC 9110)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    # Clients may store the response but must revalidate before reuse
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
@@ -23,6 +23,58 @@ class Settings(BaseSettings):
     # Environment
     environment: str = "development"
     
+    # Admin endpoints - token for the X-Admin-Token header (empty disables them)
+    admin_token: str = ""
+    
+    # Logging - level, "json" or "text", share of access/SQL info records kept, queue bound
+    log_level: str = "INFO"
+    log_format: str = "json"
+    log_sample_rate: float = 1.0
+    log_queue_size: int = 10000
+    
+    # Readiness - /ready fails above these; loop lag is sampled every loop_lag_interval_ms
+    ready_db_latency_ms: int = 1000
+    ready_max_pool_utilization: float = 1.0
+    ready_max_loop_lag_ms: int = 500
+    loop_lag_interval_ms: int = 500
+    
+    # Request profiling - sampled share of requests (0 disables) and output directory
+    profile_sample_rate: float = 0.0
+    profile_dir: str = "./profiles"
+    profile_max_files: int = 50
+    
+    # Slow query log - threshold in ms (0 disables) and entries kept
+    slow_query_ms: int = 0
+    slow_query_log_size: int = 100
+    
+    # Statement caching - compiled SQL per engine, and asyncpg prepared statements per connection
+    query_cache_size: int = 500
+    pg_prepared_statement_cache_size: int = 500
+    
+    # Admission control - per-route concurrency limits, bounded queues and pool checkout wait
+    admission_enabled: bool = True
+    write_concurrency: int = 10
+    write_queue_size: int = 100
+    write_queue_timeout_ms: int = 5000
+    read_concurrency: int = 50
+    read_queue_size: int = 200
+    read_queue_timeout_ms: int = 1000
+    db_pool_timeout_seconds: float = 5.0
+    retry_after_seconds: int = 1
+    
+    # Share one in-flight computation between identical concurrent reads
+    singleflight_enabled: bool = True
+    
+    # Vouch graph snapshot for warm starts and workers (empty disables)
+    graph_snapshot_path: str = ""
+    
+    # Reputation history - daily rollup interval (0 disables)
+    history_rollup_interval_seconds: int = 300
+    
+    # Recommendations - recompute interval (0 disables) and worker processes
+    recommendations_interval_seconds: int = 3600
+    recommendations_workers: int = 2
+    
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
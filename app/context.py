@@ -0,0 +1,100 @@
+"""
+Agent Ethos - Request Context
+Makes the current request's ASGI scope available to code that has no
+Request object, such as engine event hooks and log filters, and writes
+one access log record per request.
+"""
+import logging
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Optional
+
+request_scope: ContextVar[Optional[dict]] = ContextVar("request_scope", default=None)
+
+access_logger = logging.getLogger("app.access")
+
+# Incoming X-Request-ID values are reused when they look like ids
+REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def current_route() -> Optional[str]:
+    """Method and route template of the current request, e.g. `GET /api/v1/vouches`."""
+    scope = request_scope.get()
+    if scope is None:
+        return None
+    # FastAPI adds the matched route to the scope during routing
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path")
+    return f"{scope.get('method')} {path}"
+
+
+def request_info() -> dict:
+    """Request id, route and authenticated agent id of the current request."""
+    scope = request_scope.get()
+    if scope is None:
+        return {}
+    state = scope.get("state") or {}
+    return {
+        "request_id": state.get("request_id"),
+        "route": current_route(),
+        "agent_id": state.get("agent_id"),
+    }
+
+
+def set_request_agent(agent_id: int):
+    """Record the authenticated agent on the current request."""
+    scope = request_scope.get()
+    if scope is not None:
+        scope.setdefault("state", {})["agent_id"] = agent_id
+
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware that publishes the scope for the request's duration,
+    assigns a request id (echoed as X-Request-ID) and logs the response.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if request_id is None or not REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        status_code = None
+
+        async def send_with_request_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        token = request_scope.set(scope)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            if access_logger.isEnabledFor(logging.INFO):
+                access_logger.info(
+                    f"{scope['method']} {scope['path']} {status_code}",
+                    extra={
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        "status": status_code,
+                        "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+                    },
+                )
+            request_scope.reset(token)
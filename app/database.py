@@ -2,11 +2,17 @@
 Agent Ethos - Database Configuration
 Compatible with SQLite (dev) and PostgreSQL (production)
 """
+import logging
 from sqlmodel import SQLModel
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from app.config import get_settings
+from app.search import ensure_search_index
+from app.slowlog import slow_query_log
+from app.admission import admission
 
 settings = get_settings()
 
@@ -15,13 +21,34 @@ settings = get_settings()
 connect_args = {}
 if settings.database_url.startswith("sqlite"):
     connect_args["check_same_thread"] = False
+elif settings.database_url.startswith("postgresql+asyncpg"):
+    # Prepared statements per connection, keyed by the compiled SQL string
+    connect_args["prepared_statement_cache_size"] = settings.pg_prepared_statement_cache_size
+
+# Bounded wait for a pooled connection (in-memory SQLite uses a static pool)
+pool_args = {}
+if ":memory:" not in settings.database_url:
+    pool_args["pool_timeout"] = settings.db_pool_timeout_seconds
 
 engine = create_async_engine(
     settings.database_url,
-    echo=not settings.is_production,
     connect_args=connect_args,
+    query_cache_size=settings.query_cache_size,
+    **pool_args,
 )
 
+# Admission control sheds reads early once this pool is saturated
+admission.pool = engine.sync_engine.pool
+
+# SQL echo outside production, through the queued root handler rather than
+# the synchronous stdout handler that echo=True installs
+if not settings.is_production:
+    logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+
+# Opt-in slow query log with background EXPLAIN
+if settings.slow_query_ms > 0:
+    slow_query_log.install(engine, settings.slow_query_ms, settings.slow_query_log_size)
+
 # Async session factory
 async_session = sessionmaker(
     engine,
@@ -30,10 +57,45 @@ async_session = sessionmaker(
 )
 
 
+# Columns added to existing tables after their first release, with the DDL
+# that adds and backfills them; create_all only creates missing tables
+ADDED_COLUMNS = [
+    ("agents", "version", "INTEGER NOT NULL DEFAULT 0"),
+]
+
+# Indexes from older releases superseded by a model index, dropped once
+# the replacement exists so writes stop maintaining both
+REPLACED_INDEXES = {
+    "ix_flags_vouch": "ix_flags_vouch_created",
+    "ix_vouches_to_agent": "ix_vouches_to_agent_created",
+    "ix_vouches_from_agent": "ix_vouches_from_agent_created",
+}
+
+
+def upgrade_schema(connection: Connection):
+    """
+    Bring tables created by an older release up to date: add missing
+    columns, create missing indexes and drop the ones they replace. Safe
+    to run on every start.
+    """
+    inspector = inspect(connection)
+    for table_name, column, ddl in ADDED_COLUMNS:
+        if column not in {existing["name"] for existing in inspector.get_columns(table_name)}:
+            connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column} {ddl}"))
+    for table in SQLModel.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+    # Replacements were created above, so the old indexes can go
+    for old in REPLACED_INDEXES:
+        connection.execute(text(f"DROP INDEX IF EXISTS {old}"))
+
+
 async def init_db():
     """Initialize database tables."""
     async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(upgrade_schema)
+        await conn.run_sync(ensure_search_index)
 
 
 async def get_session() -> AsyncSession:
@@ -0,0 +1,272 @@
+"""
+Agent Ethos - Reputation Event Stream
+Writes reputation events alongside vouches and flags, and fans committed
+events out to live subscribers (Server-Sent Events on the leaderboard).
+"""
+import asyncio
+import json
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, List, Optional, Set
+from sqlmodel import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Agent, ReputationEvent
+
+# Agents tracked for live rank changes
+TOP_AGENTS_SIZE = 100
+
+# Distinct pending agents a subscriber may lag behind before it is dropped
+MAX_PENDING_PER_SUBSCRIBER = 1000
+
+# Seconds between keepalive comments on an idle stream
+KEEPALIVE_SECONDS = 15.0
+
+# Events replayed for a reconnecting client (Last-Event-ID)
+MAX_REPLAY_EVENTS = 1000
+
+# Event ids below a job's watermark that it re-reads on every run. Ids are
+# allocated at insert, not at commit, so on PostgreSQL an event can become
+# visible after a higher id was already consumed; this covers the ids still
+# in flight in concurrent transactions.
+WATERMARK_SAFETY_WINDOW = 1000
+
+
+class Subscriber:
+    """
+    One live stream. Pending events are keyed by agent, so rapid changes
+    to the same agent collapse into the latest one.
+    """
+
+    __slots__ = ("pending", "wakeup", "closed")
+
+    def __init__(self):
+        self.pending: "OrderedDict[int, dict]" = OrderedDict()
+        self.wakeup = asyncio.Event()
+        self.closed = False
+
+    def drain(self) -> List[dict]:
+        events = list(self.pending.values())
+        self.pending.clear()
+        self.wakeup.clear()
+        return events
+
+
+class ReputationHub:
+    """In-process broadcast of reputation events to subscribers."""
+
+    def __init__(self, max_pending: int = MAX_PENDING_PER_SUBSCRIBER):
+        self.max_pending = max_pending
+        self._subscribers: Set[Subscriber] = set()
+        self.published = 0
+        self.coalesced = 0
+        self.evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self) -> Subscriber:
+        subscriber = Subscriber()
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+        subscriber.closed = True
+        subscriber.wakeup.set()
+
+    def publish(self, event: dict):
+        """Queue `event` for every subscriber, evicting ones that lag too far."""
+        self.published += 1
+        agent_id = event["agent_id"]
+        for subscriber in list(self._subscribers):
+            pending = subscriber.pending
+            if agent_id in pending:
+                del pending[agent_id]
+                self.coalesced += 1
+            elif len(pending) >= self.max_pending:
+                self.evicted += 1
+                self.unsubscribe(subscriber)
+                continue
+            pending[agent_id] = event
+            subscriber.wakeup.set()
+
+    def clear(self):
+        for subscriber in list(self._subscribers):
+            self.unsubscribe(subscriber)
+        self.published = self.coalesced = self.evicted = 0
+
+    def stats(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "coalesced": self.coalesced,
+            "evicted": self.evicted,
+        }
+
+
+class TopAgents:
+    """
+    The top of the leaderboard kept in memory so events can carry ranks
+    without a count query per write. Ordered like get_leaderboard.
+    """
+
+    def __init__(self, size: int = TOP_AGENTS_SIZE):
+        self.size = size
+        self.clear()
+
+    def clear(self):
+        self._entries: Dict[int, dict] = {}
+        self._order: List[int] = []
+        self.loaded = False
+
+    async def load(self, session: AsyncSession):
+        result = await session.execute(
+            select(Agent.id, Agent.name, Agent.reputation, Agent.created_at)
+            .order_by(Agent.reputation.desc(), Agent.created_at.asc())
+            .limit(self.size)
+        )
+        self._entries = {
+            agent_id: {"id": agent_id, "name": name, "reputation": reputation, "created_at": created_at}
+            for agent_id, name, reputation, created_at in result.all()
+        }
+        self._sort()
+        self.loaded = True
+
+    def _key(self, agent_id: int):
+        entry = self._entries[agent_id]
+        return (-entry["reputation"], entry["created_at"])
+
+    def _sort(self):
+        self._order = sorted(self._entries, key=self._key)
+
+    async def update(self, session: AsyncSession, agent: Agent) -> Optional[int]:
+        """Apply the agent's new reputation and return its 1-based rank, if in the top."""
+        entry = {"id": agent.id, "name": agent.name, "reputation": agent.reputation, "created_at": agent.created_at}
+        if not self.loaded or len(self._order) < self.size:
+            # Small tables are cheap to reread and may have new agents
+            await self.load(session)
+        elif agent.id in self._entries:
+            self._entries[agent.id] = entry
+            self._sort()
+            if self._order[-1] == agent.id:
+                # It may now rank below agents that are not tracked
+                await self.load(session)
+        elif (-agent.reputation, agent.created_at) < self._key(self._order[-1]):
+            self._entries[agent.id] = entry
+            self._sort()
+            del self._entries[self._order.pop()]
+
+        if agent.id in self._entries:
+            return self._order.index(agent.id) + 1
+        return None
+
+    def snapshot(self) -> List[dict]:
+        return [
+            {
+                "rank": rank,
+                "id": agent_id,
+                "name": self._entries[agent_id]["name"],
+                "reputation": self._entries[agent_id]["reputation"],
+            }
+            for rank, agent_id in enumerate(self._order, start=1)
+        ]
+
+
+# Process-wide hub and leaderboard tracker
+hub = ReputationHub()
+top_agents = TopAgents()
+
+
+def record_reputation_event(
+    session: AsyncSession,
+    agent: Agent,
+    kind: str,
+    delta: int = 0,
+    vouch_id: Optional[int] = None,
+) -> ReputationEvent:
+    """Add an event row to the caller's transaction."""
+    event = ReputationEvent(
+        agent_id=agent.id,
+        kind=kind,
+        vouch_id=vouch_id,
+        delta=delta,
+        reputation=agent.reputation,
+    )
+    session.add(event)
+    return event
+
+
+async def publish_event(session: AsyncSession, event: ReputationEvent, agent: Agent):
+    """Broadcast a committed event to live subscribers."""
+    rank = await top_agents.update(session, agent)
+    hub.publish({
+        "id": event.id,
+        "agent_id": agent.id,
+        "name": agent.name,
+        "kind": event.kind,
+        "delta": event.delta,
+        "reputation": event.reputation,
+        "rank": rank,
+        "created_at": event.created_at.isoformat(),
+    })
+
+
+async def replay_events(session: AsyncSession, last_event_id: int) -> List[dict]:
+    """Committed events after `last_event_id`, for reconnecting clients."""
+    result = await session.execute(
+        select(ReputationEvent, Agent.name)
+        .join(Agent, Agent.id == ReputationEvent.agent_id)
+        .where(ReputationEvent.id > last_event_id)
+        .order_by(ReputationEvent.id)
+        .limit(MAX_REPLAY_EVENTS)
+    )
+    return [
+        {
+            "id": event.id,
+            "agent_id": event.agent_id,
+            "name": name,
+            "kind": event.kind,
+            "delta": event.delta,
+            "reputation": event.reputation,
+            "rank": None,
+            "created_at": event.created_at.isoformat(),
+        }
+        for event, name in result.all()
+    ]
+
+
+def format_sse(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    lines = []
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def event_stream(
+    subscriber: Subscriber,
+    leaderboard: List[dict],
+    replay: List[dict],
+    keepalive_seconds: float = KEEPALIVE_SECONDS,
+) -> AsyncIterator[str]:
+    """
+    Yield SSE frames: the current leaderboard, any replayed events, then
+    live events until the subscriber is closed.
+    """
+    try:
+        yield format_sse("leaderboard", {"leaderboard": leaderboard})
+        for event in replay:
+            yield format_sse("reputation", event, event["id"])
+
+        while not subscriber.closed:
+            if not subscriber.pending:
+                try:
+                    await asyncio.wait_for(subscriber.wakeup.wait(), keepalive_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+            for event in subscriber.drain():
+                yield format_sse("reputation", event, event["id"])
+    finally:
+        hub.unsubscribe(subscriber)
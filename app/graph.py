@@ -0,0 +1,446 @@
+"""
+Agent Ethos - In-Memory Vouch Graph
+Compressed sparse row (CSR) adjacency over agent ids, built from the
+vouches table and kept current by create_vouch through a small overlay.
+Rebuilding the arrays is O(E) pure Python, so it runs in a worker thread
+and the result is swapped in on the event loop.
+"""
+import asyncio
+from array import array
+from bisect import bisect_left
+from collections import deque
+from functools import partial
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from sqlmodel import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Vouch
+
+# Fold the overlay into the CSR arrays once it holds this share of edges
+COMPACT_RATIO = 0.05
+
+# ...but never for fewer overlay edges than this
+COMPACT_MIN_EDGES = 4096
+
+# Rows fetched per round trip while loading
+LOAD_BATCH_SIZE = 50_000
+
+
+# Switch from a linear merge to binary searches past this size ratio
+GALLOP_RATIO = 16
+
+
+def intersect_sorted(a, b) -> List[int]:
+    """
+    Intersect two ascending sequences of unique ids.
+
+    Similar sizes use a linear two-pointer merge. When one side is much
+    smaller, each of its ids is binary-searched in the larger side
+    instead, with the search window moving forward as matches advance.
+    """
+    if len(a) > len(b):
+        a, b = b, a
+    common = []
+    if not a:
+        return common
+
+    if len(b) >= GALLOP_RATIO * len(a):
+        lo = 0
+        for value in a:
+            lo = bisect_left(b, value, lo)
+            if lo == len(b):
+                break
+            if b[lo] == value:
+                common.append(value)
+        return common
+
+    i = j = 0
+    len_a, len_b = len(a), len(b)
+    while i < len_a and j < len_b:
+        x, y = a[i], b[j]
+        if x == y:
+            common.append(x)
+            i += 1
+            j += 1
+        elif x < y:
+            i += 1
+        else:
+            j += 1
+    return common
+
+
+def _build_csr(keys: array, values: array, scores: array, num_nodes: int) -> Tuple[array, array, array]:
+    """
+    Counting-sort edges by `keys` into (offsets, values, scores).
+    Stable, so values stay in input order within each row.
+    """
+    offsets = array("q", bytes(8 * (num_nodes + 1)))
+    for key in keys:
+        offsets[key + 1] += 1
+    for node in range(num_nodes):
+        offsets[node + 1] += offsets[node]
+
+    cursor = array("q", offsets[:-1])
+    out_values = array("i", bytes(4 * len(values)))
+    out_scores = array("b", bytes(len(scores)))
+    for key, value, score in zip(keys, values, scores):
+        position = cursor[key]
+        out_values[position] = value
+        out_scores[position] = score
+        cursor[key] = position + 1
+    return offsets, out_values, out_scores
+
+
+def _merge_csr(offsets, neighbors, scores, changes: Dict[int, Dict[int, int]], num_nodes: int) -> Tuple[array, array, array]:
+    """
+    Fold `changes` into CSR arrays, returning new arrays. Reads its inputs
+    without modifying them, so it can run off the event loop.
+    """
+    base_nodes = len(offsets) - 1
+    out_offsets = array("q", [0])
+    out_neighbors, out_scores = array("i"), array("b")
+    for node in range(max(num_nodes, base_nodes)):
+        lo, hi = (offsets[node], offsets[node + 1]) if node < base_nodes else (0, 0)
+        row_changes = changes.get(node)
+        if row_changes:
+            row = dict(zip(neighbors[lo:hi], scores[lo:hi]))
+            row.update(row_changes)
+            for neighbor in sorted(row):
+                out_neighbors.append(neighbor)
+                out_scores.append(row[neighbor])
+        else:
+            # Untouched rows are already sorted
+            out_neighbors.extend(neighbors[lo:hi])
+            out_scores.extend(scores[lo:hi])
+        out_offsets.append(len(out_neighbors))
+    return out_offsets, out_neighbors, out_scores
+
+
+def build_graph_csr(froms: array, tos: array, scores: array) -> Tuple[tuple, tuple, int]:
+    """(out_csr, in_csr, num_nodes) from parallel edge arrays sorted by (from, to)."""
+    num_nodes = max(max(froms, default=0), max(tos, default=0)) + 1
+    return (
+        _build_csr(froms, tos, scores, num_nodes),
+        _build_csr(tos, froms, scores, num_nodes),
+        num_nodes,
+    )
+
+
+class _Adjacency:
+    """
+    One direction of the graph: CSR arrays plus an overlay of changes.
+    While a rebuild is in flight, the changes it is folding in sit in
+    `pending`, between the arrays and the overlay taking new changes.
+    """
+
+    def __init__(self):
+        self.offsets = array("q", [0])
+        self.neighbors = array("i")
+        self.scores = array("b")
+        self.overlay: Dict[int, Dict[int, int]] = {}
+        self.overlay_edges = 0
+        self.pending: Dict[int, Dict[int, int]] = {}
+        self.pending_edges = 0
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.offsets) - 1
+
+    def _base_position(self, node: int, neighbor: int) -> int:
+        if node >= self.num_nodes:
+            return -1
+        lo, hi = self.offsets[node], self.offsets[node + 1]
+        position = bisect_left(self.neighbors, neighbor, lo, hi)
+        if position < hi and self.neighbors[position] == neighbor:
+            return position
+        return -1
+
+    def set(self, node: int, neighbor: int, score: int) -> bool:
+        """Record an edge score. Returns True if the edge is new."""
+        changes = self.overlay.setdefault(node, {})
+        is_new = (
+            neighbor not in changes
+            and neighbor not in self.pending.get(node, ())
+            and self._base_position(node, neighbor) < 0
+        )
+        if neighbor not in changes:
+            self.overlay_edges += 1
+        changes[neighbor] = score
+        return is_new
+
+    def edges(self, node: int) -> Iterator[Tuple[int, int]]:
+        changes = self.overlay.get(node)
+        pending = self.pending.get(node)
+        if node < self.num_nodes:
+            for position in range(self.offsets[node], self.offsets[node + 1]):
+                neighbor = self.neighbors[position]
+                if (changes is None or neighbor not in changes) and (pending is None or neighbor not in pending):
+                    yield neighbor, self.scores[position]
+        if pending:
+            for neighbor, score in pending.items():
+                if changes is None or neighbor not in changes:
+                    yield neighbor, score
+        if changes:
+            yield from changes.items()
+
+    def freeze(self, num_nodes: int) -> Callable[[], Tuple[array, array, array]]:
+        """
+        Move the overlay to `pending` and return a builder for the merged
+        arrays. Neither the arrays nor `pending` change until `adopt` or
+        `thaw`, so the builder may run in another thread.
+        """
+        self.pending, self.pending_edges = self.overlay, self.overlay_edges
+        self.overlay, self.overlay_edges = {}, 0
+        return partial(_merge_csr, self.offsets, self.neighbors, self.scores, self.pending, num_nodes)
+
+    def adopt(self, csr: Tuple[array, array, array]):
+        """Swap in arrays built from the current ones plus `pending`."""
+        self.offsets, self.neighbors, self.scores = csr
+        self.pending, self.pending_edges = {}, 0
+
+    def thaw(self):
+        """Return `pending` to the overlay after a failed rebuild."""
+        for node, changes in self.pending.items():
+            row = self.overlay.setdefault(node, {})
+            for neighbor, score in changes.items():
+                if neighbor not in row:
+                    row[neighbor] = score
+                    self.overlay_edges += 1
+        self.pending, self.pending_edges = {}, 0
+
+    def memory_bytes(self) -> int:
+        base = sum(a.itemsize * len(a) for a in (self.offsets, self.neighbors, self.scores))
+        # Rough dict cost: ~100 bytes per overlay entry
+        return base + 100 * (self.overlay_edges + self.pending_edges)
+
+
+class TrustGraph:
+    """
+    Directed vouch graph indexed by agent id in both directions.
+
+    Outgoing edges (from -> to) and incoming edges (to -> from) are stored
+    as CSR arrays: `offsets[id]:offsets[id + 1]` slices the sorted neighbor
+    ids and their scores. Changes since the last build live in a dict
+    overlay that shadows the arrays; once it grows, new arrays are built
+    in a worker thread and swapped in, one rebuild at a time.
+    """
+
+    def __init__(self):
+        self._generation = 0
+        self.clear()
+
+    def clear(self):
+        self._out = _Adjacency()
+        self._in = _Adjacency()
+        self._num_nodes = 0
+        self._num_edges = 0
+        self.loaded = False
+        # A rebuild still in flight belongs to the old arrays and is discarded
+        self._generation += 1
+        self._compaction: Optional[asyncio.Task] = None
+
+    def load(self, froms: array, tos: array, scores: array):
+        """Build the graph from parallel edge arrays sorted by (from, to)."""
+        out_csr, in_csr, num_nodes = build_graph_csr(froms, tos, scores)
+        self.load_csr(out_csr, in_csr, num_nodes, len(froms))
+
+    def load_csr(self, out_csr: tuple, in_csr: tuple, num_nodes: int, num_edges: int):
+        """
+        Adopt prebuilt (offsets, neighbors, scores) arrays for each direction.
+        Any sequence with the array interface works, including read-only
+        memoryviews over a snapshot; compaction replaces them with arrays.
+        """
+        self.clear()
+        self._out.offsets, self._out.neighbors, self._out.scores = out_csr
+        self._in.offsets, self._in.neighbors, self._in.scores = in_csr
+        self._num_nodes = num_nodes
+        self._num_edges = num_edges
+        self.loaded = True
+
+    def set_edge(self, from_id: int, to_id: int, score: int):
+        """Insert or replace the vouch edge from -> to."""
+        if self._out.set(from_id, to_id, score):
+            self._num_edges += 1
+        self._in.set(to_id, from_id, score)
+        self._num_nodes = max(self._num_nodes, from_id + 1, to_id + 1)
+
+        threshold = max(COMPACT_MIN_EDGES, COMPACT_RATIO * self._num_edges)
+        if self._out.overlay_edges >= threshold and self._compaction is None:
+            try:
+                self._start_compaction()
+            except RuntimeError:
+                # No running loop (scripts and tests): rebuild inline
+                self._out.adopt(self._out.freeze(self._num_nodes)())
+                self._in.adopt(self._in.freeze(self._num_nodes)())
+
+    def _start_compaction(self) -> asyncio.Task:
+        if self._compaction is None:
+            self._compaction = asyncio.get_running_loop().create_task(self._rebuild())
+        return self._compaction
+
+    async def _rebuild(self):
+        generation = self._generation
+        build_out = self._out.freeze(self._num_nodes)
+        build_in = self._in.freeze(self._num_nodes)
+        out_adjacency, in_adjacency = self._out, self._in
+        try:
+            out_csr, in_csr = await asyncio.to_thread(lambda: (build_out(), build_in()))
+        except BaseException:
+            if generation == self._generation:
+                out_adjacency.thaw()
+                in_adjacency.thaw()
+                self._compaction = None
+            raise
+        if generation == self._generation:
+            out_adjacency.adopt(out_csr)
+            in_adjacency.adopt(in_csr)
+            self._compaction = None
+
+    async def compact(self):
+        """Fold every change made so far into the CSR arrays."""
+        if self._compaction is not None:
+            await asyncio.shield(self._compaction)
+        if self._out.overlay_edges:
+            await asyncio.shield(self._start_compaction())
+
+    async def out_csr(self) -> Tuple[array, array, array]:
+        """Outgoing edges as (offsets, targets, scores) with the overlay folded in."""
+        await self.compact()
+        # Rebuilds replace the arrays rather than mutating them, so these
+        # stay consistent for the caller
+        return self._out.offsets, self._out.neighbors, self._out.scores
+
+    def out_edges(self, node: int) -> Iterator[Tuple[int, int]]:
+        return self._out.edges(node)
+
+    def in_edges(self, node: int) -> Iterator[Tuple[int, int]]:
+        return self._in.edges(node)
+
+    def find_path(
+        self,
+        source: int,
+        target: int,
+        max_depth: int = 3,
+        min_score: int = 1,
+    ) -> Optional[List[Tuple[int, int, int]]]:
+        """
+        Shortest chain of vouches with score >= min_score from source to
+        target, as (from_id, to_id, score) hops. Bidirectional BFS that
+        always expands the smaller frontier. Returns None if no path
+        exists within max_depth hops.
+        """
+        if source == target:
+            return []
+
+        # parent maps: node -> (previous node, score of the connecting edge)
+        forward = {source: None}
+        backward = {target: None}
+        forward_frontier = [source]
+        backward_frontier = [target]
+        depth = 0
+
+        while forward_frontier and backward_frontier and depth < max_depth:
+            depth += 1
+            expand_forward = len(forward_frontier) <= len(backward_frontier)
+            if expand_forward:
+                frontier, visited, other, edges = forward_frontier, forward, backward, self.out_edges
+            else:
+                frontier, visited, other, edges = backward_frontier, backward, forward, self.in_edges
+
+            next_frontier = []
+            for node in frontier:
+                for neighbor, score in edges(node):
+                    if score < min_score or neighbor in visited:
+                        continue
+                    visited[neighbor] = (node, score)
+                    if neighbor in other:
+                        return self._join(forward, backward, neighbor)
+                    next_frontier.append(neighbor)
+
+            if expand_forward:
+                forward_frontier = next_frontier
+            else:
+                backward_frontier = next_frontier
+
+        return None
+
+    def personalized_rank(
+        self,
+        source: int,
+        alpha: float = 0.15,
+        epsilon: float = 1e-4,
+    ) -> Dict[int, float]:
+        """
+        Approximate personalized PageRank seeded at `source` over positive
+        vouches weighted by score, using local forward push. Each push
+        settles at least alpha * epsilon of the probability mass, so work
+        is bounded by 1 / (alpha * epsilon) pushes regardless of graph size.
+        """
+        estimate: Dict[int, float] = {}
+        residual: Dict[int, float] = {source: 1.0}
+        queue = deque([source])
+
+        while queue:
+            node = queue.popleft()
+            mass = residual.pop(node, 0.0)
+            estimate[node] = estimate.get(node, 0.0) + alpha * mass
+
+            edges = [(neighbor, score) for neighbor, score in self.out_edges(node) if score > 0]
+            if not edges:
+                # Dead end: the walk restarts at the source
+                edges = [(source, 1)]
+            spread = (1 - alpha) * mass / sum(score for _, score in edges)
+            for neighbor, score in edges:
+                before = residual.get(neighbor, 0.0)
+                after = before + spread * score
+                residual[neighbor] = after
+                if before < epsilon <= after:
+                    queue.append(neighbor)
+
+        return estimate
+
+    @staticmethod
+    def _join(forward: dict, backward: dict, meet: int) -> List[Tuple[int, int, int]]:
+        hops = []
+        node = meet
+        while forward[node] is not None:
+            previous, score = forward[node]
+            hops.append((previous, node, score))
+            node = previous
+        hops.reverse()
+        node = meet
+        while backward[node] is not None:
+            following, score = backward[node]
+            hops.append((node, following, score))
+            node = following
+        return hops
+
+    def stats(self) -> dict:
+        return {
+            "nodes": self._num_nodes,
+            "edges": self._num_edges,
+            "overlay_edges": self._out.overlay_edges + self._out.pending_edges,
+            "memory_bytes": self._out.memory_bytes() + self._in.memory_bytes(),
+        }
+
+
+# Process-wide graph, loaded in the app lifespan
+trust_graph = TrustGraph()
+
+
+async def load_trust_graph(session: AsyncSession, graph: Optional[TrustGraph] = None):
+    """Populate the graph from the vouches table, building the arrays in a worker thread."""
+    if graph is None:
+        graph = trust_graph
+    froms, tos, scores = array("i"), array("i"), array("b")
+    result = await session.stream(
+        select(Vouch.from_agent_id, Vouch.to_agent_id, Vouch.score)
+        .order_by(Vouch.from_agent_id, Vouch.to_agent_id)
+    )
+    async for rows in result.partitions(LOAD_BATCH_SIZE):
+        for from_id, to_id, score in rows:
+            froms.append(from_id)
+            tos.append(to_id)
+            scores.append(score)
+    out_csr, in_csr, num_nodes = await asyncio.to_thread(build_graph_csr, froms, tos, scores)
+    graph.load_csr(out_csr, in_csr, num_nodes, len(froms))
@@ -0,0 +1,127 @@
+"""
+Agent Ethos - Readiness Checks
+Database round-trip latency, connection pool usage, cache hit rates and
+event-loop lag, compared against configurable thresholds so the platform
+health check can drain an instance that is up but not keeping up.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.history import movers_cache
+from app.trust import personalized_cache
+
+logger = logging.getLogger(__name__)
+
+# Lag samples kept; readiness looks at the worst of them
+LAG_WINDOW = 10
+
+
+class LoopLagMonitor:
+    """Background ticker measuring how late the event loop wakes it up."""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.samples: deque = deque(maxlen=LAG_WINDOW)
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, interval: Optional[float] = None):
+        if interval is not None:
+            self.interval = interval
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, (time.perf_counter() - expected) * 1000))
+
+    def clear(self):
+        self.samples.clear()
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "last_ms": round(self.samples[-1], 3) if self.samples else None,
+            "max_ms": round(max(self.samples), 3) if self.samples else None,
+        }
+
+
+# Process-wide ticker, started by the application lifespan
+loop_lag = LoopLagMonitor()
+
+
+def pool_stats(pool) -> dict:
+    """Checked-out and overflow counts of a QueuePool; other pools report no capacity."""
+    size = getattr(pool, "size", None)
+    if not callable(size):
+        return {"checked_out": None, "overflow": None, "capacity": None}
+    max_overflow = getattr(pool, "_max_overflow", -1)
+    return {
+        "size": size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+        "capacity": size() + max_overflow if max_overflow >= 0 else None,
+    }
+
+
+async def database_latency(session: AsyncSession, timeout: float) -> Optional[float]:
+    """Round trip of `SELECT 1` in ms, including pool checkout; None on failure or timeout."""
+    started = time.perf_counter()
+    try:
+        await asyncio.wait_for(session.execute(text("SELECT 1")), timeout)
+    except Exception as exc:
+        logger.warning(f"Readiness database check failed: {exc.__class__.__name__}")
+        return None
+    return (time.perf_counter() - started) * 1000
+
+
+async def readiness(session: AsyncSession, pool) -> dict:
+    """Run every check; `ready` is False when any threshold is exceeded."""
+    settings = get_settings()
+    failures: List[str] = []
+
+    # Read the pool before the probe checks out a connection of its own
+    pool_report = pool_stats(pool)
+    if pool_report["capacity"]:
+        utilization = pool_report["checked_out"] / pool_report["capacity"]
+        pool_report["utilization"] = round(utilization, 3)
+        if utilization >= settings.ready_max_pool_utilization:
+            failures.append("pool")
+
+    latency = await database_latency(session, settings.ready_db_latency_ms / 1000)
+    if latency is None:
+        failures.append("database")
+
+    lag = loop_lag.stats()
+    if lag["max_ms"] is not None and lag["max_ms"] > settings.ready_max_loop_lag_ms:
+        failures.append("event_loop")
+
+    return {
+        "ready": not failures,
+        "failures": failures,
+        "database": {"latency_ms": round(latency, 3) if latency is not None else None},
+        "pool": pool_report,
+        "event_loop_lag": lag,
+        "caches": {
+            "personalized_trust": personalized_cache.stats(),
+            "movers": movers_cache.stats(),
+        },
+    }
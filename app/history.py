@@ -0,0 +1,287 @@
+"""
+Agent Ethos - Reputation History
+Streaming jobs fold new reputation events into per-agent daily rollups and
+hourly deltas. Each tracks its position in the event log with a watermark,
+so a run reads only events past it plus a trailing safety window for
+events that committed out of id order. Every bucket those events touch is
+recomputed from the log and written as an absolute value, so reading an
+event twice never counts it twice. The hourly deltas back the windowed
+"top movers" leaderboards.
+"""
+import asyncio
+import heapq
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Set, Tuple
+from sqlmodel import select, delete
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import LRUCache
+from app.events import WATERMARK_SAFETY_WINDOW
+from app.models import Agent, ReputationEvent, ReputationDaily, ReputationHourly, JobWatermark
+
+logger = logging.getLogger(__name__)
+
+# Watermark names of the rollup jobs
+DAILY_ROLLUP_JOB = "reputation_daily"
+HOURLY_ROLLUP_JOB = "reputation_hourly"
+
+# Events folded per transaction
+ROLLUP_BATCH_SIZE = 10_000
+
+# Top-mover windows; hourly buckets older than the longest are pruned
+MOVER_WINDOWS = {
+    "24h": timedelta(hours=24),
+    "7d": timedelta(days=7),
+    "30d": timedelta(days=30),
+}
+HOURLY_RETENTION = max(MOVER_WINDOWS.values()) + timedelta(days=1)
+
+# Movers kept per window; requests slice from this
+MOVERS_TOP_K = 100
+
+# Computed windows are shared by all requests for a minute
+movers_cache = LRUCache(max_entries=len(MOVER_WINDOWS), ttl_seconds=60)
+
+
+def upsert(session: AsyncSession, model):
+    """INSERT ... ON CONFLICT for the session's dialect."""
+    if session.bind.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+
+async def get_watermark(session: AsyncSession, job: str) -> int:
+    position = await session.scalar(select(JobWatermark.position).where(JobWatermark.name == job))
+    return position or 0
+
+
+async def set_watermark(session: AsyncSession, job: str, position: int):
+    stmt = upsert(session, JobWatermark).values(name=job, position=position)
+    await session.execute(stmt.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"position": stmt.excluded.position},
+    ))
+
+
+def truncate_hour(value: datetime) -> datetime:
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+async def _events_after_watermark(session: AsyncSession, job: str, batch_size: int) -> Tuple[list, int, int]:
+    """
+    Up to `batch_size` events past the job's watermark, preceded by any in
+    the safety window below it. The window is only read when there are
+    new events, so an idle run costs one query. Returns (events, number
+    past the watermark, new watermark).
+    """
+    watermark = await get_watermark(session, job)
+    columns = (ReputationEvent.id, ReputationEvent.agent_id, ReputationEvent.created_at)
+    result = await session.execute(
+        select(*columns)
+        .where(ReputationEvent.id > watermark)
+        .order_by(ReputationEvent.id)
+        .limit(batch_size)
+    )
+    new_events = result.all()
+    if not new_events:
+        return [], 0, watermark
+
+    result = await session.execute(
+        select(*columns)
+        .where(
+            ReputationEvent.id > watermark - WATERMARK_SAFETY_WINDOW,
+            ReputationEvent.id <= watermark,
+        )
+        .order_by(ReputationEvent.id)
+    )
+    return result.all() + new_events, len(new_events), new_events[-1][0]
+
+
+async def _bucket_events(session: AsyncSession, agent_ids: Set[int], start: datetime, end: datetime) -> list:
+    """Every event of `agent_ids` created in [start, end), in log order."""
+    result = await session.execute(
+        select(
+            ReputationEvent.agent_id,
+            ReputationEvent.kind,
+            ReputationEvent.delta,
+            ReputationEvent.reputation,
+            ReputationEvent.created_at,
+        )
+        .where(
+            ReputationEvent.agent_id.in_(agent_ids),
+            ReputationEvent.created_at >= start,
+            ReputationEvent.created_at < end,
+        )
+        .order_by(ReputationEvent.id)
+    )
+    return result.all()
+
+
+async def rollup_daily_history(session: AsyncSession, batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+    """
+    Recompute the reputation_daily rows touched by up to `batch_size`
+    events past the watermark (and by the safety window), then advance
+    the watermark in the same transaction. Returns the number of events
+    past the watermark. Does not commit.
+    """
+    events, consumed, position = await _events_after_watermark(session, DAILY_ROLLUP_JOB, batch_size)
+    if not consumed:
+        return 0
+
+    touched = {(agent_id, created_at.date()) for _, agent_id, created_at in events}
+    first = min(day for _, day in touched)
+    last = max(day for _, day in touched)
+    days: Dict[Tuple[int, date], dict] = {}
+    for agent_id, kind, delta, reputation, created_at in await _bucket_events(
+        session,
+        {agent_id for agent_id, _ in touched},
+        datetime.combine(first, datetime.min.time()),
+        datetime.combine(last + timedelta(days=1), datetime.min.time()),
+    ):
+        key = (agent_id, created_at.date())
+        if key not in touched:
+            continue
+        row = days.get(key)
+        if row is None:
+            row = days[key] = {
+                "agent_id": agent_id, "day": key[1], "reputation": reputation, "delta": 0, "vouches": 0, "flags": 0,
+            }
+        # Events arrive in log order, so the last one sets the closing value
+        row["reputation"] = reputation
+        row["delta"] += delta
+        if kind == "vouch":
+            row["vouches"] += 1
+        elif kind == "flag":
+            row["flags"] += 1
+
+    stmt = upsert(session, ReputationDaily)
+    await session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["agent_id", "day"],
+            set_={
+                "reputation": stmt.excluded.reputation,
+                "delta": stmt.excluded.delta,
+                "vouches": stmt.excluded.vouches,
+                "flags": stmt.excluded.flags,
+            },
+        ),
+        list(days.values()),
+    )
+    await set_watermark(session, DAILY_ROLLUP_JOB, position)
+    return consumed
+
+
+async def rollup_hourly_deltas(session: AsyncSession, batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+    """
+    Recompute the reputation_hourly buckets touched by up to `batch_size`
+    events past the watermark (and by the safety window), prune buckets
+    past the retention, and advance the watermark. Returns the number of
+    events past the watermark. Does not commit.
+    """
+    events, consumed, position = await _events_after_watermark(session, HOURLY_ROLLUP_JOB, batch_size)
+    if not consumed:
+        return 0
+
+    touched = {(truncate_hour(created_at), agent_id) for _, agent_id, created_at in events}
+    buckets: Dict[Tuple[datetime, int], int] = {}
+    for agent_id, _, delta, _, created_at in await _bucket_events(
+        session,
+        {agent_id for _, agent_id in touched},
+        min(hour for hour, _ in touched),
+        max(hour for hour, _ in touched) + timedelta(hours=1),
+    ):
+        key = (truncate_hour(created_at), agent_id)
+        if delta and key in touched:
+            buckets[key] = buckets.get(key, 0) + delta
+
+    if buckets:
+        stmt = upsert(session, ReputationHourly)
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["hour", "agent_id"],
+                set_={"delta": stmt.excluded.delta},
+            ),
+            [{"hour": hour, "agent_id": agent_id, "delta": delta} for (hour, agent_id), delta in buckets.items()],
+        )
+    await session.execute(
+        delete(ReputationHourly).where(ReputationHourly.hour < datetime.utcnow() - HOURLY_RETENTION)
+    )
+    await set_watermark(session, HOURLY_ROLLUP_JOB, position)
+    return consumed
+
+
+async def catch_up_history(session_factory, batch_size: int = ROLLUP_BATCH_SIZE) -> int:
+    """Run each rollup over every pending event, batch by batch. Returns events consumed."""
+    consumed = 0
+    for rollup in (rollup_daily_history, rollup_hourly_deltas):
+        while True:
+            async with session_factory() as session:
+                applied = await rollup(session, batch_size)
+                await session.commit()
+            consumed += applied
+            if applied < batch_size:
+                break
+    return consumed
+
+
+async def get_top_movers(session: AsyncSession, window: str) -> List[dict]:
+    """
+    Agents with the largest reputation gain over `window`, best first.
+    One range read over the hourly buckets, summed per agent, then a top-k
+    heap selection. Served from the cache while fresh.
+    """
+    movers = movers_cache.get(window)
+    if movers is not None:
+        return movers
+
+    since = truncate_hour(datetime.utcnow() - MOVER_WINDOWS[window])
+    result = await session.execute(
+        select(ReputationHourly.agent_id, ReputationHourly.delta)
+        .where(ReputationHourly.hour >= since)
+    )
+    gains: Dict[int, int] = {}
+    for agent_id, delta in result.all():
+        gains[agent_id] = gains.get(agent_id, 0) + delta
+    # Ties go to the older (lower id) agent
+    top = heapq.nlargest(
+        MOVERS_TOP_K,
+        ((agent_id, gain) for agent_id, gain in gains.items() if gain > 0),
+        key=lambda item: (item[1], -item[0]),
+    )
+
+    movers = []
+    if top:
+        agents_result = await session.execute(
+            select(Agent.id, Agent.name, Agent.reputation)
+            .where(Agent.id.in_([agent_id for agent_id, _ in top]))
+        )
+        agents = {agent_id: (name, reputation) for agent_id, name, reputation in agents_result.all()}
+        movers = [
+            {
+                "id": agent_id,
+                "name": agents[agent_id][0],
+                "reputation": agents[agent_id][1],
+                "gain": gain,
+            }
+            for agent_id, gain in top
+            if agent_id in agents
+        ]
+
+    movers_cache.set(window, movers)
+    return movers
+
+
+async def run_history_rollup_periodically(session_factory, interval_seconds: int):
+    """Background task: fold new events into the rollups every `interval_seconds`."""
+    while True:
+        try:
+            consumed = await catch_up_history(session_factory)
+            if consumed:
+                logger.info(f"Reputation history rolled up ({consumed} events)")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Reputation history rollup failed")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,152 @@
+"""
+Agent Ethos - Logging Pipeline
+Request handlers only enqueue log records; a QueueListener thread formats
+them as JSON and writes them out, so a slow stdout never blocks the event
+loop. Records carry the request id, route and agent id of the request
+that logged them, and high-volume info logs can be sampled.
+"""
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, TextIO
+
+from app.context import request_info
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+# Per-request access log and SQL echo; their INFO records are sampled
+HIGH_VOLUME_LOGGERS = ("app.access", "sqlalchemy.engine")
+
+# Request attributes copied onto each record and into the JSON output
+CONTEXT_FIELDS = ("request_id", "route", "agent_id")
+EXTRA_FIELDS = ("method", "path", "status", "latency_ms")
+
+
+class ContextFilter(logging.Filter):
+    """Stamps records with the current request, before they leave its context."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        info = request_info()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, info.get(field))
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a `rate` share of INFO-and-below records from high-volume loggers."""
+
+    def __init__(self, rate: float = 1.0, loggers=HIGH_VOLUME_LOGGERS):
+        super().__init__()
+        self.rate = rate
+        self.loggers = tuple(loggers)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or record.levelno > logging.INFO:
+            return True
+        if not record.name.startswith(self.loggers):
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in CONTEXT_FIELDS + EXTRA_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        # QueueHandler.prepare has already folded any traceback into the message
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that drops records, and counts them, when the queue is full."""
+
+    def __init__(self, records: queue.Queue):
+        super().__init__(records)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _StderrHandler(logging.StreamHandler):
+    """Writes to whatever sys.stderr is at emit time (it is swapped by test runners)."""
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+
+_handler: Optional[DroppingQueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(
+    level: str = "INFO",
+    json_format: bool = True,
+    sample_rate: float = 1.0,
+    queue_size: int = 10_000,
+    stream: Optional[TextIO] = None,
+) -> DroppingQueueHandler:
+    """Route the root logger through a bounded queue to a background writer."""
+    global _handler, _listener
+    shutdown_logging()
+
+    output = logging.StreamHandler(stream) if stream is not None else _StderrHandler()
+    output.setFormatter(JsonFormatter() if json_format else logging.Formatter(TEXT_FORMAT))
+
+    records: queue.Queue = queue.Queue(queue_size)
+    _handler = DroppingQueueHandler(records)
+    _handler.addFilter(SamplingFilter(sample_rate))
+    _handler.addFilter(ContextFilter())
+    _listener = QueueListener(records, output, respect_handler_level=True)
+    _listener.start()
+
+    root = logging.getLogger()
+    root.setLevel(level.upper())
+    root.addHandler(_handler)
+
+    # Uvicorn installs its own synchronous handlers; send its records through
+    # the queue too, and leave access logging to RequestContextMiddleware
+    for name in ("uvicorn", "uvicorn.error", "uvicorn.access"):
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers.clear()
+        uvicorn_logger.propagate = True
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+
+    return _handler
+
+
+def shutdown_logging():
+    """Flush queued records and detach the pipeline."""
+    global _handler, _listener
+    if _handler is not None:
+        logging.getLogger().removeHandler(_handler)
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
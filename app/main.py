@@ -2,26 +2,42 @@
 Agent Ethos - Main Application
 A reputation platform for AI agents.
 """
+import asyncio
 import logging
 from pathlib import Path
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
 from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, PlainTextResponse
 
 from app.config import get_settings
-from app.database import init_db
+from app.database import init_db, async_session, engine, get_session
+from app.autocomplete import name_index, load_name_index
+from app.graph import trust_graph, load_trust_graph
+from app.snapshot import load_trust_graph_snapshot
+from app.recommendations import run_recommendations_periodically
+from app.history import run_history_rollup_periodically
+from app.reputation import reputation_queue
+from app.context import RequestContextMiddleware
+from app.profiling import ProfilingMiddleware
+from app.admission import overloaded
+from app.health import loop_lag, readiness
+from app.logs import configure_logging
 from app.routes import api_router
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+settings = get_settings()
+
+# Configure logging: records are queued and written by a background thread
+configure_logging(
+    level=settings.log_level,
+    json_format=settings.log_format == "json",
+    sample_rate=settings.log_sample_rate,
+    queue_size=settings.log_queue_size,
 )
 logger = logging.getLogger(__name__)
 
-settings = get_settings()
-
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -35,10 +51,59 @@ async def lifespan(app: FastAPI):
     await init_db()
     logger.info("Database initialized")
     
+    # Load in-memory name index for autocomplete
+    async with async_session() as session:
+        await load_name_index(session)
+    logger.info(f"Name index loaded ({len(name_index)} agents)")
+    
+    # Load in-memory vouch graph for trust-path queries, from the snapshot if present
+    snapshot_path = settings.graph_snapshot_path
+    async with async_session() as session:
+        snapshot = None
+        if snapshot_path and Path(snapshot_path).exists():
+            try:
+                snapshot, replayed = await load_trust_graph_snapshot(session, snapshot_path)
+                logger.info(f"Vouch graph mapped from {snapshot_path} (watermark {snapshot.watermark}, {replayed} replayed)")
+            except ValueError as exc:
+                logger.warning(f"Graph snapshot unusable ({exc}), loading from the database")
+        if snapshot is None:
+            await load_trust_graph(session)
+    logger.info(f"Vouch graph loaded ({trust_graph.stats()})")
+    
+    # Event-loop lag ticker for /ready
+    loop_lag.start(settings.loop_lag_interval_ms / 1000)
+    
+    # Reputation recompute worker
+    reputation_worker = asyncio.create_task(reputation_queue.run(async_session))
+    
+    background_tasks = []
+    
+    # Daily reputation history rollup
+    if settings.history_rollup_interval_seconds > 0:
+        background_tasks.append(asyncio.create_task(run_history_rollup_periodically(
+            async_session,
+            settings.history_rollup_interval_seconds,
+        )))
+    
+    # Periodic recommendations refresh
+    if settings.recommendations_interval_seconds > 0:
+        background_tasks.append(asyncio.create_task(run_recommendations_periodically(
+            async_session,
+            settings.recommendations_interval_seconds,
+            settings.recommendations_workers,
+            snapshot_path or None,
+        )))
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Agent Ethos API...")
+    await reputation_queue.stop(reputation_worker)
+    logger.info(f"Reputation queue drained ({reputation_queue.stats()})")
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await loop_lag.stop()
 
 
 # Create FastAPI app
@@ -91,16 +156,40 @@ else:
         allow_headers=["*"],
     )
 
+# Request ids, access log and the request scope for engine hooks and log records
+app.add_middleware(RequestContextMiddleware)
+
+# On-demand profiling (X-Profile with an admin token, or sampled)
+app.add_middleware(ProfilingMiddleware)
+
 # Include API routes
 app.include_router(api_router, prefix=settings.api_prefix)
 
 
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """No database connection within DB_POOL_TIMEOUT_SECONDS: ask the client to retry."""
+    logger.warning(f"Database pool checkout timed out on {request.url.path}")
+    error = overloaded("Database is busy, retry later")
+    return JSONResponse(status_code=error.status_code, content={"detail": error.detail}, headers=error.headers)
+
+
 @app.get("/health", tags=["Health"])
 async def health_check():
     """Health check endpoint."""
     return {"ok": True}
 
 
+@app.get("/ready", tags=["Health"])
+async def readiness_check(session: AsyncSession = Depends(get_session)):
+    """
+    Readiness endpoint: database latency, pool usage, cache hit rates and
+    event-loop lag. Returns 503 when any READY_* threshold is exceeded.
+    """
+    report = await readiness(session, engine.sync_engine.pool)
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint with API info."""
@@ -4,6 +4,9 @@ Agent Ethos - Data Models
 from app.models.agent import Agent
 from app.models.vouch import Vouch
 from app.models.flag import Flag
+from app.models.recommendation import Recommendation
+from app.models.event import ReputationEvent
+from app.models.history import ReputationDaily, ReputationHourly, JobWatermark
 
-__all__ = ["Agent", "Vouch", "Flag"]
+__all__ = ["Agent", "Vouch", "Flag", "Recommendation", "ReputationEvent", "ReputationDaily", "ReputationHourly", "JobWatermark"]
 
@@ -2,7 +2,7 @@
 Agent Ethos - Agent Model
 """
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from sqlmodel import SQLModel, Field
 from sqlalchemy import Column, String, Index
 
@@ -41,9 +41,14 @@ class Agent(AgentBase, table=True):
         default_factory=datetime.utcnow,
         description="Registration timestamp"
     )
+    version: int = Field(
+        default=0,
+        description="Bumped by every vouch or flag touching the agent (ETag source)"
+    )
     
     __table_args__ = (
         Index("ix_agents_name_lower", "name"),
+        Index("ix_agents_reputation", "reputation"),
     )
 
 
@@ -60,6 +65,14 @@ class AgentPublic(AgentBase):
     created_at: datetime
 
 
+class AgentBatchRequest(SQLModel):
+    """Schema for batch profile lookup."""
+    names: List[str] = Field(default_factory=list, description="Agent names (case-insensitive)")
+    ids: List[int] = Field(default_factory=list, description="Agent IDs")
+    include_vouches: bool = Field(default=False, description="Include recent vouches per agent")
+    vouches_limit: int = Field(default=10, ge=1, le=50, description="Recent vouches per agent")
+
+
 class AgentRegisterResponse(SQLModel):
     """Response after successful registration."""
     success: bool = True
@@ -0,0 +1,42 @@
+"""
+Agent Ethos - Reputation Event Model
+"""
+from datetime import datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
+
+
+class ReputationEvent(SQLModel, table=True):
+    """Append-only log of reputation-affecting changes."""
+    __tablename__ = "reputation_events"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    agent_id: int = Field(
+        foreign_key="agents.id",
+        description="Agent whose reputation changed"
+    )
+    kind: str = Field(
+        max_length=16,
+        description="What caused the event: vouch, flag or recompute"
+    )
+    vouch_id: Optional[int] = Field(
+        default=None,
+        foreign_key="vouches.id",
+        description="Vouch that caused the event"
+    )
+    delta: int = Field(
+        default=0,
+        description="Reputation change"
+    )
+    reputation: int = Field(
+        description="Reputation after the change"
+    )
+    created_at: datetime = Field(
+        default_factory=datetime.utcnow,
+        description="Event timestamp"
+    )
+    
+    __table_args__ = (
+        Index("ix_reputation_events_agent", "agent_id", "created_at"),
+    )
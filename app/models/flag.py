@@ -35,7 +35,7 @@ class Flag(FlagBase, table=True):
     
     __table_args__ = (
         UniqueConstraint("vouch_id", "flagger_agent_id", name="uq_flag_vouch_flagger"),
-        Index("ix_flags_vouch", "vouch_id"),
+        Index("ix_flags_vouch_created", "vouch_id", "created_at"),
     )
 
 
@@ -0,0 +1,69 @@
+"""
+Agent Ethos - Reputation History Models
+"""
+from datetime import date, datetime
+from sqlmodel import SQLModel, Field
+
+
+class ReputationDaily(SQLModel, table=True):
+    """Per-agent daily rollup of reputation events; only days with activity have a row."""
+    __tablename__ = "reputation_daily"
+    
+    agent_id: int = Field(
+        foreign_key="agents.id",
+        primary_key=True,
+        description="Agent the rollup is for"
+    )
+    day: date = Field(
+        primary_key=True,
+        description="UTC day"
+    )
+    reputation: int = Field(
+        description="Reputation after the day's last event"
+    )
+    delta: int = Field(
+        default=0,
+        description="Net reputation change over the day"
+    )
+    vouches: int = Field(
+        default=0,
+        description="Vouches received or rescored that day"
+    )
+    flags: int = Field(
+        default=0,
+        description="Flags raised on the agent's vouches that day"
+    )
+
+
+class ReputationHourly(SQLModel, table=True):
+    """Net reputation change per agent per UTC hour, for windowed leaderboards."""
+    __tablename__ = "reputation_hourly"
+    
+    # hour leads the primary key so a time window is one index range
+    hour: datetime = Field(
+        primary_key=True,
+        description="Start of the UTC hour"
+    )
+    agent_id: int = Field(
+        foreign_key="agents.id",
+        primary_key=True,
+        description="Agent the bucket is for"
+    )
+    delta: int = Field(
+        description="Net reputation change within the hour"
+    )
+
+
+class JobWatermark(SQLModel, table=True):
+    """Last reputation event id consumed by a streaming job."""
+    __tablename__ = "job_watermarks"
+    
+    name: str = Field(
+        primary_key=True,
+        max_length=32,
+        description="Job name"
+    )
+    position: int = Field(
+        default=0,
+        description="Highest event id already applied"
+    )
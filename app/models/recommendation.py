@@ -0,0 +1,34 @@
+"""
+Agent Ethos - Recommendation Model
+"""
+from sqlmodel import SQLModel, Field
+
+
+class Recommendation(SQLModel, table=True):
+    """Precomputed "agents you may trust" entry, one row per rank."""
+    __tablename__ = "recommendations"
+    
+    agent_id: int = Field(
+        foreign_key="agents.id",
+        primary_key=True,
+        description="Agent the recommendation is for"
+    )
+    rank: int = Field(
+        primary_key=True,
+        description="Position in the agent's list (0 = best)"
+    )
+    recommended_agent_id: int = Field(
+        foreign_key="agents.id",
+        description="Recommended agent"
+    )
+    score: float = Field(
+        description="Co-vouch similarity score"
+    )
+
+
+class RecommendationPublic(SQLModel):
+    """Public recommendation response."""
+    id: int
+    name: str
+    reputation: int
+    score: float
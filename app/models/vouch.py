@@ -50,8 +50,8 @@ class Vouch(VouchBase, table=True):
     
     __table_args__ = (
         UniqueConstraint("from_agent_id", "to_agent_id", name="uq_vouch_from_to"),
-        Index("ix_vouches_to_agent", "to_agent_id"),
-        Index("ix_vouches_from_agent", "from_agent_id"),
+        Index("ix_vouches_to_agent_created", "to_agent_id", "created_at"),
+        Index("ix_vouches_from_agent_created", "from_agent_id", "created_at"),
     )
 
 
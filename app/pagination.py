@@ -0,0 +1,94 @@
+"""
+Agent Ethos - Keyset Pagination Helpers
+"""
+import base64
+import binascii
+from datetime import datetime
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import and_, or_
+
+
+def _encode(*parts) -> str:
+    raw = "|".join(str(part) for part in parts).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode(cursor: str) -> Tuple[str, str]:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    raw = base64.urlsafe_b64decode(padded.encode()).decode()
+    head, row_id = raw.rsplit("|", 1)
+    return head, row_id
+
+
+def _invalid_cursor() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid cursor"
+    )
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Encode a (created_at, id) position as an opaque cursor string.
+    """
+    return _encode(created_at.isoformat(), row_id)
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+    Raises 400 if the cursor is malformed.
+    """
+    try:
+        created_at, row_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise _invalid_cursor()
+
+
+def keyset_before(created_at_col, id_col, cursor: Optional[str]):
+    """
+    Build the WHERE clause for the page after `cursor` when ordering by
+    (created_at DESC, id DESC). Returns None for the first page.
+    """
+    if not cursor:
+        return None
+    created_at, row_id = decode_cursor(cursor)
+    return or_(
+        created_at_col < created_at,
+        and_(created_at_col == created_at, id_col < row_id),
+    )
+
+
+def encode_score_cursor(score: float, row_id: int) -> str:
+    """
+    Encode a (score, id) position as an opaque cursor string.
+    """
+    return _encode(repr(float(score)), row_id)
+
+
+def decode_score_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Decode a cursor produced by encode_score_cursor.
+    Raises 400 if the cursor is malformed.
+    """
+    try:
+        score, row_id = _decode(cursor)
+        return float(score), int(row_id)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        raise _invalid_cursor()
+
+
+def keyset_after_score(score_col, id_col, cursor: Optional[str]):
+    """
+    Build the WHERE clause for the page after `cursor` when ordering by
+    (score ASC, id ASC). Returns None for the first page.
+    """
+    if not cursor:
+        return None
+    score, row_id = decode_score_cursor(cursor)
+    return or_(
+        score_col > score,
+        and_(score_col == score, id_col > row_id),
+    )
@@ -0,0 +1,224 @@
+"""
+Agent Ethos - On-Demand Request Profiling
+Runs selected requests under cProfile and records their SQL timings. A
+request is profiled when it carries `X-Profile: 1` with a valid admin
+token, or when it falls in the configured sample. Results go to a
+bounded directory and are served by the admin routes.
+
+Profiles are process-wide: cProfile hooks the event loop thread, so a
+profile also counts whatever other requests and background tasks ran
+while it was recording. Read it on a quiet instance, or weigh it by the
+request's own SQL timings, which are per request. Streaming responses
+are never profiled, and a profile stops recording after
+MAX_PROFILE_SECONDS.
+"""
+import asyncio
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import random
+import re
+import secrets
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Functions listed in the text report
+REPORT_LINES = 40
+
+# A profile stops recording after this long, even if the response has not finished
+MAX_PROFILE_SECONDS = 30.0
+
+PROFILE_ID = re.compile(r"^[0-9]+-[0-9a-f]{8}$")
+
+# (statement, duration_ms) for the profiled request, None otherwise
+_request_queries: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_queries", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    queries = _request_queries.get()
+    started = getattr(context, "_profile_started", None)
+    if queries is not None and started is not None:
+        queries.append((statement, round((time.perf_counter() - started) * 1000, 3)))
+
+
+class ProfileStore:
+    """A directory holding the most recent `max_files` profiles."""
+
+    def __init__(self, directory: str, max_files: int = 50):
+        self.directory = Path(directory)
+        self.max_files = max_files
+
+    def save(self, profile: cProfile.Profile, summary: dict) -> str:
+        """Write `<id>.prof` (pstats) and `<id>.json`, then prune. Returns the id."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profile_id = f"{int(time.time() * 1000)}-{secrets.token_hex(4)}"
+        profile.dump_stats(self.directory / f"{profile_id}.prof")
+
+        report = io.StringIO()
+        pstats.Stats(profile, stream=report).sort_stats("cumulative").print_stats(REPORT_LINES)
+        summary = {"id": profile_id, **summary, "report": report.getvalue()}
+        (self.directory / f"{profile_id}.json").write_text(json.dumps(summary))
+
+        self.prune()
+        return profile_id
+
+    def _ids(self) -> List[str]:
+        if not self.directory.is_dir():
+            return []
+        # Ids start with a millisecond timestamp, so name order is age order
+        return sorted(
+            (path.stem for path in self.directory.glob("*.json") if PROFILE_ID.match(path.stem)),
+            reverse=True,
+        )
+
+    def prune(self):
+        for profile_id in self._ids()[self.max_files:]:
+            for suffix in (".json", ".prof"):
+                try:
+                    os.remove(self.directory / f"{profile_id}{suffix}")
+                except FileNotFoundError:
+                    pass
+
+    def list(self, limit: int = 50) -> List[dict]:
+        """Summaries of recent profiles, newest first, without the text report."""
+        summaries = []
+        for profile_id in self._ids()[:limit]:
+            summary = self.get(profile_id)
+            if summary is not None:
+                summary.pop("report", None)
+                summary.pop("queries", None)
+                summaries.append(summary)
+        return summaries
+
+    def get(self, profile_id: str) -> Optional[dict]:
+        if not PROFILE_ID.match(profile_id):
+            return None
+        try:
+            return json.loads((self.directory / f"{profile_id}.json").read_text())
+        except FileNotFoundError:
+            return None
+
+    def stats_path(self, profile_id: str) -> Optional[Path]:
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}.prof"
+        return path if path.is_file() else None
+
+
+# Process-wide store, shared by the middleware and the admin routes
+profile_store = ProfileStore(get_settings().profile_dir, get_settings().profile_max_files)
+
+
+class ProfilingMiddleware:
+    """
+    Pure ASGI middleware. Requests that are not selected go straight to
+    the app; the SQL timing hooks are only attached while a profile runs.
+    One request is profiled at a time, since cProfile hooks the whole
+    thread and would also see concurrent requests.
+    """
+
+    def __init__(self, app, store: Optional[ProfileStore] = None, sample_rate: Optional[float] = None):
+        self.app = app
+        self.store = store or profile_store
+        self.sample_rate = get_settings().profile_sample_rate if sample_rate is None else sample_rate
+        self._active = False
+
+    def _requested(self, scope) -> bool:
+        requested = token = None
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                requested = value
+            elif name == b"x-admin-token":
+                token = value
+        if requested != b"1":
+            return False
+        admin_token = get_settings().admin_token
+        return bool(admin_token) and token is not None and secrets.compare_digest(token, admin_token.encode())
+
+    @staticmethod
+    def _streaming(scope) -> bool:
+        """Long-lived responses (SSE streams) would keep a profile open indefinitely."""
+        if scope["path"].endswith("/stream"):
+            return True
+        return any(name == b"accept" and b"text/event-stream" in value for name, value in scope["headers"])
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._active or self._streaming(scope) or not (
+            (self.sample_rate and random.random() < self.sample_rate) or self._requested(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        status_code = None
+        duration_ms = None
+        truncated = False
+
+        def stop():
+            nonlocal duration_ms
+            if duration_ms is None:
+                profile.disable()
+                duration_ms = (time.perf_counter() - started) * 1000
+                event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+                event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+
+        def stop_at_limit():
+            nonlocal truncated
+            truncated = True
+            stop()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        self._active = True
+        queries: List[Tuple[str, float]] = []
+        token = _request_queries.set(queries)
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        profile = cProfile.Profile()
+        started = time.perf_counter()
+        limit = asyncio.get_running_loop().call_later(MAX_PROFILE_SECONDS, stop_at_limit)
+        profile.enable()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            limit.cancel()
+            stop()
+            _request_queries.reset(token)
+            self._active = False
+
+            route = scope.get("route")
+            summary = {
+                "at": datetime.utcnow().isoformat(),
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": getattr(route, "path", None),
+                "status": status_code,
+                "duration_ms": round(duration_ms, 3),
+                "truncated": truncated,
+                "db_ms": round(sum(ms for _, ms in queries), 3),
+                "query_count": len(queries),
+                "queries": [{"statement": statement, "duration_ms": ms} for statement, ms in queries],
+            }
+            try:
+                await asyncio.to_thread(self.store.save, profile, summary)
+            except Exception:
+                logger.exception("Saving request profile failed")
@@ -0,0 +1,106 @@
+"""
+Agent Ethos - Hot Queries
+Statements run on nearly every request, built once at import with bound
+parameters. Reusing the same statement object skips rebuilding the
+construct and its cache key per call; SQLAlchemy's compiled cache then
+supplies the SQL string, and on PostgreSQL asyncpg reuses the prepared
+statement for it. Listing statements select plain columns, for the Core
+row read path in app.reads, and are built per requested field subset.
+"""
+from functools import lru_cache
+from typing import Optional, Tuple
+from sqlmodel import select, func
+from sqlalchemy import bindparam
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.models import Agent, Vouch
+
+AGENT_BY_NAME = select(Agent).where(func.lower(Agent.name) == bindparam("name"))
+
+AGENT_BY_API_KEY_HASH = select(Agent).where(Agent.api_key_hash == bindparam("key_hash"))
+
+VOUCH_BY_ID = select(Vouch).where(Vouch.id == bindparam("vouch_id"))
+
+# Columns of AgentPublic, in its field order
+AGENT_PUBLIC_COLUMNS = {
+    "name": Agent.name,
+    "description": Agent.description,
+    "id": Agent.id,
+    "reputation": Agent.reputation,
+    "is_claimed": Agent.is_claimed,
+    "created_at": Agent.created_at,
+}
+
+_from_agent = aliased(Agent)
+
+# Columns of VouchPublic, in its field order; to_agent_name comes from the caller
+VOUCH_PUBLIC_COLUMNS = {
+    "score": Vouch.score,
+    "note": Vouch.note,
+    "receipt_url": Vouch.receipt_url,
+    "id": Vouch.id,
+    "from_agent_id": Vouch.from_agent_id,
+    "to_agent_id": Vouch.to_agent_id,
+    "flags_count": Vouch.flags_count,
+    "created_at": Vouch.created_at,
+    "from_agent_name": _from_agent.name,
+}
+
+
+# Column subsets come from validated ?fields= lists, so these caches are
+# bounded by the number of field combinations; each subset is built once.
+
+@lru_cache(maxsize=None)
+def agent_row_statement(fields: Tuple[str, ...]):
+    """Agent by name (bound as `name`), selecting `fields` and its version."""
+    return (
+        select(*(AGENT_PUBLIC_COLUMNS[field] for field in fields), Agent.version)
+        .where(func.lower(Agent.name) == bindparam("name"))
+    )
+
+
+@lru_cache(maxsize=None)
+def vouches_for_agent_statement(fields: Tuple[str, ...]):
+    """Recent vouches received by `agent_id`, selecting `fields` (always at least the id)."""
+    columns = [VOUCH_PUBLIC_COLUMNS[field] for field in fields] or [Vouch.id]
+    statement = select(*columns).select_from(Vouch)
+    if "from_agent_name" in fields:
+        statement = statement.outerjoin(_from_agent, _from_agent.id == Vouch.from_agent_id)
+    return (
+        statement
+        .where(Vouch.to_agent_id == bindparam("agent_id"))
+        .order_by(Vouch.created_at.desc())
+        .limit(bindparam("limit"))
+    )
+
+
+@lru_cache(maxsize=None)
+def leaderboard_statement(fields: Tuple[str, ...]):
+    """Agents by reputation, oldest first among ties, selecting `fields`."""
+    return (
+        select(*(AGENT_PUBLIC_COLUMNS[field] for field in fields))
+        .order_by(Agent.reputation.desc(), Agent.created_at.asc())
+        .limit(bindparam("limit"))
+    )
+
+
+VOUCHES_FOR_AGENT = vouches_for_agent_statement(tuple(VOUCH_PUBLIC_COLUMNS))
+
+LEADERBOARD = leaderboard_statement(tuple(AGENT_PUBLIC_COLUMNS))
+
+
+async def agent_by_name(session: AsyncSession, name: str) -> Optional[Agent]:
+    """Look up an agent by name (case-insensitive)."""
+    result = await session.execute(AGENT_BY_NAME, {"name": name.lower()})
+    return result.scalar_one_or_none()
+
+
+async def agent_by_api_key_hash(session: AsyncSession, key_hash: str) -> Optional[Agent]:
+    result = await session.execute(AGENT_BY_API_KEY_HASH, {"key_hash": key_hash})
+    return result.scalar_one_or_none()
+
+
+async def vouch_by_id(session: AsyncSession, vouch_id: int) -> Optional[Vouch]:
+    result = await session.execute(VOUCH_BY_ID, {"vouch_id": vouch_id})
+    return result.scalar_one_or_none()
@@ -0,0 +1,115 @@
+"""
+Agent Ethos - Read Path
+Read-only access for the listing endpoints. Statements select only the
+columns a response needs and run on the session's Core connection, so
+rows are plain tuples: no ORM objects, identity map or attribute
+instrumentation. Rows map straight to response dicts, or to `__slots__`
+DTOs where a handler needs more than it returns. A `?fields=` selection
+narrows both the SQL columns and the response.
+"""
+from typing import List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.queries import (
+    AGENT_PUBLIC_COLUMNS,
+    VOUCH_PUBLIC_COLUMNS,
+    agent_row_statement,
+    vouches_for_agent_statement,
+    leaderboard_statement,
+)
+
+AGENT_PUBLIC_FIELDS: Tuple[str, ...] = tuple(AGENT_PUBLIC_COLUMNS)
+
+VOUCH_PUBLIC_FIELDS: Tuple[str, ...] = tuple(VOUCH_PUBLIC_COLUMNS) + ("to_agent_name",)
+
+# Always loaded for agent lookups: ETags and vouch listings need them
+AGENT_KEY_FIELDS = ("id", "name")
+
+
+def parse_fields(fields: Optional[str], allowed: Tuple[str, ...]) -> Optional[Tuple[str, ...]]:
+    """
+    Parse a comma-separated `?fields=` value into `allowed` order.
+    None means every field, including for a value that names none
+    (e.g. `fields=,`). Raises 400 for unknown names.
+    """
+    requested = {field.strip() for field in (fields or "").split(",") if field.strip()}
+    if not requested:
+        return None
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}. Allowed: {', '.join(allowed)}"
+        )
+    selected = tuple(field for field in allowed if field in requested)
+    return None if selected == allowed else selected
+
+
+def fields_scope(scope: str, *selections: Optional[Tuple[str, ...]]) -> str:
+    """ETag scope for a response narrowed by field selections; unchanged when nothing is narrowed."""
+    if all(fields is None for fields in selections):
+        return scope
+    return scope + ":" + "/".join("*" if fields is None else ".".join(fields) for fields in selections)
+
+
+class AgentRow:
+    """Selected public agent fields plus the version used for ETags."""
+
+    __slots__ = AGENT_PUBLIC_FIELDS + ("version",)
+
+    def __init__(self, fields: Tuple[str, ...], values):
+        for field, value in zip(fields, values):
+            setattr(self, field, value)
+
+    def public(self, fields: Optional[Tuple[str, ...]] = None) -> dict:
+        """AgentPublic fields (or `fields`), in model order."""
+        return {field: getattr(self, field) for field in fields or AGENT_PUBLIC_FIELDS}
+
+
+async def agent_row_by_name(
+    session: AsyncSession,
+    name: str,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Optional[AgentRow]:
+    """Look up an agent by name (case-insensitive), loading `fields` plus id, name and version."""
+    if fields is not None:
+        fields = tuple(field for field in AGENT_PUBLIC_FIELDS if field in fields or field in AGENT_KEY_FIELDS)
+    else:
+        fields = AGENT_PUBLIC_FIELDS
+    conn = await session.connection()
+    row = (await conn.execute(agent_row_statement(fields), {"name": name.lower()})).first()
+    return AgentRow(fields + ("version",), row) if row is not None else None
+
+
+async def leaderboard_public(
+    session: AsyncSession,
+    limit: int,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> List[dict]:
+    """Top agents by reputation, as AgentPublic-shaped dicts."""
+    fields = fields or AGENT_PUBLIC_FIELDS
+    conn = await session.connection()
+    result = await conn.execute(leaderboard_statement(fields), {"limit": limit})
+    return [dict(zip(fields, row)) for row in result]
+
+
+async def recent_vouches_public(
+    session: AsyncSession,
+    agent: AgentRow,
+    limit: int,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> List[dict]:
+    """Most recent vouches received by an agent, as VouchPublic-shaped dicts."""
+    fields = fields or VOUCH_PUBLIC_FIELDS
+    columns = tuple(field for field in fields if field in VOUCH_PUBLIC_COLUMNS)
+    with_target = "to_agent_name" in fields
+    conn = await session.connection()
+    result = await conn.execute(vouches_for_agent_statement(columns), {"agent_id": agent.id, "limit": limit})
+    vouches = []
+    for row in result:
+        vouch = dict(zip(columns, row))
+        if with_target:
+            vouch["to_agent_name"] = agent.name
+        vouches.append(vouch)
+    return vouches
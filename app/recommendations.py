@@ -0,0 +1,187 @@
+"""
+Agent Ethos - "Agents You May Trust" Recommendations
+Periodically precomputes a top-k list per agent from the vouch graph in a
+process pool and stores it in the recommendations table.
+"""
+import asyncio
+import heapq
+import logging
+import math
+import multiprocessing
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.graph import TrustGraph, trust_graph
+from app.models import Recommendation
+from app.snapshot import GraphSnapshot, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Recommendations stored per agent
+RECOMMENDATIONS_TOP_K = 50
+
+# Source agents per worker task
+CHUNK_SIZE = 1000
+
+# Per-worker view of the vouch graph, set by _init_worker
+_offsets: array = array("q")
+_targets: array = array("i")
+_weights: array = array("b")
+_in_degree: array = array("i")
+_snapshot: Optional[GraphSnapshot] = None
+
+
+def _init_worker(offsets: array, targets: array, scores: array):
+    global _offsets, _targets, _weights, _in_degree
+    _offsets, _targets, _weights = offsets, targets, scores
+    _in_degree = array("i", bytes(4 * (len(offsets) - 1)))
+    for target, score in zip(targets, scores):
+        if score > 0:
+            _in_degree[target] += 1
+
+
+def _init_worker_from_snapshot(path: str):
+    # Map the snapshot instead of unpickling a private copy of the arrays
+    global _snapshot
+    _snapshot = GraphSnapshot(path)
+    _init_worker(*_snapshot.out_csr())
+
+
+def _positive_row(node: int) -> List[Tuple[int, float]]:
+    """Positive out-edges of `node` with weights normalized to sum to 1."""
+    row = [
+        (_targets[position], _weights[position])
+        for position in range(_offsets[node], _offsets[node + 1])
+        if _weights[position] > 0
+    ]
+    total = sum(weight for _, weight in row)
+    return [(target, weight / total) for target, weight in row]
+
+
+def _recommend_chunk(sources: List[int], top_k: int) -> List[Tuple[int, int, int, float]]:
+    """
+    Compute (agent_id, rank, recommended_agent_id, score) rows for `sources`.
+
+    Row u of A·A, where A is the row-normalized positive vouch matrix, sums
+    over the agents u vouches for the agents they vouch for. Candidates are
+    divided by sqrt(in-degree) so widely vouched hubs do not crowd out
+    agents specific to u's neighbourhood.
+    """
+    rows = []
+    for source in sources:
+        direct = _positive_row(source)
+        known = {target for target, _ in direct}
+        known.add(source)
+
+        scores = {}
+        for middle, weight in direct:
+            for candidate, second in _positive_row(middle):
+                if candidate not in known:
+                    scores[candidate] = scores.get(candidate, 0.0) + weight * second
+
+        best = heapq.nlargest(
+            top_k,
+            ((score / math.sqrt(_in_degree[candidate]), candidate) for candidate, score in scores.items()),
+        )
+        for rank, (score, candidate) in enumerate(best):
+            rows.append((source, rank, candidate, score))
+    return rows
+
+
+def _positive_sources(offsets, scores) -> List[int]:
+    """Agents with at least one positive outgoing vouch."""
+    return [
+        node for node in range(len(offsets) - 1)
+        if any(scores[position] > 0 for position in range(offsets[node], offsets[node + 1]))
+    ]
+
+
+async def _replace_recommendations(results: List[List[Tuple[int, int, int, float]]], session: AsyncSession) -> int:
+    """Swap the table contents for `results`. Does not commit."""
+    await session.execute(delete(Recommendation))
+    written = 0
+    for rows in results:
+        if rows:
+            await session.execute(insert(Recommendation), [
+                {"agent_id": agent_id, "rank": rank, "recommended_agent_id": candidate, "score": score}
+                for agent_id, rank, candidate, score in rows
+            ])
+            written += len(rows)
+    return written
+
+
+async def refresh_recommendations(
+    session: AsyncSession,
+    graph: Optional[TrustGraph] = None,
+    workers: int = 2,
+    top_k: int = RECOMMENDATIONS_TOP_K,
+    snapshot_path: Optional[str] = None,
+) -> int:
+    """
+    Recompute recommendations for every agent with outgoing positive
+    vouches and replace the table contents. Returns rows written.
+
+    With `snapshot_path`, the graph is read from that snapshot and every
+    worker maps the same file rather than receiving its own copy.
+    """
+    if snapshot_path:
+        snapshot = GraphSnapshot(snapshot_path)
+        offsets, targets, scores = snapshot.out_csr()
+        initializer, initargs = _init_worker_from_snapshot, (snapshot_path,)
+    else:
+        if graph is None:
+            graph = trust_graph
+        offsets, targets, scores = await graph.out_csr()
+        initializer, initargs = _init_worker, (offsets, targets, scores)
+    sources = await asyncio.to_thread(_positive_sources, offsets, scores)
+    chunks = [sources[i:i + CHUNK_SIZE] for i in range(0, len(sources), CHUNK_SIZE)]
+
+    loop = asyncio.get_running_loop()
+    pool = ProcessPoolExecutor(
+        max_workers=max(1, workers),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initializer,
+        initargs=initargs,
+    )
+    try:
+        results = await asyncio.gather(*(
+            loop.run_in_executor(pool, _recommend_chunk, chunk, top_k)
+            for chunk in chunks
+        ))
+    except BaseException:
+        # Cancelled or failed: drop queued chunks without blocking the loop
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise
+    await asyncio.to_thread(pool.shutdown)
+
+    written = await _replace_recommendations(results, session)
+    await session.commit()
+    return written
+
+
+async def run_recommendations_periodically(
+    session_factory,
+    interval_seconds: int,
+    workers: int,
+    snapshot_path: Optional[str] = None,
+):
+    """
+    Background task: refresh recommendations every `interval_seconds`.
+    With `snapshot_path`, each run first rewrites the graph snapshot,
+    which the workers then share and the next warm start reuses.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with session_factory() as session:
+                if snapshot_path:
+                    logger.info(f"Graph snapshot written ({await write_snapshot(session, snapshot_path)})")
+                written = await refresh_recommendations(session, workers=workers, snapshot_path=snapshot_path)
+            logger.info(f"Recommendations refreshed ({written} rows)")
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Recommendations refresh failed")
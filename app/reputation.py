@@ -0,0 +1,230 @@
+"""
+Agent Ethos - Reputation Maintenance
+Writes adjust reputation by the score delta in the request; a background
+worker then recomputes dirty agents from their vouches in batches.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional, Tuple
+from sqlmodel import select, func, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.autocomplete import name_index
+from app.events import record_reputation_event, publish_event
+from app.models import Agent, Vouch, ReputationEvent
+
+logger = logging.getLogger(__name__)
+
+# Max agents recomputed per grouped query
+BATCH_SIZE = 500
+
+# How long the worker waits after the first dirty agent to collect more
+BATCH_WINDOW_SECONDS = 0.05
+
+# Target upper bound on time from mark_dirty to recompute; breaches are logged
+MAX_LAG_SECONDS = 2.0
+
+
+async def adjust_agent_reputation(session: AsyncSession, agent: Agent, delta: int):
+    """
+    Add `delta` to an agent's reputation and bump its version in the
+    caller's transaction. A single-row atomic update, independent of how
+    many vouches the agent has.
+    """
+    result = await session.execute(
+        update(Agent)
+        .where(Agent.id == agent.id)
+        .values(reputation=Agent.reputation + delta, version=Agent.version + 1)
+        .returning(Agent.reputation, Agent.version)
+        .execution_options(synchronize_session=False)
+    )
+    reputation, version = result.one()
+    set_committed_value(agent, "reputation", reputation)
+    set_committed_value(agent, "version", version)
+
+
+async def recompute_reputation(session: AsyncSession, agent_ids: List[int]) -> List[Tuple[Agent, ReputationEvent]]:
+    """
+    Recalculate reputation = sum of vouch scores received for `agent_ids`
+    with one grouped query, and correct the ones that drifted, logging a
+    `recompute` event for each. Returns the corrected agents with their
+    events. Does not commit.
+
+    Each correction recomputes the sum in the UPDATE itself and only
+    applies if reputation still holds the value seen by the grouped
+    query, so a concurrent adjustment is never overwritten; that writer
+    marks the agent dirty again and the next batch rechecks it.
+    """
+    result = await session.execute(
+        select(Agent.id, Agent.reputation, func.coalesce(func.sum(Vouch.score), 0))
+        .outerjoin(Vouch, Vouch.to_agent_id == Agent.id)
+        .where(Agent.id.in_(agent_ids))
+        .group_by(Agent.id, Agent.reputation)
+    )
+    drifted = [
+        (agent_id, reputation)
+        for agent_id, reputation, total in result.all()
+        if reputation != total
+    ]
+
+    total = (
+        select(func.coalesce(func.sum(Vouch.score), 0))
+        .where(Vouch.to_agent_id == Agent.id)
+        .scalar_subquery()
+    )
+    deltas: Dict[int, int] = {}
+    for agent_id, observed in drifted:
+        result = await session.execute(
+            update(Agent)
+            .where(Agent.id == agent_id, Agent.reputation == observed)
+            .values(reputation=total, version=Agent.version + 1)
+            .returning(Agent.reputation)
+            .execution_options(synchronize_session=False)
+        )
+        reputation = result.scalar_one_or_none()
+        if reputation is not None and reputation != observed:
+            deltas[agent_id] = reputation - observed
+    if not deltas:
+        return []
+
+    result = await session.execute(
+        select(Agent).where(Agent.id.in_(list(deltas))).execution_options(populate_existing=True)
+    )
+    corrected = [
+        (agent, record_reputation_event(session, agent, kind="recompute", delta=deltas[agent.id]))
+        for agent in result.scalars().all()
+    ]
+    await session.flush()
+    return corrected
+
+
+class ReputationQueue:
+    """
+    Coalescing set of agents whose reputation needs recomputing.
+
+    Marking an agent that is already pending is free, so a burst of vouches
+    for one agent costs one recompute. The worker drains up to BATCH_SIZE
+    agents per grouped query.
+    """
+
+    def __init__(self, batch_size: int = BATCH_SIZE, batch_window: float = BATCH_WINDOW_SECONDS):
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+        self._pending: Dict[int, float] = {}
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self.reset_stats()
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def reset_stats(self):
+        self.enqueued = 0
+        self.coalesced = 0
+        self.batches = 0
+        self.recomputed = 0
+        self.corrected = 0
+        self.max_lag_seconds = 0.0
+        self.lag_breaches = 0
+
+    def clear(self):
+        self._pending.clear()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self.reset_stats()
+
+    def mark_dirty(self, agent_id: int):
+        if agent_id in self._pending:
+            self.coalesced += 1
+            return
+        self._pending[agent_id] = time.monotonic()
+        self.enqueued += 1
+        self._wakeup.set()
+
+    def oldest_lag(self) -> float:
+        if not self._pending:
+            return 0.0
+        return time.monotonic() - min(self._pending.values())
+
+    async def process_batch(self, session: AsyncSession) -> int:
+        """Recompute up to batch_size pending agents. Returns agents processed."""
+        batch = list(self._pending)[:self.batch_size]
+        if not batch:
+            return 0
+        # Take the batch out first so agents marked again meanwhile are kept
+        marked = {agent_id: self._pending.pop(agent_id) for agent_id in batch}
+        lag = time.monotonic() - min(marked.values())
+
+        try:
+            corrected = await recompute_reputation(session, batch)
+            await session.commit()
+        except Exception:
+            for agent_id, marked_at in marked.items():
+                self._pending.setdefault(agent_id, marked_at)
+            raise
+        for agent, event in corrected:
+            name_index.set_reputation(agent.id, agent.reputation)
+            await publish_event(session, event, agent)
+
+        self.batches += 1
+        self.recomputed += len(batch)
+        self.corrected += len(corrected)
+        self.max_lag_seconds = max(self.max_lag_seconds, lag)
+        if lag > MAX_LAG_SECONDS:
+            self.lag_breaches += 1
+            logger.warning(f"Reputation recompute lag {lag:.2f}s exceeds {MAX_LAG_SECONDS}s")
+        return len(batch)
+
+    async def drain(self, session_factory):
+        """Process everything pending, then return."""
+        while self._pending:
+            async with session_factory() as session:
+                await self.process_batch(session)
+
+    async def run(self, session_factory):
+        """Worker loop; exits once stop() is called and the queue is empty."""
+        while True:
+            if not self._pending:
+                if self._stopping:
+                    return
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+            if len(self._pending) < self.batch_size and not self._stopping:
+                await asyncio.sleep(self.batch_window)
+            try:
+                await self.drain(session_factory)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Reputation recompute failed")
+                await asyncio.sleep(1.0)
+
+    async def stop(self, worker: Optional[asyncio.Task] = None, timeout: float = 10.0):
+        """Let the worker finish pending agents and exit."""
+        self._stopping = True
+        self._wakeup.set()
+        if worker is not None:
+            try:
+                await asyncio.wait_for(worker, timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Reputation queue drain timed out with {len(self._pending)} pending")
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._pending),
+            "oldest_lag_seconds": round(self.oldest_lag(), 3),
+            "max_lag_seconds": round(self.max_lag_seconds, 3),
+            "lag_breaches": self.lag_breaches,
+            "enqueued": self.enqueued,
+            "coalesced": self.coalesced,
+            "batches": self.batches,
+            "recomputed": self.recomputed,
+            "corrected": self.corrected,
+        }
+
+
+# Process-wide queue, worker started in the app lifespan
+reputation_queue = ReputationQueue()
@@ -6,6 +6,7 @@ from fastapi import APIRouter
 from app.routes.agents import router as agents_router
 from app.routes.vouches import router as vouches_router
 from app.routes.leaderboard import router as leaderboard_router
+from app.routes.admin import router as admin_router
 
 # Main API router
 api_router = APIRouter()
@@ -14,4 +15,5 @@ api_router = APIRouter()
 api_router.include_router(agents_router, prefix="/agents", tags=["Agents"])
 api_router.include_router(vouches_router, prefix="/vouches", tags=["Vouches"])
 api_router.include_router(leaderboard_router, prefix="/leaderboard", tags=["Leaderboard"])
+api_router.include_router(admin_router, prefix="/admin", tags=["Admin"])
 
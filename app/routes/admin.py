@@ -0,0 +1,131 @@
+"""
+Agent Ethos - Admin Routes
+Operational endpoints, guarded by the X-Admin-Token header.
+"""
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi.responses import FileResponse
+
+from app.auth import require_admin
+from app.slowlog import slow_query_log
+from app.profiling import profile_store
+from app.admission import admission
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get(
+    "/slow-queries",
+    response_model=dict,
+    summary="Get recent slow queries",
+    description="Get statements that exceeded the slow query threshold, newest first, with their query plans."
+)
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=1000, description="Max entries to return"),
+):
+    """
+    Get the slow query log.
+    
+    - **limit**: Maximum number of entries to return (default 50)
+    
+    Enabled with `SLOW_QUERY_MS`. Each entry has the statement, the types
+    of its parameters (never the values), the route that ran it and its
+    plan (`null` until the background EXPLAIN finishes).
+    """
+    return {
+        "success": True,
+        "stats": slow_query_log.stats(),
+        "entries": slow_query_log.snapshot()[:limit],
+    }
+
+
+@router.delete(
+    "/slow-queries",
+    response_model=dict,
+    summary="Clear the slow query log"
+)
+async def clear_slow_queries():
+    """Drop all recorded slow queries and cached plans."""
+    slow_query_log.clear()
+    return {"success": True}
+
+
+@router.get(
+    "/admission",
+    response_model=dict,
+    summary="Get admission control state",
+    description="Get per-route concurrency limits, in-flight and queued requests, and shed counts."
+)
+async def get_admission():
+    """
+    Get admission control counters for every limited route.
+    
+    Requests are shed with 503 and `Retry-After` when a route's queue is
+    full or its wait exceeds the queue timeout. Reads stop queueing while
+    the database pool is saturated.
+    """
+    return {
+        "success": True,
+        "admission": admission.stats(),
+    }
+
+
+@router.get(
+    "/profiles",
+    response_model=dict,
+    summary="List recent request profiles",
+    description="List profiled requests, newest first."
+)
+async def list_profiles(
+    limit: int = Query(50, ge=1, le=500, description="Max profiles to return"),
+):
+    """
+    List recent request profiles.
+    
+    - **limit**: Maximum number of profiles to return (default 50)
+    
+    Send `X-Profile: 1` together with `X-Admin-Token` to profile a request,
+    or set `PROFILE_SAMPLE_RATE` to profile a share of all requests.
+    """
+    return {
+        "success": True,
+        "profiles": profile_store.list(limit),
+    }
+
+
+@router.get(
+    "/profiles/{profile_id}",
+    response_model=dict,
+    summary="Get a request profile",
+    description="Get a profile's summary, SQL timings and cumulative-time report."
+)
+async def get_request_profile(
+    profile_id: str = Path(..., description="Profile ID from the list"),
+):
+    """Get one profile with its SQL statements and text report."""
+    summary = profile_store.get(profile_id)
+    if summary is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found"
+        )
+    return {"success": True, "profile": summary}
+
+
+@router.get(
+    "/profiles/{profile_id}/download",
+    summary="Download raw profile data",
+    description="Download the pstats file, for snakeviz or `python -m pstats`.",
+    response_class=FileResponse,
+)
+async def download_profile(
+    profile_id: str = Path(..., description="Profile ID from the list"),
+):
+    """Download the raw cProfile stats for a profile."""
+    path = profile_store.stats_path(profile_id)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found"
+        )
+    return FileResponse(path, media_type="application/octet-stream", filename=path.name)
+
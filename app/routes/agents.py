@@ -1,22 +1,63 @@
 """
 Agent Ethos - Agent Routes
 """
+import heapq
+from array import array
+from datetime import date, datetime, timedelta
+from bisect import bisect_left
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlmodel import select, func
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Header, Response
+from sqlmodel import select, func, or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from app.database import get_session
-from app.models import Agent, Vouch
-from app.models.agent import AgentCreate, AgentPublic, AgentRegisterResponse
+from app.admission import admit, READ, WRITE
+from app.models import Agent, Vouch, Recommendation, ReputationDaily
+from app.models.agent import (
+    AgentCreate,
+    AgentPublic,
+    AgentRegisterResponse,
+    AgentBatchRequest,
+)
 from app.models.vouch import VouchPublic
+from app.models.recommendation import RecommendationPublic
 from app.auth import generate_api_key, hash_api_key, get_current_agent
+from app.queries import agent_by_name
+from app.reads import (
+    agent_row_by_name,
+    recent_vouches_public,
+    parse_fields,
+    fields_scope,
+    AGENT_PUBLIC_FIELDS,
+    VOUCH_PUBLIC_FIELDS,
+)
+from app.conditional import agent_etag, etag_matches, set_etag, not_modified
+from app.singleflight import coalesce
+from app.pagination import (
+    encode_cursor,
+    keyset_before,
+    encode_score_cursor,
+    keyset_after_score,
+)
+from app.search import SEARCH_DIALECTS, tokenize_query, ranked_matches
+from app.autocomplete import name_index
+from app.graph import trust_graph, intersect_sorted
+from app.trust import get_personalized_ranking, PERSONALIZED_TOP_K
 
 router = APIRouter()
 
+# Max names + ids accepted by the batch profile endpoint
+MAX_BATCH_SIZE = 500
+
+# Reputation history range: default and max span in days
+DEFAULT_HISTORY_DAYS = 90
+MAX_HISTORY_DAYS = 366
+
 
 @router.post(
     "/register",
+    dependencies=[Depends(admit("agents.register", WRITE))],
     response_model=AgentRegisterResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Register a new agent",
@@ -35,10 +76,7 @@ async def register_agent(
     Returns the agent profile and API key. The API key is only shown once.
     """
     # Check for existing agent with same name (case-insensitive)
-    result = await session.execute(
-        select(Agent).where(func.lower(Agent.name) == data.name.lower())
-    )
-    existing = result.scalar_one_or_none()
+    existing = await agent_by_name(session, data.name)
     
     if existing:
         raise HTTPException(
@@ -61,6 +99,8 @@ async def register_agent(
     await session.commit()
     await session.refresh(agent)
     
+    name_index.add(agent.id, agent.name, agent.reputation)
+    
     # Return with API key (only time it's shown)
     return AgentRegisterResponse(
         success=True,
@@ -78,6 +118,7 @@ async def register_agent(
 
 @router.get(
     "/me",
+    dependencies=[Depends(admit("agents.me", READ))],
     response_model=dict,
     summary="Get current agent profile",
     description="Get the profile of the currently authenticated agent."
@@ -99,26 +140,252 @@ async def get_me(
     }
 
 
+@router.get(
+    "/me/trust",
+    dependencies=[Depends(admit("agents.me_trust", READ))],
+    response_model=dict,
+    summary="Get agents trusted by the current agent",
+    description="Rank agents by trust as seen from the authenticated agent's own vouches."
+)
+async def get_my_trust(
+    limit: int = Query(20, ge=1, le=PERSONALIZED_TOP_K, description="Max agents to return"),
+    current_agent: Agent = Depends(get_current_agent),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Get personalized reputation for the authenticated agent.
+    
+    - **limit**: Maximum number of agents to return (default 20, max 100)
+    
+    `trust` is the personalized PageRank of each agent, seeded from the agents
+    you vouched for and following positive vouches weighted by score.
+    """
+    ranking = await get_personalized_ranking(session, current_agent.id)
+    return {
+        "success": True,
+        "agents": ranking[:limit],
+    }
+
+
+@router.get(
+    "/recommendations",
+    dependencies=[Depends(admit("agents.recommendations", READ))],
+    response_model=dict,
+    summary="Get agents you may trust",
+    description="Agents vouched for by the agents you vouch for, ranked by co-vouch similarity."
+)
+async def get_recommendations(
+    limit: int = Query(20, ge=1, le=50, description="Max agents to return"),
+    current_agent: Agent = Depends(get_current_agent),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Get recommendations for the authenticated agent.
+    
+    - **limit**: Maximum number of agents to return (default 20, max 50)
+    
+    Recommendations are precomputed periodically, so recent vouches
+    show up after the next refresh.
+    """
+    result = await session.execute(
+        select(Recommendation.score, Agent.id, Agent.name, Agent.reputation)
+        .join(Agent, Agent.id == Recommendation.recommended_agent_id)
+        .where(Recommendation.agent_id == current_agent.id)
+        .order_by(Recommendation.rank)
+        .limit(limit)
+    )
+    
+    return {
+        "success": True,
+        "recommendations": [
+            RecommendationPublic(id=agent_id, name=name, reputation=reputation, score=score)
+            for score, agent_id, name, reputation in result.all()
+        ],
+    }
+
+
 @router.get(
     "/profile",
+    dependencies=[Depends(admit("agents.profile", READ))],
     response_model=dict,
     summary="Get agent profile by name",
     description="Get a public agent profile by name, including recent vouches."
 )
+@coalesce("name", "fields", "vouch_fields", "if_none_match", normalize={"name": str.lower})
 async def get_profile(
+    response: Response,
     name: str = Query(..., description="Agent name to look up"),
+    fields: Optional[str] = Query(None, description="Comma-separated agent fields to return, e.g. name,reputation"),
+    vouch_fields: Optional[str] = Query(None, description="Comma-separated fields for recentVouches"),
+    if_none_match: Optional[str] = Header(None, description="ETag from a previous response"),
     session: AsyncSession = Depends(get_session)
 ):
     """
     Get public profile for an agent by name.
     
     Includes recent vouches received by the agent.
+    
+    - **fields**: Only return these agent fields (default: all)
+    - **vouch_fields**: Only return these fields of each recent vouch (default: all)
+    
+    Responses carry an `ETag`; send it back in `If-None-Match` to get
+    `304 Not Modified` while nothing about the agent has changed.
     """
+    selected = parse_fields(fields, AGENT_PUBLIC_FIELDS)
+    selected_vouch = parse_fields(vouch_fields, VOUCH_PUBLIC_FIELDS)
+    
     # Find agent by name (case-insensitive)
+    agent = await agent_row_by_name(session, name, selected)
+    
+    if not agent:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Agent '{name}' not found"
+        )
+    
+    etag = agent_etag(agent.id, agent.version, fields_scope("profile", selected, selected_vouch))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    
+    # Recent vouches with voucher names, read as plain rows
+    return {
+        "success": True,
+        "agent": agent.public(selected),
+        "recentVouches": await recent_vouches_public(session, agent, 10, selected_vouch),
+    }
+
+
+
+@router.get(
+    "/activity",
+    dependencies=[Depends(admit("agents.activity", READ))],
+    response_model=dict,
+    summary="Get agent activity feed",
+    description="Get a time-ordered feed of vouches given and received by an agent."
+)
+async def get_activity(
+    name: str = Query(..., description="Agent name to look up"),
+    limit: int = Query(20, ge=1, le=100, description="Max feed items to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Get the activity feed for an agent, newest first.
+    
+    - **name**: Agent name to look up
+    - **limit**: Maximum number of items to return (default 20, max 100)
+    - **cursor**: `next_cursor` from the previous page
+    
+    Each item has a `direction` of `given` or `received`.
+    """
+    agent = await agent_by_name(session, name)
+    
+    if not agent:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Agent '{name}' not found"
+        )
+    
+    # Read at most limit + 1 rows from each side, walking the
+    # (from_agent_id, created_at) and (to_agent_id, created_at) indexes
+    # backwards from the cursor, then merge the two sorted streams.
+    from_agent = aliased(Agent)
+    to_agent = aliased(Agent)
+    after = keyset_before(Vouch.created_at, Vouch.id, cursor)
+    
+    async def stream(direction: str, column):
+        query = (
+            select(Vouch, from_agent.name, to_agent.name)
+            .outerjoin(from_agent, from_agent.id == Vouch.from_agent_id)
+            .outerjoin(to_agent, to_agent.id == Vouch.to_agent_id)
+            .where(column == agent.id)
+            .order_by(Vouch.created_at.desc(), Vouch.id.desc())
+            .limit(limit + 1)
+        )
+        if after is not None:
+            query = query.where(after)
+        rows = (await session.execute(query)).all()
+        return [(direction, vouch, from_name, to_name) for vouch, from_name, to_name in rows]
+    
+    given = await stream("given", Vouch.from_agent_id)
+    received = await stream("received", Vouch.to_agent_id)
+    
+    merged = list(heapq.merge(
+        given,
+        received,
+        key=lambda item: (item[1].created_at, item[1].id),
+        reverse=True,
+    ))
+    page = merged[:limit]
+    
+    next_cursor = None
+    if len(merged) > limit:
+        last = page[-1][1]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    
+    activity = [
+        {
+            "direction": direction,
+            "vouch": VouchPublic(
+                id=vouch.id,
+                from_agent_id=vouch.from_agent_id,
+                to_agent_id=vouch.to_agent_id,
+                score=vouch.score,
+                note=vouch.note,
+                receipt_url=vouch.receipt_url,
+                flags_count=vouch.flags_count,
+                created_at=vouch.created_at,
+                from_agent_name=from_name,
+                to_agent_name=to_name,
+            ),
+        }
+        for direction, vouch, from_name, to_name in page
+    ]
+    
+    return {
+        "success": True,
+        "activity": activity,
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get(
+    "/history",
+    dependencies=[Depends(admit("agents.history", READ))],
+    response_model=dict,
+    summary="Get agent reputation history",
+    description="Get an agent's reputation over time as daily rollups."
+)
+async def get_history(
+    name: str = Query(..., description="Agent name to look up"),
+    from_day: Optional[date] = Query(None, alias="from", description="First UTC day (default: 90 days before `to`)"),
+    to_day: Optional[date] = Query(None, alias="to", description="Last UTC day (default: today)"),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Get the daily reputation history for an agent.
+    
+    - **name**: Agent name to look up
+    - **from**: First day, `YYYY-MM-DD` (default 90 days before `to`)
+    - **to**: Last day, `YYYY-MM-DD` (default today, UTC)
+    
+    Only days with activity are listed; reputation is unchanged on the days
+    in between. Rollups are refreshed in the background, so the latest
+    changes may take a few minutes to appear.
+    """
+    to_day = to_day or datetime.utcnow().date()
+    from_day = from_day or to_day - timedelta(days=DEFAULT_HISTORY_DAYS)
+    if from_day > to_day or (to_day - from_day).days > MAX_HISTORY_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"'from' must be on or before 'to' and at most {MAX_HISTORY_DAYS} days earlier"
+        )
+    
     result = await session.execute(
-        select(Agent).where(func.lower(Agent.name) == name.lower())
+        select(Agent.id, Agent.name, Agent.reputation).where(func.lower(Agent.name) == name.lower())
     )
-    agent = result.scalar_one_or_none()
+    agent = result.one_or_none()
     
     if not agent:
         raise HTTPException(
@@ -126,46 +393,402 @@ async def get_profile(
             detail=f"Agent '{name}' not found"
         )
     
-    # Get recent vouches for this agent
-    vouches_result = await session.execute(
-        select(Vouch)
-        .where(Vouch.to_agent_id == agent.id)
-        .order_by(Vouch.created_at.desc())
-        .limit(10)
+    # One range read on the (agent_id, day) primary key
+    rows = await session.execute(
+        select(
+            ReputationDaily.day,
+            ReputationDaily.reputation,
+            ReputationDaily.delta,
+            ReputationDaily.vouches,
+            ReputationDaily.flags,
+        )
+        .where(
+            ReputationDaily.agent_id == agent.id,
+            ReputationDaily.day >= from_day,
+            ReputationDaily.day <= to_day,
+        )
+        .order_by(ReputationDaily.day)
     )
-    vouches = vouches_result.scalars().all()
-    
-    # Get voucher names
-    vouches_public = []
-    for vouch in vouches:
-        from_agent_result = await session.execute(
-            select(Agent).where(Agent.id == vouch.from_agent_id)
-        )
-        from_agent = from_agent_result.scalar_one_or_none()
-        
-        vouches_public.append(VouchPublic(
-            id=vouch.id,
-            from_agent_id=vouch.from_agent_id,
-            to_agent_id=vouch.to_agent_id,
-            score=vouch.score,
-            note=vouch.note,
-            receipt_url=vouch.receipt_url,
-            flags_count=vouch.flags_count,
-            created_at=vouch.created_at,
-            from_agent_name=from_agent.name if from_agent else None,
-            to_agent_name=agent.name,
-        ))
     
     return {
         "success": True,
-        "agent": AgentPublic(
-            id=agent.id,
-            name=agent.name,
-            description=agent.description,
-            reputation=agent.reputation,
-            is_claimed=agent.is_claimed,
-            created_at=agent.created_at,
-        ),
-        "recentVouches": vouches_public,
+        "agent": {"id": agent.id, "name": agent.name, "reputation": agent.reputation},
+        "from": from_day,
+        "to": to_day,
+        "history": [
+            {"day": day, "reputation": reputation, "delta": delta, "vouches": vouches, "flags": flags}
+            for day, reputation, delta, vouches, flags in rows.all()
+        ],
     }
 
+
+@router.get(
+    "/search",
+    dependencies=[Depends(admit("agents.search", READ))],
+    response_model=dict,
+    summary="Search agents",
+    description="Full-text search over agent names and descriptions, best matches first."
+)
+async def search_agents(
+    q: str = Query(..., min_length=1, max_length=100, description="Search terms"),
+    limit: int = Query(20, ge=1, le=100, description="Max agents to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Search agents by name and description.
+    
+    - **q**: Search terms; every term must match as a word prefix
+    - **limit**: Maximum number of agents to return (default 20, max 100)
+    - **cursor**: `next_cursor` from the previous page
+    
+    Name matches rank above description matches.
+    """
+    tokens = tokenize_query(q)
+    if not tokens:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Query must contain at least one word"
+        )
+    
+    dialect = session.bind.dialect.name
+    if dialect not in SEARCH_DIALECTS:
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"Search is not supported on {dialect}"
+        )
+    
+    ranked = ranked_matches(dialect, tokens)
+    query = (
+        select(Agent, ranked.c.score)
+        .join(ranked, ranked.c.agent_id == Agent.id)
+        .order_by(ranked.c.score, Agent.id)
+        .limit(limit + 1)
+    )
+    after = keyset_after_score(ranked.c.score, Agent.id, cursor)
+    if after is not None:
+        query = query.where(after)
+    
+    result = await session.execute(query)
+    rows = result.all()
+    
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last, score = page[-1]
+        next_cursor = encode_score_cursor(score, last.id)
+    
+    return {
+        "success": True,
+        "agents": [
+            AgentPublic(
+                id=agent.id,
+                name=agent.name,
+                description=agent.description,
+                reputation=agent.reputation,
+                is_claimed=agent.is_claimed,
+                created_at=agent.created_at,
+            )
+            for agent, _ in page
+        ],
+        "next_cursor": next_cursor,
+    }
+
+
+@router.get(
+    "/autocomplete",
+    response_model=dict,
+    summary="Autocomplete agent names",
+    description="Suggest agent names starting with a prefix, highest reputation first. Served from memory."
+)
+async def autocomplete_agents(
+    prefix: str = Query(..., min_length=1, max_length=100, description="Name prefix (case-insensitive)"),
+    limit: int = Query(10, ge=1, le=20, description="Max suggestions to return"),
+):
+    """
+    Suggest agents whose name starts with a prefix.
+    
+    - **prefix**: Name prefix (case-insensitive)
+    - **limit**: Maximum number of suggestions (default 10, max 20)
+    """
+    return {
+        "success": True,
+        "agents": name_index.complete(prefix, limit),
+    }
+
+
+@router.post(
+    "/batch",
+    dependencies=[Depends(admit("agents.batch", READ))],
+    response_model=dict,
+    summary="Get many agent profiles",
+    description="Look up public profiles for many agents by name or id in one call."
+)
+async def get_profiles_batch(
+    data: AgentBatchRequest,
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Get public profiles for many agents.
+    
+    - **names**: Agent names (case-insensitive)
+    - **ids**: Agent IDs
+    - **include_vouches**: Include recent vouches received by each agent
+    - **vouches_limit**: Recent vouches per agent (default 10, max 50)
+    
+    Unknown names and ids are listed under `not_found` instead of failing the batch.
+    """
+    names = list(dict.fromkeys(name.lower() for name in data.names))
+    ids = list(dict.fromkeys(data.ids))
+    if len(names) + len(ids) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BATCH_SIZE} names and ids per request"
+        )
+    
+    agents = []
+    if names or ids:
+        conditions = []
+        if names:
+            conditions.append(func.lower(Agent.name).in_(names))
+        if ids:
+            conditions.append(Agent.id.in_(ids))
+        result = await session.execute(
+            select(Agent).where(or_(*conditions)).order_by(Agent.id)
+        )
+        agents = result.scalars().all()
+    
+    found_names = {agent.name.lower() for agent in agents}
+    found_ids = {agent.id for agent in agents}
+    
+    # Top-k recent vouches per agent in one windowed query
+    vouches_by_agent = {}
+    if data.include_vouches and agents:
+        ranked = (
+            select(
+                Vouch.id.label("vouch_id"),
+                func.row_number().over(
+                    partition_by=Vouch.to_agent_id,
+                    order_by=(Vouch.created_at.desc(), Vouch.id.desc()),
+                ).label("rn"),
+            )
+            .where(Vouch.to_agent_id.in_(found_ids))
+            .subquery()
+        )
+        from_agent = aliased(Agent)
+        vouches_result = await session.execute(
+            select(Vouch, from_agent.name)
+            .join(ranked, ranked.c.vouch_id == Vouch.id)
+            .outerjoin(from_agent, from_agent.id == Vouch.from_agent_id)
+            .where(ranked.c.rn <= data.vouches_limit)
+            .order_by(Vouch.to_agent_id, Vouch.created_at.desc(), Vouch.id.desc())
+        )
+        names_by_id = {agent.id: agent.name for agent in agents}
+        for vouch, from_name in vouches_result.all():
+            vouches_by_agent.setdefault(vouch.to_agent_id, []).append(VouchPublic(
+                id=vouch.id,
+                from_agent_id=vouch.from_agent_id,
+                to_agent_id=vouch.to_agent_id,
+                score=vouch.score,
+                note=vouch.note,
+                receipt_url=vouch.receipt_url,
+                flags_count=vouch.flags_count,
+                created_at=vouch.created_at,
+                from_agent_name=from_name,
+                to_agent_name=names_by_id[vouch.to_agent_id],
+            ))
+    
+    profiles = []
+    for agent in agents:
+        profile = {
+            "agent": AgentPublic(
+                id=agent.id,
+                name=agent.name,
+                description=agent.description,
+                reputation=agent.reputation,
+                is_claimed=agent.is_claimed,
+                created_at=agent.created_at,
+            ),
+        }
+        if data.include_vouches:
+            profile["recentVouches"] = vouches_by_agent.get(agent.id, [])
+        profiles.append(profile)
+    
+    return {
+        "success": True,
+        "profiles": profiles,
+        "not_found": {
+            "names": [name for name in data.names if name.lower() not in found_names],
+            "ids": [agent_id for agent_id in ids if agent_id not in found_ids],
+        },
+    }
+
+
+@router.get(
+    "/trust-path",
+    dependencies=[Depends(admit("agents.trust_path", READ))],
+    response_model=dict,
+    summary="Find a trust path between two agents",
+    description="Find the shortest chain of positive vouches from one agent to another."
+)
+async def get_trust_path(
+    from_name: str = Query(..., alias="from", description="Starting agent name"),
+    to_name: str = Query(..., alias="to", description="Destination agent name"),
+    max_depth: int = Query(3, ge=1, le=6, description="Max vouches in the chain"),
+    min_score: int = Query(1, ge=1, le=5, description="Min score of each vouch in the chain"),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Find how one agent is connected to another through vouches.
+    
+    - **from**: Starting agent name
+    - **to**: Destination agent name
+    - **max_depth**: Maximum number of vouches in the chain (default 3, max 6)
+    - **min_score**: Minimum score each vouch must have (default 1)
+    
+    Served from the in-memory vouch graph; `path` is empty when no chain exists.
+    """
+    result = await session.execute(
+        select(Agent.id, Agent.name)
+        .where(func.lower(Agent.name).in_([from_name.lower(), to_name.lower()]))
+    )
+    ids_by_name = {name.lower(): agent_id for agent_id, name in result.all()}
+    
+    for name in (from_name, to_name):
+        if name.lower() not in ids_by_name:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Agent '{name}' not found"
+            )
+    
+    hops = trust_graph.find_path(
+        ids_by_name[from_name.lower()],
+        ids_by_name[to_name.lower()],
+        max_depth=max_depth,
+        min_score=min_score,
+    )
+    
+    path = []
+    if hops:
+        agent_ids = [hops[0][0]] + [to_id for _, to_id, _ in hops]
+        names_result = await session.execute(
+            select(Agent.id, Agent.name).where(Agent.id.in_(agent_ids))
+        )
+        names = dict(names_result.all())
+        path = [
+            {
+                "from_agent_id": from_id,
+                "from_agent_name": names.get(from_id),
+                "to_agent_id": to_id,
+                "to_agent_name": names.get(to_id),
+                "score": score,
+            }
+            for from_id, to_id, score in hops
+        ]
+    
+    return {
+        "success": True,
+        "found": hops is not None,
+        "path": path,
+        "graph": trust_graph.stats(),
+    }
+
+
+@router.get(
+    "/overlap",
+    dependencies=[Depends(admit("agents.overlap", READ))],
+    response_model=dict,
+    summary="Compare the vouchers of two agents",
+    description="Find agents who vouched for both A and B, whether A and B vouch for each other, and how much their voucher sets overlap."
+)
+async def get_overlap(
+    a: str = Query(..., description="First agent name"),
+    b: str = Query(..., description="Second agent name"),
+    limit: int = Query(50, ge=0, le=500, description="Max mutual vouchers to list"),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Compare the inbound vouches of two agents.
+    
+    - **a**, **b**: Agent names to compare
+    - **limit**: Maximum number of mutual vouchers to list (default 50, max 500)
+    
+    `counts` and `overlap` always cover the full voucher sets.
+    """
+    result = await session.execute(
+        select(Agent.id, Agent.name)
+        .where(func.lower(Agent.name).in_([a.lower(), b.lower()]))
+    )
+    agents_by_name = {name.lower(): (agent_id, name) for agent_id, name in result.all()}
+    
+    for name in (a, b):
+        if name.lower() not in agents_by_name:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Agent '{name}' not found"
+            )
+    
+    a_id, a_name = agents_by_name[a.lower()]
+    b_id, b_name = agents_by_name[b.lower()]
+    
+    async def vouchers(agent_id: int):
+        """Voucher ids (ascending) and their scores, from the to_agent_id index."""
+        rows = await session.execute(
+            select(Vouch.from_agent_id, Vouch.score)
+            .where(Vouch.to_agent_id == agent_id)
+            .order_by(Vouch.from_agent_id)
+        )
+        ids, scores = array("i"), array("b")
+        for from_id, score in rows.all():
+            ids.append(from_id)
+            scores.append(score)
+        return ids, scores
+    
+    a_ids, a_scores = await vouchers(a_id)
+    b_ids, b_scores = await vouchers(b_id)
+    
+    def score_from(ids: array, scores: array, voucher_id: int) -> Optional[int]:
+        position = bisect_left(ids, voucher_id)
+        if position < len(ids) and ids[position] == voucher_id:
+            return scores[position]
+        return None
+    
+    common = intersect_sorted(a_ids, b_ids)
+    union = len(a_ids) + len(b_ids) - len(common)
+    
+    listed = common[:limit]
+    names = {}
+    if listed:
+        names_result = await session.execute(
+            select(Agent.id, Agent.name).where(Agent.id.in_(listed))
+        )
+        names = dict(names_result.all())
+    
+    return {
+        "success": True,
+        "a": {"id": a_id, "name": a_name},
+        "b": {"id": b_id, "name": b_name},
+        "reciprocal": {
+            "a_to_b": score_from(b_ids, b_scores, a_id),
+            "b_to_a": score_from(a_ids, a_scores, b_id),
+        },
+        "counts": {
+            "a_vouchers": len(a_ids),
+            "b_vouchers": len(b_ids),
+            "mutual": len(common),
+        },
+        "overlap": {
+            "jaccard": len(common) / union if union else 0.0,
+            "of_a": len(common) / len(a_ids) if a_ids else 0.0,
+            "of_b": len(common) / len(b_ids) if b_ids else 0.0,
+        },
+        "mutual_vouchers": [
+            {
+                "id": voucher_id,
+                "name": names.get(voucher_id),
+                "score_to_a": score_from(a_ids, a_scores, voucher_id),
+                "score_to_b": score_from(b_ids, b_scores, voucher_id),
+            }
+            for voucher_id in listed
+        ],
+    }
@@ -1,55 +1,114 @@
 """
 Agent Ethos - Leaderboard Routes
 """
-from fastapi import APIRouter, Depends, Query
-from sqlmodel import select
+from typing import Optional
+from fastapi import APIRouter, Depends, Query, Header
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_session
-from app.models import Agent
-from app.models.agent import AgentPublic
+from app.database import get_session, async_session
+from app.admission import admit, READ
+from app.events import hub, top_agents, replay_events, event_stream
+from app.history import get_top_movers, MOVERS_TOP_K
+from app.singleflight import coalesce
+from app.reads import leaderboard_public, parse_fields, AGENT_PUBLIC_FIELDS
 
 router = APIRouter()
 
 
 @router.get(
     "",
+    dependencies=[Depends(admit("leaderboard", READ))],
     response_model=dict,
     summary="Get reputation leaderboard",
     description="Get the top agents sorted by reputation score."
 )
+@coalesce("limit", "fields")
 async def get_leaderboard(
     limit: int = Query(50, ge=1, le=100, description="Max agents to return"),
+    fields: Optional[str] = Query(None, description="Comma-separated agent fields to return, e.g. name,reputation"),
     session: AsyncSession = Depends(get_session)
 ):
     """
     Get the reputation leaderboard.
     
     - **limit**: Maximum number of agents to return (default 50, max 100)
+    - **fields**: Only return these agent fields (default: all)
     
     Returns agents sorted by reputation score (highest first).
     """
-    result = await session.execute(
-        select(Agent)
-        .order_by(Agent.reputation.desc(), Agent.created_at.asc())
-        .limit(limit)
-    )
-    agents = result.scalars().all()
+    selected = parse_fields(fields, AGENT_PUBLIC_FIELDS)
+    return {
+        "success": True,
+        "leaderboard": await leaderboard_public(session, limit, selected),
+    }
+
+
+@router.get(
+    "/movers",
+    dependencies=[Depends(admit("leaderboard.movers", READ))],
+    response_model=dict,
+    summary="Get top movers",
+    description="Get the agents with the largest reputation gain over the last 24 hours, 7 days or 30 days."
+)
+async def get_movers(
+    window: str = Query("24h", pattern="^(24h|7d|30d)$", description="Time window: 24h, 7d or 30d"),
+    limit: int = Query(20, ge=1, le=MOVERS_TOP_K, description="Max agents to return"),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Get the top movers leaderboard.
     
-    leaderboard = [
-        AgentPublic(
-            id=agent.id,
-            name=agent.name,
-            description=agent.description,
-            reputation=agent.reputation,
-            is_claimed=agent.is_claimed,
-            created_at=agent.created_at,
-        )
-        for agent in agents
-    ]
+    - **window**: `24h`, `7d` or `30d` (default `24h`)
+    - **limit**: Maximum number of agents to return (default 20, max 100)
+    
+    Gains are summed from hourly buckets, so windows are hour-aligned.
+    Results are cached for a minute and the buckets are refreshed in the
+    background.
+    """
+    movers = await get_top_movers(session, window)
     
     return {
         "success": True,
-        "leaderboard": leaderboard,
+        "window": window,
+        "movers": movers[:limit],
     }
 
+
+@router.get(
+    "/stream",
+    summary="Stream leaderboard changes",
+    description="Server-Sent Events stream of reputation and rank changes for live leaderboards.",
+    response_class=StreamingResponse,
+)
+async def stream_leaderboard(
+    last_event_id: Optional[int] = Header(None, description="Resume after this event id"),
+):
+    """
+    Stream leaderboard changes as Server-Sent Events.
+    
+    The stream starts with a `leaderboard` event holding the current top
+    agents, followed by `reputation` events. Rapid changes to the same agent
+    are coalesced into the latest one; `rank` is set for agents in the top 100.
+    Reconnect with `Last-Event-ID` to replay missed events.
+    """
+    # Subscribe before reading so nothing published during the reads is
+    # missed; the session is closed before streaming so the connection
+    # isn't held for the life of the stream
+    subscriber = hub.subscribe()
+    try:
+        async with async_session() as session:
+            if not top_agents.loaded:
+                await top_agents.load(session)
+            replay = []
+            if last_event_id is not None:
+                replay = await replay_events(session, last_event_id)
+    except BaseException:
+        hub.unsubscribe(subscriber)
+        raise
+    
+    return StreamingResponse(
+        event_stream(subscriber, top_agents.snapshot(), replay),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
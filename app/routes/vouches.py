@@ -1,43 +1,55 @@
 """
 Agent Ethos - Vouch Routes
 """
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
-from sqlmodel import select, func
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Header, Response
+from sqlmodel import select, func, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_session
+from app.admission import admit, READ, WRITE
 from app.models import Agent, Vouch, Flag
 from app.models.vouch import VouchCreate, VouchPublic, VouchResponse
-from app.models.flag import FlagCreate, FlagResponse
+from app.models.flag import FlagCreate, FlagPublic, FlagResponse
 from app.auth import get_current_agent
+from app.queries import agent_by_name, vouch_by_id
+from app.reads import agent_row_by_name, recent_vouches_public, parse_fields, fields_scope, VOUCH_PUBLIC_FIELDS
+from app.autocomplete import name_index
+from app.graph import trust_graph
+from app.trust import personalized_cache
+from app.events import record_reputation_event, publish_event
+from app.reputation import adjust_agent_reputation, reputation_queue
+from app.conditional import agent_etag, etag_matches, set_etag, not_modified
+from app.pagination import encode_cursor, keyset_before
 
 router = APIRouter()
 
+# Max vouch ids accepted by the bulk flags endpoint
+MAX_BULK_VOUCH_IDS = 100
 
-async def update_agent_reputation(session: AsyncSession, agent_id: int):
-    """
-    Recalculate and update an agent's reputation score.
-    Reputation = sum of all vouch scores received.
-    """
-    result = await session.execute(
-        select(func.coalesce(func.sum(Vouch.score), 0))
-        .where(Vouch.to_agent_id == agent_id)
+
+def _flags_with_flagger():
+    """Select flags joined with the flagger's name in a single query."""
+    return (
+        select(Flag, Agent.name)
+        .outerjoin(Agent, Agent.id == Flag.flagger_agent_id)
     )
-    total_reputation = result.scalar()
-    
-    agent_result = await session.execute(
-        select(Agent).where(Agent.id == agent_id)
+
+
+def _flag_public(flag: Flag, flagger_name: Optional[str]) -> FlagPublic:
+    return FlagPublic(
+        id=flag.id,
+        vouch_id=flag.vouch_id,
+        flagger_agent_id=flag.flagger_agent_id,
+        reason=flag.reason,
+        created_at=flag.created_at,
+        flagger_name=flagger_name,
     )
-    agent = agent_result.scalar_one_or_none()
-    
-    if agent:
-        agent.reputation = total_reputation
-        session.add(agent)
 
 
 @router.post(
     "",
+    dependencies=[Depends(admit("vouches.create", WRITE))],
     response_model=VouchResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Create or update a vouch",
@@ -60,10 +72,7 @@ async def create_vouch(
     and the target's reputation will be adjusted accordingly.
     """
     # Find target agent by name (case-insensitive)
-    result = await session.execute(
-        select(Agent).where(func.lower(Agent.name) == data.to_name.lower())
-    )
-    target_agent = result.scalar_one_or_none()
+    target_agent = await agent_by_name(session, data.to_name)
     
     if not target_agent:
         raise HTTPException(
@@ -87,6 +96,8 @@ async def create_vouch(
     )
     existing_vouch = existing_result.scalar_one_or_none()
     
+    previous_score = existing_vouch.score if existing_vouch else 0
+    
     if existing_vouch:
         # Update existing vouch
         existing_vouch.score = data.score
@@ -105,12 +116,26 @@ async def create_vouch(
         )
         session.add(vouch)
     
+    await session.flush()
+    
+    # Adjust target's reputation and log the change in the same transaction
+    await adjust_agent_reputation(session, target_agent, vouch.score - previous_score)
+    event = record_reputation_event(
+        session,
+        target_agent,
+        kind="vouch",
+        delta=vouch.score - previous_score,
+        vouch_id=vouch.id,
+    )
     await session.commit()
     await session.refresh(vouch)
     
-    # Update target's reputation
-    await update_agent_reputation(session, target_agent.id)
-    await session.commit()
+    # Authoritative recompute from all vouches happens off the request path
+    reputation_queue.mark_dirty(target_agent.id)
+    name_index.set_reputation(target_agent.id, target_agent.reputation)
+    trust_graph.set_edge(vouch.from_agent_id, vouch.to_agent_id, vouch.score)
+    personalized_cache.invalidate(current_agent.id)
+    await publish_event(session, event, target_agent)
     
     return VouchResponse(
         success=True,
@@ -131,13 +156,17 @@ async def create_vouch(
 
 @router.get(
     "",
+    dependencies=[Depends(admit("vouches.list", READ))],
     response_model=dict,
     summary="Get vouches for an agent",
     description="Get recent vouches received by an agent."
 )
 async def get_vouches(
+    response: Response,
     target: str = Query(..., description="Target agent name"),
     limit: int = Query(20, ge=1, le=100, description="Max vouches to return"),
+    fields: Optional[str] = Query(None, description="Comma-separated vouch fields to return, e.g. from_agent_name,score"),
+    if_none_match: Optional[str] = Header(None, description="ETag from a previous response"),
     session: AsyncSession = Depends(get_session)
 ):
     """
@@ -145,12 +174,15 @@ async def get_vouches(
     
     - **target**: Agent name to get vouches for
     - **limit**: Maximum number of vouches to return (default 20, max 100)
+    - **fields**: Only return these vouch fields (default: all)
+    
+    Responses carry an `ETag`; send it back in `If-None-Match` to get
+    `304 Not Modified` while the agent's vouches are unchanged.
     """
-    # Find target agent
-    result = await session.execute(
-        select(Agent).where(func.lower(Agent.name) == target.lower())
-    )
-    target_agent = result.scalar_one_or_none()
+    selected = parse_fields(fields, VOUCH_PUBLIC_FIELDS)
+    
+    # Find target agent (only its id, name and version are needed)
+    target_agent = await agent_row_by_name(session, target, fields=())
     
     if not target_agent:
         raise HTTPException(
@@ -158,44 +190,21 @@ async def get_vouches(
             detail=f"Agent '{target}' not found"
         )
     
-    # Get vouches
-    vouches_result = await session.execute(
-        select(Vouch)
-        .where(Vouch.to_agent_id == target_agent.id)
-        .order_by(Vouch.created_at.desc())
-        .limit(limit)
-    )
-    vouches = vouches_result.scalars().all()
-    
-    # Build response with agent names
-    vouches_public = []
-    for vouch in vouches:
-        from_agent_result = await session.execute(
-            select(Agent).where(Agent.id == vouch.from_agent_id)
-        )
-        from_agent = from_agent_result.scalar_one_or_none()
-        
-        vouches_public.append(VouchPublic(
-            id=vouch.id,
-            from_agent_id=vouch.from_agent_id,
-            to_agent_id=vouch.to_agent_id,
-            score=vouch.score,
-            note=vouch.note,
-            receipt_url=vouch.receipt_url,
-            flags_count=vouch.flags_count,
-            created_at=vouch.created_at,
-            from_agent_name=from_agent.name if from_agent else None,
-            to_agent_name=target_agent.name,
-        ))
+    etag = agent_etag(target_agent.id, target_agent.version, fields_scope("vouches", selected))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
     
+    # Vouches with voucher names, read as plain rows
     return {
         "success": True,
-        "vouches": vouches_public,
+        "vouches": await recent_vouches_public(session, target_agent, limit, selected),
     }
 
 
 @router.post(
     "/{vouch_id}/flag",
+    dependencies=[Depends(admit("vouches.flag", WRITE))],
     response_model=FlagResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Flag a vouch",
@@ -216,10 +225,7 @@ async def flag_vouch(
     Each agent can only flag a specific vouch once.
     """
     # Find the vouch
-    vouch_result = await session.execute(
-        select(Vouch).where(Vouch.id == vouch_id)
-    )
-    vouch = vouch_result.scalar_one_or_none()
+    vouch = await vouch_by_id(session, vouch_id)
     
     if not vouch:
         raise HTTPException(
@@ -230,7 +236,7 @@ async def flag_vouch(
     # Check for existing flag from this agent
     existing_result = await session.execute(
         select(Flag).where(
-            Flag.vouch_id == vouch_id,
+            Flag.vouch_id == vouch.id,
             Flag.flagger_agent_id == current_agent.id
         )
     )
@@ -244,17 +250,159 @@ async def flag_vouch(
     
     # Create flag
     flag = Flag(
-        vouch_id=vouch_id,
+        vouch_id=vouch.id,
         flagger_agent_id=current_agent.id,
         reason=data.reason,
     )
     session.add(flag)
     
     # Update vouch flags count
-    vouch.flags_count += 1
-    session.add(vouch)
+    await session.execute(
+        update(Vouch)
+        .where(Vouch.id == vouch.id)
+        .values(flags_count=Vouch.flags_count + 1)
+        .execution_options(synchronize_session=False)
+    )
+    
+    # The target's vouch listings changed
+    await session.execute(
+        update(Agent)
+        .where(Agent.id == vouch.to_agent_id)
+        .values(version=Agent.version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    
+    target_agent = await session.get(Agent, vouch.to_agent_id)
+    event = record_reputation_event(session, target_agent, kind="flag", vouch_id=vouch.id)
     
     await session.commit()
     
+    await publish_event(session, event, target_agent)
+    
     return FlagResponse(success=True)
 
+
+@router.get(
+    "/flags",
+    dependencies=[Depends(admit("vouches.flags", READ))],
+    response_model=dict,
+    summary="Get flags for many vouches",
+    description="Bulk moderation view: the most recent flags for each of the given vouches in one call."
+)
+async def get_flags_bulk(
+    vouch_ids: List[int] = Query(..., description="Vouch IDs (repeat the parameter)"),
+    limit: int = Query(20, ge=1, le=100, description="Max flags per vouch"),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Get recent flags for several vouches at once.
+    
+    - **vouch_ids**: Vouch IDs to look up (max 100)
+    - **limit**: Maximum number of flags per vouch (default 20, max 100)
+    
+    Each result carries a `next_cursor` for continuing with
+    `GET /vouches/{vouch_id}/flags` when more flags exist.
+    """
+    vouch_ids = list(dict.fromkeys(vouch_ids))
+    if len(vouch_ids) > MAX_BULK_VOUCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_BULK_VOUCH_IDS} vouch ids per request"
+        )
+    
+    # Rank flags per vouch with a window over ix_flags_vouch_created and keep
+    # one extra row per vouch to know whether another page exists
+    ranked = (
+        select(
+            Flag.id.label("flag_id"),
+            func.row_number().over(
+                partition_by=Flag.vouch_id,
+                order_by=(Flag.created_at.desc(), Flag.id.desc()),
+            ).label("rn"),
+        )
+        .where(Flag.vouch_id.in_(vouch_ids))
+        .subquery()
+    )
+    result = await session.execute(
+        _flags_with_flagger()
+        .join(ranked, ranked.c.flag_id == Flag.id)
+        .where(ranked.c.rn <= limit + 1)
+        .order_by(Flag.vouch_id, Flag.created_at.desc(), Flag.id.desc())
+    )
+    
+    grouped = {vouch_id: [] for vouch_id in vouch_ids}
+    for flag, flagger_name in result.all():
+        grouped[flag.vouch_id].append((flag, flagger_name))
+    
+    results = []
+    for vouch_id, rows in grouped.items():
+        page = rows[:limit]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1][0]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        results.append({
+            "vouch_id": vouch_id,
+            "flags": [_flag_public(flag, name) for flag, name in page],
+            "next_cursor": next_cursor,
+        })
+    
+    return {
+        "success": True,
+        "results": results,
+    }
+
+
+@router.get(
+    "/{vouch_id}/flags",
+    dependencies=[Depends(admit("vouches.vouch_flags", READ))],
+    response_model=dict,
+    summary="Get flags for a vouch",
+    description="Get flags raised against a vouch, newest first, with cursor pagination."
+)
+async def get_flags(
+    vouch_id: int = Path(..., description="ID of the vouch"),
+    limit: int = Query(20, ge=1, le=100, description="Max flags to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from a previous page"),
+    session: AsyncSession = Depends(get_session)
+):
+    """
+    Get flags for a vouch.
+    
+    - **vouch_id**: ID of the vouch
+    - **limit**: Maximum number of flags to return (default 20, max 100)
+    - **cursor**: `next_cursor` from the previous page
+    """
+    vouch_result = await session.execute(
+        select(Vouch.id).where(Vouch.id == vouch_id)
+    )
+    if vouch_result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Vouch {vouch_id} not found"
+        )
+    
+    query = (
+        _flags_with_flagger()
+        .where(Flag.vouch_id == vouch_id)
+        .order_by(Flag.created_at.desc(), Flag.id.desc())
+        .limit(limit + 1)
+    )
+    after = keyset_before(Flag.created_at, Flag.id, cursor)
+    if after is not None:
+        query = query.where(after)
+    
+    result = await session.execute(query)
+    rows = result.all()
+    
+    page = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1][0]
+        next_cursor = encode_cursor(last.created_at, last.id)
+    
+    return {
+        "success": True,
+        "flags": [_flag_public(flag, name) for flag, name in page],
+        "next_cursor": next_cursor,
+    }
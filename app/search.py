@@ -0,0 +1,142 @@
+"""
+Agent Ethos - Agent Search Index
+SQLite uses an external-content FTS5 table kept in sync by triggers.
+PostgreSQL uses expression GIN indexes (tsvector + pg_trgm) on agents.
+"""
+import logging
+import re
+from typing import List
+from sqlalchemy import event, text, Integer, Float
+from sqlalchemy.engine import Connection
+
+from app.models import Agent
+
+logger = logging.getLogger(__name__)
+
+# Dialects with a search index; /search answers 501 elsewhere
+SEARCH_DIALECTS = ("sqlite", "postgresql")
+
+# Weight of a name match relative to a description match in bm25 ranking
+NAME_WEIGHT = 10.0
+
+SQLITE_CREATE = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS agents_fts USING fts5(
+        name, description,
+        content='agents', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS agents_fts_ai AFTER INSERT ON agents BEGIN
+        INSERT INTO agents_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS agents_fts_ad AFTER DELETE ON agents BEGIN
+        INSERT INTO agents_fts(agents_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS agents_fts_au AFTER UPDATE OF name, description ON agents BEGIN
+        INSERT INTO agents_fts(agents_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO agents_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+]
+
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS agents_fts_ai",
+    "DROP TRIGGER IF EXISTS agents_fts_ad",
+    "DROP TRIGGER IF EXISTS agents_fts_au",
+    "DROP TABLE IF EXISTS agents_fts",
+]
+
+# Index expressions must match the search query text exactly to be used
+POSTGRES_DOCUMENT = "to_tsvector('simple', name || ' ' || description)"
+
+POSTGRES_CREATE = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS ix_agents_search_tsv ON agents USING gin ({POSTGRES_DOCUMENT})",
+    "CREATE INDEX IF NOT EXISTS ix_agents_name_trgm ON agents USING gin (lower(name) gin_trgm_ops)",
+]
+
+POSTGRES_DROP = [
+    "DROP INDEX IF EXISTS ix_agents_search_tsv",
+    "DROP INDEX IF EXISTS ix_agents_name_trgm",
+]
+
+
+def _statements(connection: Connection, create: bool) -> List[str]:
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        return SQLITE_CREATE if create else SQLITE_DROP
+    if dialect == "postgresql":
+        return POSTGRES_CREATE if create else POSTGRES_DROP
+    return []
+
+
+@event.listens_for(Agent.__table__, "after_create")
+def _create_search_index(target, connection, **kw):
+    for statement in _statements(connection, create=True):
+        connection.execute(text(statement))
+
+
+@event.listens_for(Agent.__table__, "before_drop")
+def _drop_search_index(target, connection, **kw):
+    for statement in _statements(connection, create=False):
+        connection.execute(text(statement))
+
+
+def ensure_search_index(connection: Connection):
+    """
+    Create the search index on databases whose agents table predates it,
+    backfilling the FTS5 table from existing rows.
+    """
+    if connection.dialect.name == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'agents_fts'")
+        ).first()
+        _create_search_index(Agent.__table__, connection)
+        if not exists:
+            connection.execute(text("INSERT INTO agents_fts(agents_fts) VALUES ('rebuild')"))
+    elif connection.dialect.name in SEARCH_DIALECTS:
+        _create_search_index(Agent.__table__, connection)
+    else:
+        logger.warning("Agent search is not supported on %s; /search will return 501", connection.dialect.name)
+
+
+def tokenize_query(q: str) -> List[str]:
+    """Split a user query into lowercase word tokens."""
+    return re.findall(r"\w+", q.lower())
+
+
+def ranked_matches(dialect: str, tokens: List[str]):
+    """
+    Build a subquery of (agent_id, score) for agents matching every token
+    as a prefix. Lower scores rank higher. `dialect` must be one of
+    SEARCH_DIALECTS.
+    """
+    if dialect == "sqlite":
+        match = " ".join(f'"{token}"*' for token in tokens)
+        statement = text(
+            f"SELECT rowid AS agent_id, bm25(agents_fts, {NAME_WEIGHT}, 1.0) AS score "
+            "FROM agents_fts WHERE agents_fts MATCH :match"
+        ).bindparams(match=match)
+    elif dialect == "postgresql":
+        tsquery = " & ".join(f"{token}:*" for token in tokens)
+        statement = text(
+            f"SELECT id AS agent_id, "
+            f"-(ts_rank({POSTGRES_DOCUMENT}, q) + similarity(lower(name), :term)) AS score "
+            f"FROM agents, to_tsquery('simple', :tsquery) AS q "
+            f"WHERE {POSTGRES_DOCUMENT} @@ q OR lower(name) % :term"
+        ).bindparams(tsquery=tsquery, term=" ".join(tokens))
+    else:
+        raise NotImplementedError(f"Search is not supported on {dialect}")
+
+    return statement.columns(agent_id=Integer, score=Float).subquery("ranked")
@@ -0,0 +1,121 @@
+"""
+Agent Ethos - Request Coalescing
+Concurrent identical reads share one in-flight computation: the first
+request runs the endpoint, the others await its result. Opt in per route
+with @coalesce.
+"""
+import asyncio
+import copy
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from fastapi import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import get_settings
+from app.database import async_session
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key. The shared call runs as its own
+    task, so a caller that disconnects does not cancel it for the others.
+    Nothing is cached: once the call finishes, the next caller starts anew.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.enabled:
+            return await fn()
+        task = self._calls.get(key)
+        if task is None:
+            self.calls += 1
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every caller went away
+            task.exception()
+
+    def clear(self):
+        self._calls.clear()
+        self.calls = 0
+        self.shared = 0
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "in_flight": len(self._calls),
+            "calls": self.calls,
+            "shared": self.shared,
+        }
+
+
+# Process-wide group used by @coalesce
+flights = SingleFlight(enabled=get_settings().singleflight_enabled)
+
+
+def coalesce(*params: str, normalize: Optional[Dict[str, Callable[[Any], Hashable]]] = None):
+    """
+    Route decorator: concurrent calls with equal `params` share one
+    execution. `normalize` maps a parameter to a function applied before
+    comparison (e.g. str.lower for case-insensitive names).
+
+    Only use on read-only endpoints. The shared call runs on a session of
+    its own in place of the caller's injected one, so it does not depend on
+    the request that started it. Headers it sets on its injected Response
+    are copied to every caller's response.
+    """
+    normalize = normalize or {}
+
+    def decorator(endpoint):
+        route = f"{endpoint.__module__}.{endpoint.__qualname__}"
+
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            if not flights.enabled:
+                return await endpoint(**kwargs)
+            key = (route,) + tuple(
+                normalize.get(name, _identity)(kwargs[name]) for name in params
+            )
+            response = next((value for value in kwargs.values() if isinstance(value, Response)), None)
+
+            async def call():
+                async with async_session() as session:
+                    result = await endpoint(**{
+                        name: session if isinstance(value, AsyncSession) else value
+                        for name, value in kwargs.items()
+                    })
+                headers = list(response.headers.items()) if response is not None else []
+                return result, headers
+
+            result, headers = await flights.do(key, call)
+            if response is not None:
+                for name, value in headers:
+                    response.headers[name] = value
+            if isinstance(result, Response):
+                # FastAPI attaches per-request background tasks to it
+                return copy.copy(result)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _identity(value: Any) -> Any:
+    return value
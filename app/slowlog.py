@@ -0,0 +1,166 @@
+"""
+Agent Ethos - Slow Query Log
+Engine hooks that record statements slower than a threshold, with the
+shape of their parameters (never the values), the route that ran them and
+the query plan, fetched in the background on a separate connection.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.cache import LRUCache
+from app.context import current_route
+
+logger = logging.getLogger(__name__)
+
+# Plans are cached per statement text so a hot slow query is explained once
+PLAN_CACHE_SIZE = 256
+
+EXPLAINABLE = ("SELECT", "WITH", "UPDATE", "DELETE")
+
+
+def parameter_shape(parameters: Any) -> str:
+    """Type names of bound parameters, with runs collapsed: `(str, int x 500)`."""
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (list, tuple, dict)):
+            return f"{len(parameters)} x {parameter_shape(parameters[0])}"
+        runs: List[List] = []
+        for value in parameters:
+            name = type(value).__name__
+            if runs and runs[-1][0] == name:
+                runs[-1][1] += 1
+            else:
+                runs.append([name, 1])
+        return "(" + ", ".join(name if count == 1 else f"{name} x {count}" for name, count in runs) + ")"
+    return type(parameters).__name__
+
+
+class SlowQueryLog:
+    """Ring buffer of slow statements, filled by engine cursor events."""
+
+    def __init__(self, max_entries: int = 100):
+        self.entries: deque = deque(maxlen=max_entries)
+        self.threshold_ms: Optional[float] = None
+        self.recorded = 0
+        self._engine: Optional[AsyncEngine] = None
+        self._plans = LRUCache(PLAN_CACHE_SIZE)
+        self._pending: Set[asyncio.Task] = set()
+        # Statements being explained, with the entries waiting for the plan
+        self._explaining: Dict[str, List[dict]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self._engine is not None
+
+    def install(self, engine: AsyncEngine, threshold_ms: float, max_entries: Optional[int] = None):
+        self.uninstall()
+        if max_entries is not None:
+            self.entries = deque(maxlen=max_entries)
+        self.threshold_ms = threshold_ms
+        self._engine = engine
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after)
+
+    def uninstall(self):
+        if self._engine is not None:
+            event.remove(self._engine.sync_engine, "before_cursor_execute", self._before)
+            event.remove(self._engine.sync_engine, "after_cursor_execute", self._after)
+        self._engine = None
+        self.threshold_ms = None
+
+    def clear(self):
+        self.entries.clear()
+        self._plans.clear()
+        self._explaining.clear()
+        self.recorded = 0
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        context._slowlog_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slowlog_started", None)
+        if started is None or context.execution_options.get("slowlog_skip"):
+            return
+        duration_ms = (time.perf_counter() - started) * 1000
+        if duration_ms < self.threshold_ms:
+            return
+
+        entry = {
+            "at": datetime.utcnow().isoformat(),
+            "duration_ms": round(duration_ms, 3),
+            "route": current_route(),
+            "statement": statement,
+            "parameters": parameter_shape(parameters),
+            "plan": self._plans.get(statement),
+        }
+        self.entries.append(entry)
+        self.recorded += 1
+
+        if entry["plan"] is None and not executemany and statement.lstrip()[:6].upper().startswith(EXPLAINABLE):
+            waiting = self._explaining.get(statement)
+            if waiting is not None:
+                # Already being explained: share that plan
+                waiting.append(entry)
+                return
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return
+            self._explaining[statement] = [entry]
+            task = loop.create_task(self._explain(statement, parameters))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _explain(self, statement: str, parameters: Any):
+        plan = None
+        try:
+            plan = await self._fetch_plan(statement, parameters)
+        finally:
+            for entry in self._explaining.pop(statement, []):
+                entry["plan"] = plan
+
+    async def _fetch_plan(self, statement: str, parameters: Any) -> Optional[List[str]]:
+        engine = self._engine
+        if engine is None:
+            return None
+        prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+        try:
+            async with engine.connect() as conn:
+                conn = await conn.execution_options(slowlog_skip=True)
+                result = await conn.exec_driver_sql(prefix + statement, parameters)
+                # SQLite: (id, parent, notused, detail); PostgreSQL: one text column
+                plan = [str(row[-1]) for row in result.all()]
+        except Exception as exc:
+            logger.debug(f"EXPLAIN failed: {exc}")
+            return [f"EXPLAIN failed: {exc.__class__.__name__}"]
+        self._plans.set(statement, plan)
+        return plan
+
+    async def flush(self):
+        """Wait for plans still being fetched."""
+        while self._pending:
+            await asyncio.gather(*list(self._pending), return_exceptions=True)
+
+    def snapshot(self) -> List[dict]:
+        """Recorded entries, newest first."""
+        return list(reversed(self.entries))
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "threshold_ms": self.threshold_ms,
+            "recorded": self.recorded,
+            "buffered": len(self.entries),
+            "capacity": self.entries.maxlen,
+        }
+
+
+# Process-wide log, installed on the engine by app.database when enabled
+slow_query_log = SlowQueryLog()
@@ -0,0 +1,239 @@
+"""
+Agent Ethos - Vouch Graph Snapshots
+Writes the vouch graph to a flat binary file of typed arrays and maps it
+back read-only, so a warm start or an analytics worker reads the page
+cache instead of scanning the vouches table.
+
+File layout (little-endian, every section 8-byte aligned):
+
+    header       magic, version, num_nodes, num_edges, watermark
+    out_offsets  int64[num_nodes + 1]   row starts by from_agent_id
+    out_targets  int32[num_edges]       to_agent_id, ascending per row
+    out_scores   int8[num_edges]
+    out_created  int64[num_edges]       created_at, microseconds since epoch
+    out_flags    int32[num_edges]       flags_count
+    in_offsets   int64[num_nodes + 1]   row starts by to_agent_id
+    in_sources   int32[num_edges]       from_agent_id, ascending per row
+    in_scores    int8[num_edges]
+
+The watermark is the highest reputation event id at snapshot time. Every
+vouch write and flag logs an event, so vouches touched by later events
+are exactly the ones a loader has to replay. Events can commit out of id
+order, so the loader also replays a trailing window below the watermark;
+replaying a vouch just sets its edge to the current score again.
+
+Usage:
+    python -m app.snapshot [path]
+"""
+import asyncio
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlmodel import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.graph import TrustGraph, trust_graph, _build_csr, LOAD_BATCH_SIZE
+from app.events import WATERMARK_SAFETY_WINDOW
+from app.models import Vouch, ReputationEvent
+
+MAGIC = b"AEGRAPH\x00"
+VERSION = 1
+
+# magic, version, reserved, num_nodes, num_edges, watermark
+HEADER = struct.Struct("<8sII3q")
+HEADER_SIZE = 64
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def _align(position: int) -> int:
+    return (position + 7) & ~7
+
+
+def _layout(num_nodes: int, num_edges: int) -> List[Tuple[str, int]]:
+    """(array typecode, length) of each section, in file order."""
+    return [
+        ("q", num_nodes + 1),
+        ("i", num_edges),
+        ("b", num_edges),
+        ("q", num_edges),
+        ("i", num_edges),
+        ("q", num_nodes + 1),
+        ("i", num_edges),
+        ("b", num_edges),
+    ]
+
+
+def _to_micros(value: datetime) -> int:
+    delta = value - EPOCH
+    return (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+async def write_snapshot(session: AsyncSession, path: str) -> dict:
+    """
+    Stream the vouches table into a snapshot at `path`. The file is written
+    beside the target and renamed into place, so processes that still map
+    the previous snapshot keep a consistent view.
+    """
+    # Read the watermark first: anything committed after it is replayed
+    watermark = (await session.execute(
+        select(func.coalesce(func.max(ReputationEvent.id), 0))
+    )).scalar_one()
+
+    froms, tos, scores = array("i"), array("i"), array("b")
+    created, flags = array("q"), array("i")
+    result = await session.stream(
+        select(Vouch.from_agent_id, Vouch.to_agent_id, Vouch.score, Vouch.created_at, Vouch.flags_count)
+        .order_by(Vouch.from_agent_id, Vouch.to_agent_id)
+    )
+    async for rows in result.partitions(LOAD_BATCH_SIZE):
+        for from_id, to_id, score, created_at, flags_count in rows:
+            froms.append(from_id)
+            tos.append(to_id)
+            scores.append(score)
+            created.append(_to_micros(created_at))
+            flags.append(flags_count)
+
+    num_nodes = max(max(froms, default=0), max(tos, default=0)) + 1
+    num_edges = len(froms)
+    # Rows arrive sorted by (from, to), so the stable counting sort leaves
+    # targets, created and flags in input order
+    out_offsets, out_targets, out_scores = _build_csr(froms, tos, scores, num_nodes)
+    in_offsets, in_sources, in_scores = _build_csr(tos, froms, scores, num_nodes)
+    sections = [out_offsets, out_targets, out_scores, created, flags, in_offsets, in_sources, in_scores]
+
+    if sys.byteorder != "little":
+        for section in sections:
+            section.byteswap()
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, num_nodes, num_edges, watermark).ljust(HEADER_SIZE, b"\x00"))
+        for section in sections:
+            f.write(section.tobytes())
+            f.write(b"\x00" * (_align(f.tell()) - f.tell()))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_path, path)
+
+    return {
+        "path": path,
+        "nodes": num_nodes,
+        "edges": num_edges,
+        "watermark": watermark,
+        "bytes": os.path.getsize(path),
+    }
+
+
+class GraphSnapshot:
+    """
+    A snapshot mapped read-only. The arrays are memoryviews over the
+    mapping, so nothing is copied and processes mapping the same file
+    share its pages.
+    """
+
+    def __init__(self, path: str):
+        if sys.byteorder != "little":
+            raise ValueError("Graph snapshots can only be mapped on little-endian hosts")
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._mmap) < HEADER_SIZE:
+            raise ValueError(f"{path} is not a graph snapshot")
+        magic, version, _, num_nodes, num_edges, watermark = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} graph snapshot")
+
+        self.path = path
+        self.num_nodes = num_nodes
+        self.num_edges = num_edges
+        self.watermark = watermark
+
+        view = memoryview(self._mmap)
+        sections = []
+        position = HEADER_SIZE
+        for typecode, length in _layout(num_nodes, num_edges):
+            size = struct.calcsize(typecode) * length
+            if position + size > len(self._mmap):
+                raise ValueError(f"{path} is truncated")
+            sections.append(view[position:position + size].cast(typecode))
+            position = _align(position + size)
+        (
+            self.out_offsets, self.out_targets, self.out_scores, self.out_created, self.out_flags,
+            self.in_offsets, self.in_sources, self.in_scores,
+        ) = sections
+
+    def out_csr(self) -> Tuple[memoryview, memoryview, memoryview]:
+        return self.out_offsets, self.out_targets, self.out_scores
+
+
+def load_snapshot_graph(snapshot: GraphSnapshot, graph: Optional[TrustGraph] = None) -> TrustGraph:
+    """Point `graph` at the snapshot arrays without copying them."""
+    if graph is None:
+        graph = trust_graph
+    graph.load_csr(
+        (snapshot.out_offsets, snapshot.out_targets, snapshot.out_scores),
+        (snapshot.in_offsets, snapshot.in_sources, snapshot.in_scores),
+        snapshot.num_nodes,
+        snapshot.num_edges,
+    )
+    return graph
+
+
+async def replay_since(session: AsyncSession, graph: TrustGraph, watermark: int) -> int:
+    """
+    Apply vouches created or changed after `watermark`, or within the
+    safety window below it, to the graph's overlay. Returns the number of
+    edges replayed.
+    """
+    touched = (
+        select(ReputationEvent.vouch_id)
+        .where(
+            ReputationEvent.id > watermark - WATERMARK_SAFETY_WINDOW,
+            ReputationEvent.vouch_id.is_not(None),
+        )
+        .distinct()
+    )
+    result = await session.stream(
+        select(Vouch.from_agent_id, Vouch.to_agent_id, Vouch.score)
+        .where(Vouch.id.in_(touched))
+        .order_by(Vouch.id)
+    )
+    replayed = 0
+    async for rows in result.partitions(LOAD_BATCH_SIZE):
+        for from_id, to_id, score in rows:
+            graph.set_edge(from_id, to_id, score)
+            replayed += 1
+    return replayed
+
+
+async def load_trust_graph_snapshot(
+    session: AsyncSession,
+    path: str,
+    graph: Optional[TrustGraph] = None,
+) -> Tuple[GraphSnapshot, int]:
+    """Warm start: map the snapshot, then replay what changed since it was written."""
+    if graph is None:
+        graph = trust_graph
+    snapshot = GraphSnapshot(path)
+    load_snapshot_graph(snapshot, graph)
+    replayed = await replay_since(session, graph, snapshot.watermark)
+    return snapshot, replayed
+
+
+async def main():
+    from app.config import get_settings
+    from app.database import async_session
+
+    path = sys.argv[1] if len(sys.argv) > 1 else get_settings().graph_snapshot_path
+    if not path:
+        sys.exit("usage: python -m app.snapshot <path> (or set GRAPH_SNAPSHOT_PATH)")
+    async with async_session() as session:
+        print(await write_snapshot(session, path))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
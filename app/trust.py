@@ -0,0 +1,55 @@
+"""
+Agent Ethos - Personalized Reputation
+Reputation as seen by one agent: personalized PageRank over the in-memory
+vouch graph, seeded from the viewer's own vouches.
+"""
+import heapq
+from typing import List
+from sqlmodel import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import LRUCache
+from app.graph import trust_graph
+from app.models import Agent
+
+# Ranked agents kept per viewer; requests slice from this
+PERSONALIZED_TOP_K = 100
+
+# Viewer rankings are dropped when the viewer vouches, and otherwise expire
+# after the TTL so changes further out in the graph are eventually seen
+personalized_cache = LRUCache(max_entries=10_000, ttl_seconds=300)
+
+
+async def get_personalized_ranking(session: AsyncSession, viewer_id: int) -> List[dict]:
+    """
+    Top agents by personalized trust for `viewer_id`, best first.
+    Served from the per-viewer cache when possible.
+    """
+    ranking = personalized_cache.get(viewer_id)
+    if ranking is not None:
+        return ranking
+
+    scores = trust_graph.personalized_rank(viewer_id)
+    scores.pop(viewer_id, None)
+    top = heapq.nlargest(PERSONALIZED_TOP_K, scores.items(), key=lambda item: item[1])
+
+    ranking = []
+    if top:
+        result = await session.execute(
+            select(Agent.id, Agent.name, Agent.reputation)
+            .where(Agent.id.in_([agent_id for agent_id, _ in top]))
+        )
+        agents = {agent_id: (name, reputation) for agent_id, name, reputation in result.all()}
+        ranking = [
+            {
+                "id": agent_id,
+                "name": agents[agent_id][0],
+                "reputation": agents[agent_id][1],
+                "trust": round(trust, 6),
+            }
+            for agent_id, trust in top
+            if agent_id in agents
+        ]
+
+    personalized_cache.set(viewer_id, ranking)
+    return ranking
@@ -0,0 +1 @@
+# Agent Ethos Benchmarks
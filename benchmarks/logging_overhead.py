@@ -0,0 +1,128 @@
+"""
+Agent Ethos - Logging Overhead Benchmark
+
+Measures GET /agents/profile latency at INFO level (access log plus SQL
+echo) when log output is slow, as with a backed-up stdout pipe. Compares
+logging disabled, a synchronous StreamHandler, the queued pipeline, and
+the queued pipeline keeping 10% of access/SQL info records.
+
+Usage:
+    python -m benchmarks.logging_overhead [--requests 400] [--concurrency 20] [--write-delay-ms 1]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+from httpx import AsyncClient, ASGITransport
+from sqlmodel import SQLModel
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.database import get_session
+from app.logs import configure_logging, shutdown_logging, TEXT_FORMAT
+
+
+class SlowSink:
+    """A text stream whose writes block, like a full pipe."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.lines = 0
+
+    def write(self, text: str):
+        time.sleep(self.delay)
+        self.lines += text.count("\n")
+
+    def flush(self):
+        pass
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def measure(client, requests: int, concurrency: int):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.get("/api/v1/agents/profile", params={"name": "bench"})
+            latencies.append((time.perf_counter() - started) * 1000)
+            assert response.status_code == 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    return {
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "requests_per_s": round(requests / elapsed),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--write-delay-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=20, max_overflow=0)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    root = logging.getLogger()
+    sql_logger = logging.getLogger("sqlalchemy.engine")
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/api/v1/agents/register", json={"name": "bench", "description": ""})
+
+        for mode in ("disabled", "sync", "queued", "sampled"):
+            sink = SlowSink(args.write_delay_ms / 1000)
+            shutdown_logging()
+            handler = None
+            dropped = None
+            if mode == "disabled":
+                root.setLevel(logging.WARNING)
+                sql_logger.setLevel(logging.WARNING)
+            else:
+                root.setLevel(logging.INFO)
+                sql_logger.setLevel(logging.INFO)
+                if mode == "sync":
+                    handler = logging.StreamHandler(sink)
+                    handler.setFormatter(logging.Formatter(TEXT_FORMAT))
+                    root.addHandler(handler)
+                else:
+                    handler = configure_logging(stream=sink, sample_rate=0.1 if mode == "sampled" else 1.0)
+
+            result = await measure(client, args.requests, args.concurrency)
+
+            if mode == "sync":
+                root.removeHandler(handler)
+            elif handler is not None:
+                dropped = handler.dropped
+                shutdown_logging()
+            print({"logging": mode, **result, "lines_written": sink.lines, "dropped": dropped})
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
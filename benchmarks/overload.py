@@ -0,0 +1,104 @@
+"""
+Agent Ethos - Overload Benchmark
+
+Sends GET /agents/profile at a fixed arrival rate above what the
+connection pool can serve, with admission control on and off. Reports
+latency of successful requests and how many were shed with 503.
+
+Usage:
+    python -m benchmarks.overload [--rate 600] [--duration 5] [--pool-size 5] [--pool-timeout 10]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from httpx import AsyncClient, ASGITransport
+from sqlmodel import SQLModel
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.database import get_session
+from app.admission import admission
+from app.singleflight import flights
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=int, default=600, help="Requests per second")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--pool-size", type=int, default=5)
+    parser.add_argument("--pool-timeout", type=float, default=10.0)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        pool_size=args.pool_size,
+        max_overflow=0,
+        pool_timeout=args.pool_timeout,
+    )
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    admission.pool = engine.sync_engine.pool
+    # Every request should reach the database
+    flights.enabled = False
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        for i in range(args.agents):
+            await client.post("/api/v1/agents/register", json={"name": f"agent_{i}", "description": ""})
+
+        for enabled in (False, True):
+            admission.enabled = enabled
+            admission.clear()
+            latencies = []
+            statuses = {}
+
+            async def one(i):
+                started = time.perf_counter()
+                response = await client.get("/api/v1/agents/profile", params={"name": f"agent_{i % args.agents}"})
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+                if response.status_code == 200:
+                    latencies.append((time.perf_counter() - started) * 1000)
+
+            # Open loop: arrivals do not wait for earlier responses
+            started = time.perf_counter()
+            tasks = []
+            for i in range(int(args.rate * args.duration)):
+                delay = started + i / args.rate - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                tasks.append(asyncio.create_task(one(i)))
+            await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - started
+            print({
+                "admission": enabled,
+                "statuses": statuses,
+                "p50_ms": round(statistics.median(latencies), 1) if latencies else None,
+                "p99_ms": round(percentile(latencies, 0.99), 1) if latencies else None,
+                "elapsed_s": round(elapsed, 2),
+            })
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""
+Agent Ethos - Read Path Allocation Benchmark
+
+Compares the ORM read path (entities hydrated into the identity map, then
+copied into response models) with the Core row path in app.reads, for
+the leaderboard and a vouch listing of 100 rows each. Reports CPU time
+and peak traced memory per request, including JSON encoding.
+
+Usage:
+    python -m benchmarks.read_path [--iterations 300] [--rows 100]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+import tracemalloc
+
+from fastapi.encoders import jsonable_encoder
+from sqlmodel import SQLModel, select
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker, aliased
+
+from app.models import Agent, Vouch
+from app.models.agent import AgentPublic
+from app.models.vouch import VouchPublic
+from app.reads import agent_row_by_name, leaderboard_public, recent_vouches_public
+
+
+async def orm_leaderboard(session, limit):
+    result = await session.execute(
+        select(Agent).order_by(Agent.reputation.desc(), Agent.created_at.asc()).limit(limit)
+    )
+    return [
+        AgentPublic(
+            id=agent.id,
+            name=agent.name,
+            description=agent.description,
+            reputation=agent.reputation,
+            is_claimed=agent.is_claimed,
+            created_at=agent.created_at,
+        )
+        for agent in result.scalars().all()
+    ]
+
+
+async def orm_vouches(session, limit):
+    target = (await session.execute(select(Agent).where(Agent.name == "target"))).scalar_one()
+    from_agent = aliased(Agent)
+    result = await session.execute(
+        select(Vouch, from_agent.name)
+        .outerjoin(from_agent, from_agent.id == Vouch.from_agent_id)
+        .where(Vouch.to_agent_id == target.id)
+        .order_by(Vouch.created_at.desc())
+        .limit(limit)
+    )
+    return [
+        VouchPublic(
+            id=vouch.id,
+            from_agent_id=vouch.from_agent_id,
+            to_agent_id=vouch.to_agent_id,
+            score=vouch.score,
+            note=vouch.note,
+            receipt_url=vouch.receipt_url,
+            flags_count=vouch.flags_count,
+            created_at=vouch.created_at,
+            from_agent_name=from_name,
+            to_agent_name=target.name,
+        )
+        for vouch, from_name in result.all()
+    ]
+
+
+async def row_leaderboard(session, limit):
+    return await leaderboard_public(session, limit)
+
+
+async def row_vouches(session, limit):
+    target = await agent_row_by_name(session, "target")
+    return await recent_vouches_public(session, target, limit)
+
+
+async def run(session_factory, handler, rows):
+    # A fresh session per request, as in get_session
+    async with session_factory() as session:
+        return jsonable_encoder({"success": True, "items": await handler(session, rows)})
+
+
+async def measure(session_factory, handler, rows, iterations):
+    for _ in range(20):
+        await run(session_factory, handler, rows)
+
+    started = time.process_time()
+    for _ in range(iterations):
+        await run(session_factory, handler, rows)
+    cpu_us = (time.process_time() - started) * 1e6 / iterations
+
+    tracemalloc.start()
+    peaks = []
+    for _ in range(max(1, iterations // 10)):
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        await run(session_factory, handler, rows)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+    tracemalloc.stop()
+    return {"cpu_us": round(cpu_us), "peak_kib": round(sorted(peaks)[len(peaks) // 2] / 1024, 1)}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--rows", type=int, default=100)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        target = Agent(name="target", api_key_hash="0" * 64)
+        fans = [Agent(name=f"fan_{i}", api_key_hash=f"{i:064d}", reputation=i) for i in range(args.rows)]
+        session.add_all([target, *fans])
+        await session.flush()
+        session.add_all(
+            Vouch(from_agent_id=fan.id, to_agent_id=target.id, score=3, note="reliable results " * 4)
+            for fan in fans
+        )
+        await session.commit()
+
+    for endpoint, orm, rows in (("leaderboard", orm_leaderboard, row_leaderboard), ("vouches", orm_vouches, row_vouches)):
+        for path_name, handler in (("orm", orm), ("core_rows", rows)):
+            print({"endpoint": endpoint, "path": path_name, **await measure(session_factory, handler, args.rows, args.iterations)})
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
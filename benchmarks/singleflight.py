@@ -0,0 +1,90 @@
+"""
+Agent Ethos - Request Coalescing Benchmark
+
+Fires waves of identical concurrent GET /agents/profile and
+GET /leaderboard requests at a file-backed SQLite database and counts
+the SQL statements executed, with coalescing on and off.
+
+Usage:
+    python -m benchmarks.singleflight [--vouchers 20] [--rounds 5]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
+from sqlmodel import SQLModel
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from app.main import app
+from app.database import get_session
+from app.singleflight import flights
+
+CONCURRENCY_LEVELS = (1, 10, 50, 100, 200)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vouchers", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}", pool_size=20, max_overflow=0)
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_session():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_get_session
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/api/v1/agents/register", json={"name": "trending", "description": ""})
+        for i in range(args.vouchers):
+            response = await client.post(
+                "/api/v1/agents/register",
+                json={"name": f"fan_{i}", "description": ""},
+            )
+            await client.post(
+                "/api/v1/vouches",
+                json={"to_name": "trending", "score": 5, "note": ""},
+                headers={"Authorization": f"Bearer {response.json()['api_key']}"},
+            )
+
+        event.listen(engine.sync_engine, "before_cursor_execute", count)
+        for url, params in (("/api/v1/agents/profile", {"name": "trending"}), ("/api/v1/leaderboard", {"limit": 50})):
+            for enabled in (False, True):
+                flights.enabled = enabled
+                for concurrency in CONCURRENCY_LEVELS:
+                    statements = 0
+                    started = time.perf_counter()
+                    for _ in range(args.rounds):
+                        await asyncio.gather(*(client.get(url, params=params) for _ in range(concurrency)))
+                    elapsed = time.perf_counter() - started
+                    print({
+                        "endpoint": url,
+                        "coalescing": enabled,
+                        "concurrency": concurrency,
+                        "statements_per_wave": statements / args.rounds,
+                        "ms_per_wave": round(1000 * elapsed / args.rounds, 1),
+                    })
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+"""
+Agent Ethos - Statement Construction Benchmark
+
+Times the Python side of the hot queries: building the statement and its
+compiled-cache key, then a full session.execute against SQLite. Compares
+statements rebuilt per call (as the routes used to do) with the prebuilt
+statements in app.queries.
+
+Usage:
+    python -m benchmarks.statement_cache [--iterations 5000]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from sqlmodel import SQLModel, select, func
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker, aliased
+
+from app.models import Agent, Vouch
+from app import queries
+
+
+def adhoc_statements(name: str, key_hash: str, agent_id: int):
+    """The hot statements built inline, one request's worth."""
+    from_agent = aliased(Agent)
+    return [
+        (select(Agent).where(func.lower(Agent.name) == name.lower()), None),
+        (select(Agent).where(Agent.api_key_hash == key_hash), None),
+        (
+            select(
+                Vouch.score, Vouch.note, Vouch.receipt_url, Vouch.id, Vouch.from_agent_id,
+                Vouch.to_agent_id, Vouch.flags_count, Vouch.created_at, from_agent.name,
+            )
+            .outerjoin(from_agent, from_agent.id == Vouch.from_agent_id)
+            .where(Vouch.to_agent_id == agent_id)
+            .order_by(Vouch.created_at.desc())
+            .limit(10),
+            None,
+        ),
+        (
+            select(*queries.AGENT_PUBLIC_COLUMNS.values())
+            .order_by(Agent.reputation.desc(), Agent.created_at.asc())
+            .limit(50),
+            None,
+        ),
+    ]
+
+
+def prebuilt_statements(name: str, key_hash: str, agent_id: int):
+    return [
+        (queries.AGENT_BY_NAME, {"name": name.lower()}),
+        (queries.AGENT_BY_API_KEY_HASH, {"key_hash": key_hash}),
+        (queries.VOUCHES_FOR_AGENT, {"agent_id": agent_id, "limit": 10}),
+        (queries.LEADERBOARD, {"limit": 50}),
+    ]
+
+
+def time_construction(build, iterations: int) -> float:
+    """Microseconds per request to build the statements and their cache keys."""
+    started = time.perf_counter()
+    for i in range(iterations):
+        for statement, _ in build(f"agent_{i % 50}", "0" * 64, i % 50 + 1):
+            statement._generate_cache_key()
+    return (time.perf_counter() - started) * 1e6 / iterations
+
+
+async def time_execution(session_factory, build, iterations: int) -> float:
+    """Microseconds per request to execute the statements and fetch results."""
+    async with session_factory() as session:
+        started = time.perf_counter()
+        for i in range(iterations):
+            for statement, params in build(f"agent_{i % 50}", "0" * 64, i % 50 + 1):
+                result = await session.execute(statement, params)
+                result.scalars().all()
+        return (time.perf_counter() - started) * 1e6 / iterations
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=5000)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with session_factory() as session:
+        session.add_all(Agent(name=f"agent_{i}", api_key_hash=f"{i:064d}") for i in range(50))
+        await session.commit()
+
+    for label, build in (("adhoc", adhoc_statements), ("prebuilt", prebuilt_statements)):
+        # Warm the compiled cache so both sides measure steady state
+        await time_execution(session_factory, build, 10)
+        print({
+            "statements": label,
+            "construct_us_per_request": round(time_construction(build, args.iterations), 1),
+            "execute_us_per_request": round(await time_execution(session_factory, build, args.iterations // 5), 1),
+        })
+
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
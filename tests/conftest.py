@@ -1,6 +1,8 @@
 """
 Agent Ethos - Test Configuration
 """
+import logging
+
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient, ASGITransport
@@ -10,10 +12,31 @@ from sqlalchemy.orm import sessionmaker
 
 from app.main import app
 from app.database import get_session
+from app.autocomplete import name_index
+from app.graph import trust_graph
+from app.trust import personalized_cache
+from app.events import hub, top_agents
+from app.reputation import reputation_queue
+from app.history import movers_cache
+from app.singleflight import flights
+from app.admission import admission
+from app.logs import shutdown_logging
+
+# Importing app.main starts the queued JSON log pipeline, whose listener
+# thread writes to stderr outside pytest's per-test capture. Detach it so
+# records go to pytest's log capture, and keep SQL echo out of reports.
+shutdown_logging()
+logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 
 # Test database URL (in-memory SQLite)
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
+# Module-level async_session imports that bypass get_session
+SESSION_FACTORY_USERS = [
+    "app.routes.leaderboard.async_session",
+    "app.singleflight.async_session",
+]
+
 
 @pytest_asyncio.fixture
 async def async_engine():
@@ -49,7 +72,7 @@ async def async_session(async_engine):
 
 
 @pytest_asyncio.fixture
-async def client(async_engine):
+async def client(async_engine, monkeypatch):
     """Create test HTTP client with overridden database."""
     async_session_factory = sessionmaker(
         async_engine,
@@ -62,6 +85,18 @@ async def client(async_engine):
             yield session
     
     app.dependency_overrides[get_session] = override_get_session
+    # Handlers that open their own short-lived sessions use the test engine too
+    for target in SESSION_FACTORY_USERS:
+        monkeypatch.setattr(target, async_session_factory)
+    name_index.clear()
+    trust_graph.clear()
+    personalized_cache.clear()
+    hub.clear()
+    top_agents.clear()
+    reputation_queue.clear()
+    movers_cache.clear()
+    flights.clear()
+    admission.clear()
     
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
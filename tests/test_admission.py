@@ -0,0 +1,82 @@
+"""
+Agent Ethos - Admission Control Tests
+"""
+import asyncio
+import pytest
+
+from app.admission import admission, AdmissionLimiter, READ
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_then_sheds():
+    """Test that a full limiter queues up to max_queue and sheds the rest."""
+    limiter = AdmissionLimiter("test", READ, limit=1, max_queue=1, queue_timeout=0.05)
+    assert await limiter.acquire()
+    
+    # One waiter fits in the queue and is admitted once the slot frees up
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+    assert limiter.waiting == 1
+    
+    # The queue is full: shed without waiting
+    assert not await limiter.acquire()
+    
+    limiter.release()
+    assert await waiter
+    
+    # Nobody releases: the queued request times out
+    assert not await limiter.acquire()
+    assert limiter.stats()["shed"] == 2
+    
+    # Clearing while a slot is held keeps it held
+    limiter.clear()
+    assert limiter._slots.locked()
+    limiter.release()
+    limiter.clear()
+    assert await limiter.acquire()
+
+
+@pytest.mark.asyncio
+async def test_reads_shed_while_pool_saturated(client, registered_agent, second_agent, monkeypatch):
+    """Test that reads get 503 while the pool is saturated, even with free route slots."""
+    monkeypatch.setattr(admission, "saturated", lambda: True)
+    
+    response = await client.get("/api/v1/agents/profile", params={"name": "second_agent"})
+    assert response.status_code == 503
+    assert admission.limiters["agents.profile"].stats()["shed"] == 1
+    
+    response = await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 4},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"},
+    )
+    assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_writes_shed_with_retry_after(client, registered_agent, second_agent, monkeypatch):
+    """Test that a saturated write route returns 503 while reads still go through."""
+    limiter = admission.limiters["vouches.create"]
+    monkeypatch.setattr(limiter, "max_queue", 0)
+    for _ in range(limiter.limit):
+        assert await limiter.acquire()
+    
+    response = await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 4},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"},
+    )
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    
+    response = await client.get("/api/v1/agents/profile", params={"name": "second_agent"})
+    assert response.status_code == 200
+    
+    for _ in range(limiter.limit):
+        limiter.release()
+    response = await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 4},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"},
+    )
+    assert response.status_code == 201
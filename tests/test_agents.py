@@ -126,3 +126,188 @@ async def test_get_profile_case_insensitive(client, registered_agent):
     assert response.status_code == 200
     assert response.json()["agent"]["name"] == "test_agent"
 
+
+
+@pytest.mark.asyncio
+async def test_get_activity_merges_given_and_received(client, registered_agent, second_agent, third_agent):
+    """Test that the activity feed merges vouches given and received."""
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 5, "note": "Given"},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "test_agent", "score": 3, "note": "Received"},
+        headers={"Authorization": f"Bearer {third_agent['api_key']}"}
+    )
+    
+    response = await client.get("/api/v1/agents/activity", params={"name": "test_agent"})
+    assert response.status_code == 200
+    data = response.json()
+    
+    assert data["success"] is True
+    assert [item["direction"] for item in data["activity"]] == ["received", "given"]
+    assert data["activity"][0]["vouch"]["from_agent_name"] == "third_agent"
+    assert data["activity"][1]["vouch"]["to_agent_name"] == "second_agent"
+    assert data["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_activity_pagination(client, registered_agent, second_agent, third_agent):
+    """Test that the activity feed pages through both streams with a cursor."""
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 5, "note": "Given"},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "test_agent", "score": 3, "note": "Received"},
+        headers={"Authorization": f"Bearer {third_agent['api_key']}"}
+    )
+    
+    first = await client.get(
+        "/api/v1/agents/activity",
+        params={"name": "test_agent", "limit": 1}
+    )
+    first_data = first.json()
+    assert len(first_data["activity"]) == 1
+    assert first_data["next_cursor"] is not None
+    
+    second = await client.get(
+        "/api/v1/agents/activity",
+        params={"name": "test_agent", "limit": 1, "cursor": first_data["next_cursor"]}
+    )
+    second_data = second.json()
+    assert len(second_data["activity"]) == 1
+    assert second_data["activity"][0]["direction"] == "given"
+    assert second_data["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_activity_not_found(client):
+    """Test activity lookup for non-existent agent."""
+    response = await client.get("/api/v1/agents/activity", params={"name": "nonexistent"})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_profile_conditional(client, registered_agent, second_agent):
+    """Test that a profile answers If-None-Match with 304 until a vouch lands."""
+    response = await client.get("/api/v1/agents/profile", params={"name": "test_agent"})
+    etag = response.headers["etag"]
+    
+    response = await client.get(
+        "/api/v1/agents/profile",
+        params={"name": "test_agent"},
+        headers={"If-None-Match": f'W/{etag}, "other"'}
+    )
+    assert response.status_code == 304
+    
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "test_agent", "score": 3, "note": ""},
+        headers={"Authorization": f"Bearer {second_agent['api_key']}"}
+    )
+    response = await client.get(
+        "/api/v1/agents/profile",
+        params={"name": "test_agent"},
+        headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["agent"]["reputation"] == 3
+
+
+@pytest.mark.asyncio
+async def test_get_profiles_batch(client, registered_agent, second_agent):
+    """Test batch lookup by names and ids, reporting unknown entries."""
+    response = await client.post(
+        "/api/v1/agents/batch",
+        json={
+            "names": ["TEST_AGENT", "nonexistent"],
+            "ids": [second_agent["agent"]["id"], 99999],
+        }
+    )
+    assert response.status_code == 200
+    data = response.json()
+    
+    assert data["success"] is True
+    assert [p["agent"]["name"] for p in data["profiles"]] == ["test_agent", "second_agent"]
+    assert "recentVouches" not in data["profiles"][0]
+    assert data["not_found"] == {"names": ["nonexistent"], "ids": [99999]}
+
+
+@pytest.mark.asyncio
+async def test_get_profiles_batch_with_vouches(client, registered_agent, second_agent, third_agent):
+    """Test that batch lookup returns the most recent vouches per agent."""
+    for agent in (registered_agent, third_agent):
+        await client.post(
+            "/api/v1/vouches",
+            json={"to_name": "second_agent", "score": 2, "note": "Ok"},
+            headers={"Authorization": f"Bearer {agent['api_key']}"}
+        )
+    
+    response = await client.post(
+        "/api/v1/agents/batch",
+        json={"names": ["second_agent", "test_agent"], "include_vouches": True, "vouches_limit": 1}
+    )
+    profiles = {p["agent"]["name"]: p for p in response.json()["profiles"]}
+    
+    assert len(profiles["second_agent"]["recentVouches"]) == 1
+    assert profiles["second_agent"]["recentVouches"][0]["from_agent_name"] == "third_agent"
+    assert profiles["test_agent"]["recentVouches"] == []
+
+
+@pytest.mark.asyncio
+async def test_get_profiles_batch_too_large(client):
+    """Test that oversized batches are rejected."""
+    response = await client.post(
+        "/api/v1/agents/batch",
+        json={"ids": list(range(1, 600))}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_overlap(client, registered_agent, second_agent, third_agent):
+    """Test mutual vouchers, reciprocal scores and overlap ratios."""
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 4, "note": ""},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "third_agent", "score": 2, "note": ""},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "third_agent", "score": -1, "note": ""},
+        headers={"Authorization": f"Bearer {second_agent['api_key']}"}
+    )
+    
+    response = await client.get(
+        "/api/v1/agents/overlap",
+        params={"a": "second_agent", "b": "third_agent"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    
+    assert data["reciprocal"] == {"a_to_b": -1, "b_to_a": None}
+    assert data["counts"] == {"a_vouchers": 1, "b_vouchers": 2, "mutual": 1}
+    assert data["overlap"]["jaccard"] == 0.5
+    assert data["mutual_vouchers"] == [
+        {"id": registered_agent["agent"]["id"], "name": "test_agent", "score_to_a": 4, "score_to_b": 2}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_get_overlap_not_found(client, registered_agent):
+    """Test overlap with an unknown agent."""
+    response = await client.get(
+        "/api/v1/agents/overlap",
+        params={"a": "test_agent", "b": "nonexistent"}
+    )
+    assert response.status_code == 404
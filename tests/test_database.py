@@ -0,0 +1,64 @@
+"""
+Agent Ethos - Schema Upgrade Tests
+"""
+import pytest
+from sqlmodel import SQLModel
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import upgrade_schema
+
+
+@pytest.mark.asyncio
+async def test_upgrade_schema_adds_columns_and_indexes():
+    """Test that an agents table from an older release gains version and indexes."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.execute(text(
+            "CREATE TABLE agents (id INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, "
+            "description VARCHAR(500) NOT NULL, api_key_hash VARCHAR(64) NOT NULL, "
+            "reputation INTEGER NOT NULL, is_claimed BOOLEAN NOT NULL, created_at DATETIME NOT NULL)"
+        ))
+        await conn.execute(text(
+            "INSERT INTO agents VALUES (1, 'old_agent', '', 'x', 3, 0, '2025-01-01 00:00:00')"
+        ))
+        # The remaining tables are new, so create_all makes them whole
+        await conn.run_sync(SQLModel.metadata.create_all)
+        
+        # Running twice is a no-op the second time
+        await conn.run_sync(upgrade_schema)
+        await conn.run_sync(upgrade_schema)
+        
+        columns, indexes = await conn.run_sync(lambda sync: (
+            {column["name"] for column in inspect(sync).get_columns("agents")},
+            {index["name"] for index in inspect(sync).get_indexes("agents")},
+        ))
+        version = (await conn.execute(text("SELECT version FROM agents WHERE id = 1"))).scalar_one()
+    await engine.dispose()
+    
+    assert "version" in columns
+    assert {"ix_agents_name_lower", "ix_agents_reputation"} <= indexes
+    assert version == 0
+
+
+@pytest.mark.asyncio
+async def test_upgrade_schema_drops_replaced_indexes():
+    """Test that indexes superseded by composite ones are dropped on upgrade."""
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.execute(text("CREATE INDEX ix_flags_vouch ON flags (vouch_id)"))
+        await conn.execute(text("CREATE INDEX ix_vouches_to_agent ON vouches (to_agent_id)"))
+        await conn.execute(text("CREATE INDEX ix_vouches_from_agent ON vouches (from_agent_id)"))
+        
+        await conn.run_sync(upgrade_schema)
+        
+        indexes = await conn.run_sync(lambda sync: {
+            index["name"]
+            for table in ("flags", "vouches")
+            for index in inspect(sync).get_indexes(table)
+        })
+    await engine.dispose()
+    
+    assert not {"ix_flags_vouch", "ix_vouches_to_agent", "ix_vouches_from_agent"} & indexes
+    assert {"ix_flags_vouch_created", "ix_vouches_to_agent_created", "ix_vouches_from_agent_created"} <= indexes
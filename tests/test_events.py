@@ -0,0 +1,101 @@
+"""
+Agent Ethos - Reputation Event Tests
+"""
+import pytest
+from sqlmodel import select
+
+from app.events import ReputationHub, hub, event_stream, top_agents
+from app.models import ReputationEvent
+
+
+def test_hub_coalesces_changes_to_same_agent():
+    """Test that rapid changes to one agent collapse into the latest."""
+    test_hub = ReputationHub()
+    subscriber = test_hub.subscribe()
+    
+    test_hub.publish({"id": 1, "agent_id": 7, "reputation": 1})
+    test_hub.publish({"id": 2, "agent_id": 8, "reputation": 3})
+    test_hub.publish({"id": 3, "agent_id": 7, "reputation": 5})
+    
+    events = subscriber.drain()
+    assert [e["id"] for e in events] == [2, 3]
+    assert test_hub.stats()["coalesced"] == 1
+
+
+def test_hub_evicts_slow_consumer():
+    """Test that a subscriber lagging past the bound is dropped."""
+    test_hub = ReputationHub(max_pending=2)
+    slow = test_hub.subscribe()
+    
+    for agent_id in range(3):
+        test_hub.publish({"id": agent_id, "agent_id": agent_id})
+    
+    assert slow.closed is True
+    assert len(test_hub) == 0
+    assert test_hub.stats()["evicted"] == 1
+
+
+@pytest.mark.asyncio
+async def test_vouch_and_flag_write_events(client, async_session, registered_agent, second_agent, third_agent):
+    """Test that vouches and flags append reputation events."""
+    vouch = await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 5, "note": ""},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 2, "note": ""},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    await client.post(
+        f"/api/v1/vouches/{vouch.json()['vouch']['id']}/flag",
+        json={"reason": "Spam"},
+        headers={"Authorization": f"Bearer {third_agent['api_key']}"}
+    )
+    
+    result = await async_session.execute(select(ReputationEvent).order_by(ReputationEvent.id))
+    events = result.scalars().all()
+    
+    assert [(e.kind, e.delta, e.reputation) for e in events] == [
+        ("vouch", 5, 5),
+        ("vouch", -3, 2),
+        ("flag", 0, 2),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_event_stream_pushes_rank_changes(client, registered_agent, second_agent):
+    """Test that subscribers receive the leaderboard then live changes."""
+    subscriber = hub.subscribe()
+    stream = event_stream(subscriber, top_agents.snapshot(), [])
+    
+    first = await stream.__anext__()
+    assert first.startswith("event: leaderboard")
+    
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 3, "note": ""},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    
+    frame = await stream.__anext__()
+    assert "event: reputation" in frame
+    assert '"name": "second_agent"' in frame
+    assert '"rank": 1' in frame
+    
+    await stream.aclose()
+    assert len(hub) == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_unsubscribes_when_setup_fails(client, monkeypatch):
+    """Test that a failed initial read does not leak a hub subscriber."""
+    async def failing_replay(session, last_event_id):
+        raise RuntimeError("database unavailable")
+    
+    monkeypatch.setattr("app.routes.leaderboard.replay_events", failing_replay)
+    
+    with pytest.raises(RuntimeError):
+        await client.get("/api/v1/leaderboard/stream", headers={"Last-Event-ID": "1"})
+    assert len(hub) == 0
@@ -122,3 +122,120 @@ async def test_multiple_agents_can_flag(client, registered_agent, second_agent,
     vouches = await client.get("/api/v1/vouches", params={"target": "third_agent"})
     assert vouches.json()["vouches"][0]["flags_count"] == 2
 
+
+
+@pytest.mark.asyncio
+async def test_get_flags_includes_flagger_name(client, registered_agent, second_agent, third_agent):
+    """Test listing flags for a vouch returns flagger names."""
+    vouch_response = await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "third_agent", "score": 5, "note": "Great!"},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    vouch_id = vouch_response.json()["vouch"]["id"]
+    
+    for agent in (second_agent, third_agent):
+        await client.post(
+            f"/api/v1/vouches/{vouch_id}/flag",
+            json={"reason": "Suspicious"},
+            headers={"Authorization": f"Bearer {agent['api_key']}"}
+        )
+    
+    response = await client.get(f"/api/v1/vouches/{vouch_id}/flags")
+    assert response.status_code == 200
+    data = response.json()
+    
+    assert data["success"] is True
+    assert len(data["flags"]) == 2
+    assert {f["flagger_name"] for f in data["flags"]} == {"second_agent", "third_agent"}
+    assert data["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_flags_pagination(client, registered_agent, second_agent, third_agent):
+    """Test that flag listing pages through results with a cursor."""
+    vouch_response = await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "third_agent", "score": 5, "note": "Great!"},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    vouch_id = vouch_response.json()["vouch"]["id"]
+    
+    for agent in (second_agent, third_agent):
+        await client.post(
+            f"/api/v1/vouches/{vouch_id}/flag",
+            json={"reason": "Suspicious"},
+            headers={"Authorization": f"Bearer {agent['api_key']}"}
+        )
+    
+    first = await client.get(f"/api/v1/vouches/{vouch_id}/flags", params={"limit": 1})
+    first_data = first.json()
+    assert len(first_data["flags"]) == 1
+    assert first_data["next_cursor"] is not None
+    
+    second = await client.get(
+        f"/api/v1/vouches/{vouch_id}/flags",
+        params={"limit": 1, "cursor": first_data["next_cursor"]}
+    )
+    second_data = second.json()
+    assert len(second_data["flags"]) == 1
+    assert second_data["flags"][0]["id"] != first_data["flags"][0]["id"]
+    assert second_data["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_get_flags_invalid_cursor(client, registered_agent, second_agent):
+    """Test that a malformed cursor is rejected."""
+    vouch_response = await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 5, "note": "Great!"},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    vouch_id = vouch_response.json()["vouch"]["id"]
+    
+    response = await client.get(
+        f"/api/v1/vouches/{vouch_id}/flags",
+        params={"cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_flags_nonexistent_vouch(client):
+    """Test listing flags for a non-existent vouch."""
+    response = await client.get("/api/v1/vouches/99999/flags")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_get_flags_bulk(client, registered_agent, second_agent, third_agent):
+    """Test fetching flags for several vouches in one call."""
+    first = await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 5, "note": "Great!"},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    second = await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "third_agent", "score": 4, "note": "Good"},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    first_id = first.json()["vouch"]["id"]
+    second_id = second.json()["vouch"]["id"]
+    
+    await client.post(
+        f"/api/v1/vouches/{first_id}/flag",
+        json={"reason": "Spam"},
+        headers={"Authorization": f"Bearer {third_agent['api_key']}"}
+    )
+    
+    response = await client.get(
+        "/api/v1/vouches/flags",
+        params={"vouch_ids": [first_id, second_id]}
+    )
+    assert response.status_code == 200
+    results = {r["vouch_id"]: r for r in response.json()["results"]}
+    
+    assert len(results[first_id]["flags"]) == 1
+    assert results[first_id]["flags"][0]["flagger_name"] == "third_agent"
+    assert results[second_id]["flags"] == []
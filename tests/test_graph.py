@@ -0,0 +1,162 @@
+"""
+Agent Ethos - Vouch Graph Tests
+"""
+import asyncio
+from array import array
+
+import pytest
+
+from app.graph import TrustGraph, intersect_sorted
+
+
+def build(edges):
+    graph = TrustGraph()
+    edges = sorted(edges)
+    graph.load(
+        array("i", [e[0] for e in edges]),
+        array("i", [e[1] for e in edges]),
+        array("b", [e[2] for e in edges]),
+    )
+    return graph
+
+
+def test_find_path_shortest_chain():
+    """Test that the shortest qualifying chain is returned."""
+    graph = build([(1, 2, 5), (2, 3, 4), (3, 4, 3), (1, 5, 2), (5, 4, 2)])
+    
+    assert graph.find_path(1, 4) == [(1, 5, 2), (5, 4, 2)]
+
+
+def test_find_path_respects_min_score():
+    """Test that weak vouches are skipped."""
+    graph = build([(1, 2, 5), (2, 3, 4), (3, 4, 3), (1, 5, 2), (5, 4, 2)])
+    
+    assert graph.find_path(1, 4, min_score=3) == [(1, 2, 5), (2, 3, 4), (3, 4, 3)]
+    assert graph.find_path(1, 4, max_depth=2, min_score=3) is None
+
+
+def test_set_edge_overrides_base():
+    """Test that replaced vouches shadow the CSR arrays."""
+    graph = build([(1, 2, 5), (2, 3, 5)])
+    graph.set_edge(1, 2, -3)
+    
+    assert graph.find_path(1, 3) is None
+    assert graph.stats()["edges"] == 2
+    
+    graph.set_edge(3, 7, 4)
+    assert graph.find_path(2, 7) == [(2, 3, 5), (3, 7, 4)]
+    assert graph.stats()["edges"] == 3
+
+
+
+@pytest.mark.asyncio
+async def test_compaction_runs_off_loop(monkeypatch):
+    """Test that overlay compaction keeps edges added while it runs."""
+    monkeypatch.setattr("app.graph.COMPACT_MIN_EDGES", 2)
+    graph = build([(1, 2, 5), (2, 3, 5)])
+    graph.set_edge(1, 2, -3)
+    graph.set_edge(3, 4, 2)
+    
+    # Let the rebuild start; a later edge lands in the new overlay
+    await asyncio.sleep(0)
+    assert graph.stats()["overlay_edges"] == 2
+    graph.set_edge(4, 5, 1)
+    assert graph.find_path(3, 5) == [(3, 4, 2), (4, 5, 1)]
+    
+    offsets, targets, scores = await graph.out_csr()
+    assert graph.stats()["overlay_edges"] == 0
+    assert list(targets[offsets[1]:offsets[2]]) == [2]
+    assert list(scores[offsets[1]:offsets[2]]) == [-3]
+    assert graph.find_path(1, 3) is None
+    assert graph.find_path(2, 5) == [(2, 3, 5), (3, 4, 2), (4, 5, 1)]
+    assert graph.stats()["edges"] == 4
+
+@pytest.mark.asyncio
+async def test_trust_path_endpoint(client, registered_agent, second_agent, third_agent):
+    """Test trust path through the API after vouching."""
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 5, "note": ""},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "third_agent", "score": 4, "note": ""},
+        headers={"Authorization": f"Bearer {second_agent['api_key']}"}
+    )
+    
+    response = await client.get(
+        "/api/v1/agents/trust-path",
+        params={"from": "test_agent", "to": "third_agent"}
+    )
+    assert response.status_code == 200
+    data = response.json()
+    
+    assert data["found"] is True
+    assert [hop["to_agent_name"] for hop in data["path"]] == ["second_agent", "third_agent"]
+    assert data["graph"]["edges"] == 2
+    
+    reverse = await client.get(
+        "/api/v1/agents/trust-path",
+        params={"from": "third_agent", "to": "test_agent"}
+    )
+    assert reverse.json()["found"] is False
+
+
+@pytest.mark.asyncio
+async def test_trust_path_unknown_agent(client, registered_agent):
+    """Test trust path with an unknown agent."""
+    response = await client.get(
+        "/api/v1/agents/trust-path",
+        params={"from": "test_agent", "to": "nonexistent"}
+    )
+    assert response.status_code == 404
+
+
+def test_personalized_rank_follows_weighted_vouches():
+    """Test that trust flows along positive vouches in proportion to score."""
+    graph = build([(1, 2, 5), (1, 3, 1), (2, 4, 5), (1, 5, -5)])
+    scores = graph.personalized_rank(1)
+    
+    assert scores[2] > scores[3]
+    assert scores[4] > 0
+    assert 5 not in scores
+
+
+@pytest.mark.asyncio
+async def test_my_trust_endpoint(client, registered_agent, second_agent, third_agent):
+    """Test personalized trust ranking and cache invalidation on vouch."""
+    headers = {"Authorization": f"Bearer {registered_agent['api_key']}"}
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 5, "note": ""},
+        headers=headers
+    )
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "third_agent", "score": 4, "note": ""},
+        headers={"Authorization": f"Bearer {second_agent['api_key']}"}
+    )
+    
+    response = await client.get("/api/v1/agents/me/trust", headers=headers)
+    assert response.status_code == 200
+    names = [a["name"] for a in response.json()["agents"]]
+    assert names == ["second_agent", "third_agent"]
+    
+    # Viewer's own vouch drops the cached ranking
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": -5, "note": ""},
+        headers=headers
+    )
+    response = await client.get("/api/v1/agents/me/trust", headers=headers)
+    assert response.json()["agents"] == []
+
+
+def test_intersect_sorted():
+    """Test sorted intersection for similar and skewed sizes."""
+    assert intersect_sorted([1, 3, 5, 7], [2, 3, 4, 7, 9]) == [3, 7]
+    assert intersect_sorted([], [1, 2]) == []
+    
+    large = list(range(0, 10_000, 3))
+    assert intersect_sorted([3, 4, 9, 9_999], large) == [3, 9, 9_999]
@@ -0,0 +1,70 @@
+"""
+Agent Ethos - Readiness Tests
+"""
+import asyncio
+import time
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+from app.config import get_settings
+from app.health import LoopLagMonitor, loop_lag, readiness
+
+
+@pytest.fixture
+def lag_samples():
+    yield loop_lag.samples
+    loop_lag.clear()
+
+
+@pytest.mark.asyncio
+async def test_ready_reports_checks(client, lag_samples):
+    """Test that /ready reports database, pool, loop lag and cache stats."""
+    response = await client.get("/ready")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["ready"] is True
+    assert data["database"]["latency_ms"] >= 0
+    assert "checked_out" in data["pool"]
+    assert "hit_rate" in data["caches"]["personalized_trust"]
+
+
+@pytest.mark.asyncio
+async def test_ready_fails_over_thresholds(client, lag_samples, monkeypatch):
+    """Test that exceeding a threshold turns /ready into a 503 naming the check."""
+    lag_samples.append(get_settings().ready_max_loop_lag_ms + 1)
+    response = await client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["failures"] == ["event_loop"]
+    
+    lag_samples.clear()
+    monkeypatch.setattr(get_settings(), "ready_max_pool_utilization", 0.0)
+    response = await client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["failures"] == ["pool"]
+
+
+
+@pytest.mark.asyncio
+async def test_ready_probe_not_counted_in_pool(tmp_path, lag_samples):
+    """Test that the readiness probe's own connection is not counted as pool load."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'ready.db'}", pool_size=1, max_overflow=0)
+    try:
+        async with AsyncSession(engine) as session:
+            report = await readiness(session, engine.sync_engine.pool)
+    finally:
+        await engine.dispose()
+    
+    assert report["pool"]["utilization"] == 0
+    assert report["ready"] is True
+
+@pytest.mark.asyncio
+async def test_loop_lag_monitor_sees_blocking():
+    """Test that blocking the event loop shows up as lag."""
+    monitor = LoopLagMonitor()
+    monitor.start(0.01)
+    await asyncio.sleep(0.02)
+    time.sleep(0.1)
+    await asyncio.sleep(0.03)
+    await monitor.stop()
+    
+    assert monitor.stats()["max_ms"] >= 50
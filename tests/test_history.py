@@ -0,0 +1,143 @@
+"""
+Agent Ethos - Reputation History Tests
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlmodel import select, update
+
+from app.models import ReputationEvent, ReputationDaily
+from app.history import rollup_daily_history, rollup_hourly_deltas, set_watermark, DAILY_ROLLUP_JOB
+
+
+async def vouch(client, api_key, to_name, score):
+    response = await client.post(
+        "/api/v1/vouches",
+        json={"to_name": to_name, "score": score, "note": ""},
+        headers={"Authorization": f"Bearer {api_key}"}
+    )
+    assert response.status_code == 201
+
+
+async def rollup(session):
+    consumed = await rollup_daily_history(session)
+    await session.commit()
+    return consumed
+
+
+@pytest.mark.asyncio
+async def test_daily_rollup_is_incremental(client, async_session, registered_agent, second_agent, third_agent):
+    """Test that each run folds only new events into one row per active day."""
+    await vouch(client, registered_agent["api_key"], "second_agent", 5)
+    await vouch(client, third_agent["api_key"], "second_agent", 2)
+    
+    # Move the first vouch's event to yesterday
+    yesterday = datetime.utcnow() - timedelta(days=1)
+    await async_session.execute(
+        update(ReputationEvent).where(ReputationEvent.id == 1).values(created_at=yesterday)
+    )
+    await async_session.commit()
+    
+    assert await rollup(async_session) == 2
+    assert await rollup(async_session) == 0
+    
+    await vouch(client, registered_agent["api_key"], "second_agent", 1)
+    assert await rollup(async_session) == 1
+    
+    response = await client.get("/api/v1/agents/history", params={"name": "second_agent"})
+    assert response.status_code == 200
+    data = response.json()
+    
+    assert data["agent"]["reputation"] == 3
+    assert [
+        (row["reputation"], row["delta"], row["vouches"]) for row in data["history"]
+    ] == [(5, 5, 1), (3, -2, 2)]
+    assert data["history"][0]["day"] == yesterday.date().isoformat()
+
+
+@pytest.mark.asyncio
+async def test_daily_rollup_rereads_safety_window(client, async_session, registered_agent, second_agent, third_agent):
+    """Test that late-committed events are picked up and re-reads never double count."""
+    await vouch(client, registered_agent["api_key"], "second_agent", 5)
+    assert await rollup(async_session) == 1
+    
+    # As if the next event committed after the watermark had moved past it
+    await vouch(client, third_agent["api_key"], "second_agent", 2)
+    await set_watermark(async_session, DAILY_ROLLUP_JOB, 2)
+    await async_session.commit()
+    
+    async def second_agent_day():
+        row = (await async_session.execute(
+            select(ReputationDaily).where(ReputationDaily.agent_id == second_agent["agent"]["id"])
+        )).scalar_one()
+        await async_session.refresh(row)
+        return row.reputation, row.delta, row.vouches
+    
+    # Nothing past the watermark: the run writes nothing
+    assert await rollup(async_session) == 0
+    assert await second_agent_day() == (5, 5, 1)
+    
+    # Each new event re-reads the safety window, which recomputes the day
+    for api_key, target in ((second_agent["api_key"], "third_agent"), (third_agent["api_key"], "test_agent")):
+        await vouch(client, api_key, target, 1)
+        assert await rollup(async_session) == 1
+        assert await second_agent_day() == (7, 7, 2)
+
+
+@pytest.mark.asyncio
+async def test_history_range(client, async_session, registered_agent, second_agent):
+    """Test from/to filtering and range validation."""
+    await vouch(client, registered_agent["api_key"], "second_agent", 4)
+    await rollup(async_session)
+    
+    tomorrow = (datetime.utcnow() + timedelta(days=1)).date().isoformat()
+    response = await client.get(
+        "/api/v1/agents/history",
+        params={"name": "second_agent", "from": tomorrow, "to": tomorrow}
+    )
+    assert response.status_code == 200
+    assert response.json()["history"] == []
+    
+    response = await client.get(
+        "/api/v1/agents/history",
+        params={"name": "second_agent", "from": "2025-01-01", "to": "2024-01-01"}
+    )
+    assert response.status_code == 400
+    
+    response = await client.get("/api/v1/agents/history", params={"name": "nonexistent"})
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_top_movers_windows(client, async_session, registered_agent, second_agent, third_agent):
+    """Test that movers rank gains within each window from hourly buckets."""
+    await vouch(client, registered_agent["api_key"], "second_agent", 5)
+    await vouch(client, registered_agent["api_key"], "third_agent", 3)
+    await vouch(client, second_agent["api_key"], "third_agent", 4)
+    await vouch(client, third_agent["api_key"], "test_agent", -2)
+    
+    # The vouch for second_agent happened three days ago
+    three_days_ago = datetime.utcnow() - timedelta(days=3)
+    await async_session.execute(
+        update(ReputationEvent).where(ReputationEvent.id == 1).values(created_at=three_days_ago)
+    )
+    await async_session.commit()
+    await rollup_hourly_deltas(async_session)
+    await async_session.commit()
+    
+    response = await client.get("/api/v1/leaderboard/movers", params={"window": "24h"})
+    assert response.status_code == 200
+    assert [(m["name"], m["gain"]) for m in response.json()["movers"]] == [("third_agent", 7)]
+    
+    response = await client.get("/api/v1/leaderboard/movers", params={"window": "7d"})
+    assert [(m["name"], m["gain"]) for m in response.json()["movers"]] == [("third_agent", 7), ("second_agent", 5)]
+    
+    # Served from the cache until the TTL expires
+    await vouch(client, registered_agent["api_key"], "second_agent", 5)
+    await rollup_hourly_deltas(async_session)
+    await async_session.commit()
+    response = await client.get("/api/v1/leaderboard/movers", params={"window": "24h"})
+    assert len(response.json()["movers"]) == 1
+    
+    response = await client.get("/api/v1/leaderboard/movers", params={"window": "1y"})
+    assert response.status_code == 422
@@ -0,0 +1,77 @@
+"""
+Agent Ethos - Logging Pipeline Tests
+"""
+import io
+import json
+import logging
+import queue
+import pytest
+
+from app.logs import configure_logging, shutdown_logging, SamplingFilter, DroppingQueueHandler
+
+
+@pytest.fixture
+def log_stream():
+    stream = io.StringIO()
+    engine_logger = logging.getLogger("sqlalchemy.engine")
+    level = engine_logger.level
+    engine_logger.setLevel(logging.INFO)
+    configure_logging(stream=stream)
+    yield stream
+    shutdown_logging()
+    engine_logger.setLevel(level)
+
+
+def read_records(stream):
+    # Stopping the listener flushes the queue
+    shutdown_logging()
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_records_carry_request_context(client, log_stream, registered_agent):
+    """Test that access records carry the request id, route, agent id and latency."""
+    response = await client.get(
+        "/api/v1/agents/me",
+        headers={
+            "Authorization": f"Bearer {registered_agent['api_key']}",
+            "X-Request-ID": "req-123",
+        },
+    )
+    assert response.status_code == 200
+    assert response.headers["x-request-id"] == "req-123"
+    
+    records = read_records(log_stream)
+    access = [record for record in records if record["logger"] == "app.access"]
+    assert access[-1]["request_id"] == "req-123"
+    assert access[-1]["route"] == "GET /api/v1/agents/me"
+    assert access[-1]["agent_id"] == registered_agent["agent"]["id"]
+    assert access[-1]["status"] == 200
+    assert access[-1]["latency_ms"] >= 0
+    
+    # SQL echo from the same request is tagged too
+    sql = [record for record in records if record["logger"].startswith("sqlalchemy.engine")]
+    assert any(record.get("request_id") == "req-123" for record in sql)
+
+
+def test_sampling_only_drops_high_volume_info():
+    """Test that sampling applies to access/SQL info records and nothing else."""
+    sampler = SamplingFilter(rate=0.0)
+    
+    def record(name, level):
+        return logging.LogRecord(name, level, __file__, 1, "message", None, None)
+    
+    assert not sampler.filter(record("app.access", logging.INFO))
+    assert not sampler.filter(record("sqlalchemy.engine.Engine", logging.INFO))
+    assert sampler.filter(record("app.access", logging.WARNING))
+    assert sampler.filter(record("app.reputation", logging.INFO))
+
+
+def test_full_queue_drops_instead_of_blocking():
+    """Test that a full queue drops records rather than blocking the caller."""
+    handler = DroppingQueueHandler(queue.Queue(1))
+    for _ in range(3):
+        handler.handle(logging.LogRecord("app", logging.INFO, __file__, 1, "message", None, None))
+    
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 2
@@ -0,0 +1,90 @@
+"""
+Agent Ethos - Request Profiling Tests
+"""
+import cProfile
+import pytest
+
+from app.config import get_settings
+from app.profiling import ProfileStore, ProfilingMiddleware, profile_store
+
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    monkeypatch.setattr(get_settings(), "admin_token", "test-admin-token")
+    return {"X-Admin-Token": "test-admin-token"}
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    monkeypatch.setattr(profile_store, "directory", tmp_path)
+    return profile_store
+
+
+@pytest.mark.asyncio
+async def test_profile_on_demand(client, store, admin_headers, registered_agent):
+    """Test that X-Profile with an admin token records a profile with its queries."""
+    response = await client.get(
+        "/api/v1/agents/profile",
+        params={"name": "Test_Agent"},
+        headers={"X-Profile": "1", **admin_headers},
+    )
+    assert response.status_code == 200
+    
+    response = await client.get("/api/v1/admin/profiles", headers=admin_headers)
+    profiles = response.json()["profiles"]
+    assert len(profiles) == 1
+    assert profiles[0]["route"] == "/api/v1/agents/profile"
+    assert profiles[0]["status"] == 200
+    assert profiles[0]["query_count"] >= 1
+    
+    response = await client.get(f"/api/v1/admin/profiles/{profiles[0]['id']}", headers=admin_headers)
+    profile = response.json()["profile"]
+    assert "cumulative" in profile["report"]
+    assert any("FROM agents" in query["statement"] for query in profile["queries"])
+    
+    response = await client.get(f"/api/v1/admin/profiles/{profiles[0]['id']}/download", headers=admin_headers)
+    assert response.status_code == 200
+    assert len(response.content) > 0
+    
+    response = await client.get("/api/v1/admin/profiles/1-deadbeef", headers=admin_headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_profile_requires_admin_token(client, store, admin_headers, registered_agent):
+    """Test that only X-Profile: 1 with a valid admin token is profiled."""
+    await client.get("/api/v1/agents/profile", params={"name": "Test_Agent"})
+    await client.get(
+        "/api/v1/agents/profile",
+        params={"name": "Test_Agent"},
+        headers={"X-Profile": "1", "X-Admin-Token": "wrong"},
+    )
+    await client.get(
+        "/api/v1/agents/profile",
+        params={"name": "Test_Agent"},
+        headers={"X-Profile": "true", **admin_headers},
+    )
+    
+    assert store.list() == []
+
+
+def test_streaming_requests_are_not_profiled():
+    """Test that SSE streams are recognised and left unprofiled."""
+    assert ProfilingMiddleware._streaming({"path": "/api/v1/leaderboard/stream", "headers": []})
+    assert ProfilingMiddleware._streaming({"path": "/events", "headers": [(b"accept", b"text/event-stream")]})
+    assert not ProfilingMiddleware._streaming({"path": "/api/v1/leaderboard", "headers": [(b"accept", b"*/*")]})
+
+
+def test_profile_store_prunes(tmp_path):
+    """Test that only the newest max_files profiles are kept."""
+    store = ProfileStore(str(tmp_path), max_files=2)
+    ids = []
+    for _ in range(3):
+        profile = cProfile.Profile()
+        profile.enable()
+        sum(range(100))
+        profile.disable()
+        ids.append(store.save(profile, {"path": "/"}))
+    
+    assert [summary["id"] for summary in store.list()] == sorted(ids, reverse=True)[:2]
+    assert len(list(tmp_path.iterdir())) == 4
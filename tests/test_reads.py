@@ -0,0 +1,82 @@
+"""
+Agent Ethos - Read Path Tests
+"""
+import pytest
+from sqlalchemy import event
+
+from app.models.agent import AgentPublic
+from app.models.vouch import VouchPublic
+
+
+@pytest.mark.asyncio
+async def test_row_payloads_match_public_models(client, registered_agent, second_agent):
+    """Test that row-mapped responses have exactly the public model fields."""
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 4, "note": "solid"},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"},
+    )
+    
+    response = await client.get("/api/v1/vouches", params={"target": "second_agent"})
+    vouch = response.json()["vouches"][0]
+    assert list(vouch) == list(VouchPublic.model_fields)
+    assert vouch["from_agent_name"] == "test_agent"
+    assert vouch["to_agent_name"] == "second_agent"
+    
+    response = await client.get("/api/v1/agents/profile", params={"name": "second_agent"})
+    data = response.json()
+    assert list(data["agent"]) == list(AgentPublic.model_fields)
+    assert data["recentVouches"] == [vouch]
+    
+    response = await client.get("/api/v1/leaderboard")
+    assert list(response.json()["leaderboard"][0]) == list(AgentPublic.model_fields)
+
+
+@pytest.mark.asyncio
+async def test_sparse_fieldsets_narrow_sql(client, async_engine, registered_agent, second_agent):
+    """Test that ?fields= narrows both the response and the selected columns."""
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 4, "note": "solid"},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"},
+    )
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        response = await client.get("/api/v1/leaderboard", params={"fields": "reputation, name"})
+        assert response.json()["leaderboard"][0] == {"name": "second_agent", "reputation": 4}
+        assert "description" not in statements[-1]
+        
+        response = await client.get("/api/v1/vouches", params={"target": "second_agent", "fields": "score"})
+        assert response.json()["vouches"] == [{"score": 4}]
+        assert "note" not in statements[-1] and "JOIN" not in statements[-1]
+        
+        response = await client.get(
+            "/api/v1/agents/profile",
+            params={"name": "second_agent", "fields": "reputation", "vouch_fields": "from_agent_name"},
+        )
+        data = response.json()
+        assert data["agent"] == {"reputation": 4}
+        assert data["recentVouches"] == [{"from_agent_name": "test_agent"}]
+        assert "description" not in statements[-2]
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+    
+    # Narrowed responses get their own ETag
+    full = await client.get("/api/v1/agents/profile", params={"name": "second_agent"})
+    assert full.headers["etag"] != response.headers["etag"]
+    
+    response = await client.get("/api/v1/leaderboard", params={"fields": "name,api_key_hash"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_empty_fields_selects_everything(client, registered_agent, second_agent):
+    """Test that a ?fields= value naming no field returns every field."""
+    response = await client.get("/api/v1/agents/profile", params={"name": "second_agent", "fields": ","})
+    assert response.status_code == 200
+    assert list(response.json()["agent"]) == list(AgentPublic.model_fields)
+    
+    response = await client.get("/api/v1/leaderboard", params={"fields": " "})
+    assert list(response.json()["leaderboard"][0]) == list(AgentPublic.model_fields)
@@ -0,0 +1,64 @@
+"""
+Agent Ethos - Recommendation Tests
+"""
+import pytest
+
+from app.graph import trust_graph
+from app.recommendations import refresh_recommendations
+
+
+async def register(client, name):
+    response = await client.post(
+        "/api/v1/agents/register",
+        json={"name": name, "description": ""}
+    )
+    assert response.status_code == 201
+    return response.json()["api_key"]
+
+
+async def vouch(client, api_key, to_name, score):
+    response = await client.post(
+        "/api/v1/vouches",
+        json={"to_name": to_name, "score": score, "note": ""},
+        headers={"Authorization": f"Bearer {api_key}"}
+    )
+    assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_recommendations_from_co_vouches(client, async_session):
+    """Test that agents vouched for by my vouchees are recommended."""
+    keys = {name: await register(client, name) for name in ("me", "friend", "pal", "star", "niche", "known")}
+    
+    await vouch(client, keys["me"], "friend", 5)
+    await vouch(client, keys["me"], "pal", 5)
+    await vouch(client, keys["me"], "known", 5)
+    await vouch(client, keys["friend"], "star", 5)
+    await vouch(client, keys["pal"], "star", 5)
+    await vouch(client, keys["friend"], "niche", 5)
+    await vouch(client, keys["friend"], "known", 5)
+    await vouch(client, keys["friend"], "me", 5)
+    
+    written = await refresh_recommendations(async_session, trust_graph, workers=1)
+    assert written > 0
+    
+    response = await client.get(
+        "/api/v1/agents/recommendations",
+        headers={"Authorization": f"Bearer {keys['me']}"}
+    )
+    assert response.status_code == 200
+    names = [r["name"] for r in response.json()["recommendations"]]
+    
+    # Already-vouched agents and the caller are excluded
+    assert names == ["star", "niche"]
+
+
+@pytest.mark.asyncio
+async def test_recommendations_empty_before_refresh(client, registered_agent):
+    """Test that agents without precomputed rows get an empty list."""
+    response = await client.get(
+        "/api/v1/agents/recommendations",
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    assert response.status_code == 200
+    assert response.json()["recommendations"] == []
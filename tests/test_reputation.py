@@ -0,0 +1,62 @@
+"""
+Agent Ethos - Reputation Recompute Tests
+"""
+import pytest
+from sqlmodel import select, update
+
+from app.events import hub
+from app.models import Agent, ReputationEvent
+from app.reputation import ReputationQueue, reputation_queue
+
+
+@pytest.mark.asyncio
+async def test_vouch_marks_target_dirty(client, registered_agent, second_agent):
+    """Test that vouching queues the target and coalesces repeats."""
+    for score in (5, 3):
+        await client.post(
+            "/api/v1/vouches",
+            json={"to_name": "second_agent", "score": score, "note": ""},
+            headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+        )
+    
+    stats = reputation_queue.stats()
+    assert stats["pending"] == 1
+    assert stats["coalesced"] == 1
+
+
+@pytest.mark.asyncio
+async def test_recompute_corrects_drift(client, async_session, registered_agent, second_agent, third_agent):
+    """Test that the worker batch recomputes reputation from vouches."""
+    for agent in (registered_agent, third_agent):
+        await client.post(
+            "/api/v1/vouches",
+            json={"to_name": "second_agent", "score": 4, "note": ""},
+            headers={"Authorization": f"Bearer {agent['api_key']}"}
+        )
+    
+    # Simulate a lost update on the cached value
+    await async_session.execute(
+        update(Agent).where(Agent.name == "second_agent").values(reputation=100)
+    )
+    await async_session.commit()
+    
+    subscriber = hub.subscribe()
+    queue = ReputationQueue()
+    queue.mark_dirty(second_agent["agent"]["id"])
+    queue.mark_dirty(registered_agent["agent"]["id"])
+    assert await queue.process_batch(async_session) == 2
+    
+    async_session.expire_all()
+    result = await async_session.execute(
+        select(Agent.reputation).where(Agent.name == "second_agent")
+    )
+    assert result.scalar_one() == 8
+    assert queue.stats()["corrected"] == 1
+    assert len(queue) == 0
+    
+    result = await async_session.execute(
+        select(ReputationEvent).where(ReputationEvent.kind == "recompute")
+    )
+    event = result.scalar_one()
+    assert (event.delta, event.reputation) == (-92, 8)
+    assert [(e["kind"], e["reputation"], e["rank"]) for e in subscriber.drain()] == [("recompute", 8, 1)]
@@ -0,0 +1,108 @@
+"""
+Agent Ethos - Search Tests
+"""
+import pytest
+
+
+async def register(client, name, description=""):
+    response = await client.post(
+        "/api/v1/agents/register",
+        json={"name": name, "description": description}
+    )
+    assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_search_by_name_prefix(client):
+    """Test that search matches word prefixes in agent names."""
+    await register(client, "alpha_trader", "Trades things")
+    await register(client, "beta_bot", "Unrelated")
+    
+    response = await client.get("/api/v1/agents/search", params={"q": "alph"})
+    assert response.status_code == 200
+    data = response.json()
+    
+    assert data["success"] is True
+    assert [a["name"] for a in data["agents"]] == ["alpha_trader"]
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_name_above_description(client):
+    """Test that name matches rank above description matches."""
+    await register(client, "helper", "Works with the oracle")
+    await register(client, "oracle", "Answers questions")
+    
+    response = await client.get("/api/v1/agents/search", params={"q": "oracle"})
+    names = [a["name"] for a in response.json()["agents"]]
+    
+    assert names == ["oracle", "helper"]
+
+
+@pytest.mark.asyncio
+async def test_search_pagination(client):
+    """Test that search results page through with a cursor."""
+    for i in range(3):
+        await register(client, f"scout_{i}", "Finds things")
+    
+    seen = []
+    cursor = None
+    while True:
+        params = {"q": "scout", "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        data = (await client.get("/api/v1/agents/search", params=params)).json()
+        seen.extend(a["name"] for a in data["agents"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+    
+    assert sorted(seen) == ["scout_0", "scout_1", "scout_2"]
+
+
+@pytest.mark.asyncio
+async def test_search_requires_words(client):
+    """Test that a query without word characters is rejected."""
+    response = await client.get("/api/v1/agents/search", params={"q": "***"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_unsupported_dialect(client, monkeypatch):
+    """Test that search answers 501 on a database without a search index."""
+    monkeypatch.setattr("app.routes.agents.SEARCH_DIALECTS", ())
+    
+    response = await client.get("/api/v1/agents/search", params={"q": "alpha"})
+    assert response.status_code == 501
+    assert "not supported" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_ranks_by_reputation(client):
+    """Test that autocomplete returns prefix matches by reputation."""
+    await register(client, "nova_one")
+    await register(client, "nova_two")
+    await register(client, "other")
+    
+    voucher = await client.post(
+        "/api/v1/agents/register",
+        json={"name": "voucher", "description": ""}
+    )
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "nova_two", "score": 5, "note": ""},
+        headers={"Authorization": f"Bearer {voucher.json()['api_key']}"}
+    )
+    
+    response = await client.get("/api/v1/agents/autocomplete", params={"prefix": "NOVA"})
+    assert response.status_code == 200
+    agents = response.json()["agents"]
+    
+    assert [a["name"] for a in agents] == ["nova_two", "nova_one"]
+    assert agents[0]["reputation"] == 5
+
+
+@pytest.mark.asyncio
+async def test_autocomplete_no_match(client, registered_agent):
+    """Test autocomplete with a prefix that matches nothing."""
+    response = await client.get("/api/v1/agents/autocomplete", params={"prefix": "zzz"})
+    assert response.json()["agents"] == []
@@ -0,0 +1,99 @@
+"""
+Agent Ethos - Request Coalescing Tests
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.singleflight import SingleFlight, coalesce
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    """Test that callers with the same key share one call and its errors."""
+    group = SingleFlight()
+    runs = []
+    
+    async def compute(value):
+        runs.append(value)
+        await asyncio.sleep(0.01)
+        if value == "bad":
+            raise ValueError(value)
+        return value
+    
+    results = await asyncio.gather(*(group.do("k", lambda: compute("ok")) for _ in range(20)))
+    assert results == ["ok"] * 20
+    assert runs == ["ok"]
+    assert group.stats()["shared"] == 19
+    assert len(group) == 0
+    
+    outcomes = await asyncio.gather(*(group.do("k", lambda: compute("bad")) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert runs == ["ok", "bad"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    """Test that the shared call survives one of its callers going away."""
+    group = SingleFlight()
+    
+    async def compute():
+        await asyncio.sleep(0.02)
+        return 42
+    
+    first = asyncio.ensure_future(group.do("k", compute))
+    second = asyncio.ensure_future(group.do("k", compute))
+    await asyncio.sleep(0)
+    first.cancel()
+    
+    assert await second == 42
+
+
+@pytest.mark.asyncio
+async def test_shared_call_uses_its_own_session(client, async_session):
+    """Test that followers survive the leader's request and session going away."""
+    seen = []
+    
+    @coalesce("name")
+    async def endpoint(name: str, session: AsyncSession):
+        seen.append(session)
+        await asyncio.sleep(0.02)
+        return (await session.execute(text("SELECT :name"), {"name": name})).scalar_one()
+    
+    leader = asyncio.ensure_future(endpoint(name="x", session=async_session))
+    follower = asyncio.ensure_future(endpoint(name="x", session=async_session))
+    await asyncio.sleep(0)
+    leader.cancel()
+    await async_session.close()
+    
+    assert await follower == "x"
+    assert len(seen) == 1 and seen[0] is not async_session
+
+
+@pytest.mark.asyncio
+async def test_profile_requests_coalesce(client, async_engine, registered_agent, second_agent):
+    """Test that concurrent identical profile reads run the queries once."""
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "test_agent", "score": 3, "note": ""},
+        headers={"Authorization": f"Bearer {second_agent['api_key']}"}
+    )
+    
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        responses = await asyncio.gather(*(
+            client.get("/api/v1/agents/profile", params={"name": name})
+            for name in ["test_agent", "TEST_AGENT"] * 10
+        ))
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+    
+    assert all(response.status_code == 200 for response in responses)
+    assert len({response.headers["etag"] for response in responses}) == 1
+    assert all(response.json()["agent"]["reputation"] == 3 for response in responses)
+    # Agent lookup, then recent vouches joined with voucher names
+    assert len(statements) == 2
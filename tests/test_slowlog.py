@@ -0,0 +1,82 @@
+"""
+Agent Ethos - Slow Query Log Tests
+"""
+import pytest
+from sqlalchemy import event, text
+
+from app.config import get_settings
+from app.slowlog import slow_query_log, parameter_shape
+
+
+@pytest.fixture
+def admin_headers(monkeypatch):
+    monkeypatch.setattr(get_settings(), "admin_token", "test-admin-token")
+    return {"X-Admin-Token": "test-admin-token"}
+
+
+@pytest.fixture
+def slow_log(async_engine):
+    # Threshold 0 records every statement
+    slow_query_log.install(async_engine, threshold_ms=0, max_entries=500)
+    yield slow_query_log
+    slow_query_log.uninstall()
+    slow_query_log.clear()
+
+
+def test_parameter_shape():
+    """Test that only parameter types are kept, with runs collapsed."""
+    assert parameter_shape(("secret", 1, 2, 3)) == "(str, int x 3)"
+    assert parameter_shape({"name": "secret"}) == "{name: str}"
+    assert parameter_shape([(1, "a"), (2, "b")]) == "2 x (int, str)"
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_capture_route_and_plan(client, slow_log, admin_headers, registered_agent):
+    """Test that statements are recorded with their route and EXPLAIN output."""
+    response = await client.get("/api/v1/agents/profile", params={"name": "Test_Agent"})
+    assert response.status_code == 200
+    await slow_log.flush()
+    
+    response = await client.get("/api/v1/admin/slow-queries", headers=admin_headers)
+    assert response.status_code == 200
+    data = response.json()
+    
+    lookups = [
+        entry for entry in data["entries"]
+        if entry["route"] == "GET /api/v1/agents/profile" and "lower(agents.name)" in entry["statement"]
+    ]
+    assert lookups
+    assert lookups[0]["parameters"] == "(str)"
+    assert "Test_Agent" not in str(lookups[0])
+    assert any("agents" in line for line in lookups[0]["plan"])
+    assert data["stats"]["threshold_ms"] == 0
+
+
+
+@pytest.mark.asyncio
+async def test_concurrent_slow_statements_explained_once(async_engine, slow_log):
+    """Test that repeats of a statement share one in-flight EXPLAIN."""
+    explains = []
+    listener = lambda *args: explains.append(args[2]) if args[2].startswith("EXPLAIN") else None
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        async with async_engine.connect() as conn:
+            for _ in range(5):
+                await conn.execute(text("SELECT count(*) FROM agents"))
+        await slow_log.flush()
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+    
+    assert len(explains) == 1
+    entries = [entry for entry in slow_log.snapshot() if entry["statement"] == "SELECT count(*) FROM agents"]
+    assert len(entries) == 5
+    assert all(entry["plan"] for entry in entries)
+
+@pytest.mark.asyncio
+async def test_admin_endpoint_requires_token(client, admin_headers):
+    """Test that the admin endpoint rejects missing or wrong tokens."""
+    response = await client.get("/api/v1/admin/slow-queries")
+    assert response.status_code == 403
+    
+    response = await client.get("/api/v1/admin/slow-queries", headers={"X-Admin-Token": "wrong"})
+    assert response.status_code == 403
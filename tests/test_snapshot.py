@@ -0,0 +1,117 @@
+"""
+Agent Ethos - Graph Snapshot Tests
+"""
+import pytest
+
+from app.graph import TrustGraph
+from app.recommendations import refresh_recommendations
+from app.snapshot import GraphSnapshot, write_snapshot, load_trust_graph_snapshot, replay_since
+
+
+async def vouch(client, api_key, to_name, score):
+    response = await client.post(
+        "/api/v1/vouches",
+        json={"to_name": to_name, "score": score, "note": ""},
+        headers={"Authorization": f"Bearer {api_key}"}
+    )
+    assert response.status_code == 201
+
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip(client, async_session, tmp_path, registered_agent, second_agent, third_agent):
+    """Test that a mapped snapshot holds the same edges and columns."""
+    await vouch(client, registered_agent["api_key"], "second_agent", 5)
+    await vouch(client, registered_agent["api_key"], "third_agent", -2)
+    await vouch(client, second_agent["api_key"], "third_agent", 4)
+    await client.post(
+        "/api/v1/vouches/1/flag",
+        json={"reason": "suspicious"},
+        headers={"Authorization": f"Bearer {third_agent['api_key']}"}
+    )
+    
+    path = str(tmp_path / "graph.bin")
+    info = await write_snapshot(async_session, path)
+    assert info["edges"] == 3
+    
+    snapshot = GraphSnapshot(path)
+    assert isinstance(snapshot.out_targets, memoryview)
+    assert snapshot.watermark == info["watermark"] > 0
+    
+    first, second, third = (a["agent"]["id"] for a in (registered_agent, second_agent, third_agent))
+    row = slice(snapshot.out_offsets[first], snapshot.out_offsets[first + 1])
+    assert list(snapshot.out_targets[row]) == [second, third]
+    assert list(snapshot.out_scores[row]) == [5, -2]
+    assert list(snapshot.out_flags[row]) == [1, 0]
+    assert all(created > 0 for created in snapshot.out_created)
+    
+    graph = TrustGraph()
+    _, replayed = await load_trust_graph_snapshot(async_session, path, graph)
+    # The safety window below the watermark re-applies the same edges
+    assert replayed == 3
+    assert graph.stats()["edges"] == 3
+    assert sorted(graph.in_edges(third)) == [(first, -2), (second, 4)]
+    assert graph.find_path(first, third) == [(first, second, 5), (second, third, 4)]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_replays_changes_after_watermark(client, async_session, tmp_path, registered_agent, second_agent, third_agent):
+    """Test that vouches created or rescored after the snapshot are replayed."""
+    await vouch(client, registered_agent["api_key"], "second_agent", 5)
+    path = str(tmp_path / "graph.bin")
+    await write_snapshot(async_session, path)
+    
+    await vouch(client, registered_agent["api_key"], "second_agent", -1)
+    await vouch(client, second_agent["api_key"], "third_agent", 3)
+    
+    graph = TrustGraph()
+    _, replayed = await load_trust_graph_snapshot(async_session, path, graph)
+    assert replayed == 2
+    
+    first, second, third = (a["agent"]["id"] for a in (registered_agent, second_agent, third_agent))
+    assert list(graph.out_edges(first)) == [(second, -1)]
+    assert list(graph.out_edges(second)) == [(third, 3)]
+    assert graph.stats()["edges"] == 2
+
+
+@pytest.mark.asyncio
+async def test_snapshot_replays_events_committed_below_watermark(client, async_session, registered_agent, second_agent):
+    """Test that a vouch whose event id is under the watermark is still replayed."""
+    await vouch(client, registered_agent["api_key"], "second_agent", 4)
+    
+    # As if the event committed after a later id was read as the watermark
+    graph = TrustGraph()
+    assert await replay_since(async_session, graph, watermark=10) == 1
+    
+    first, second = (a["agent"]["id"] for a in (registered_agent, second_agent))
+    assert list(graph.out_edges(first)) == [(second, 4)]
+
+
+def test_snapshot_rejects_other_files(tmp_path):
+    """Test that files without the snapshot header are refused."""
+    path = tmp_path / "not-a-graph.bin"
+    path.write_bytes(b"\x00" * 128)
+    
+    with pytest.raises(ValueError):
+        GraphSnapshot(str(path))
+
+
+@pytest.mark.asyncio
+async def test_recommendations_from_snapshot(client, async_session, tmp_path):
+    """Test that workers mapping the snapshot produce the same rows."""
+    keys = {}
+    for name in ("me", "friend", "star"):
+        response = await client.post("/api/v1/agents/register", json={"name": name, "description": ""})
+        keys[name] = response.json()["api_key"]
+    await vouch(client, keys["me"], "friend", 5)
+    await vouch(client, keys["friend"], "star", 5)
+    
+    path = str(tmp_path / "graph.bin")
+    await write_snapshot(async_session, path)
+    written = await refresh_recommendations(async_session, workers=1, snapshot_path=path)
+    assert written == 1
+    
+    response = await client.get(
+        "/api/v1/agents/recommendations",
+        headers={"Authorization": f"Bearer {keys['me']}"}
+    )
+    assert [r["name"] for r in response.json()["recommendations"]] == ["star"]
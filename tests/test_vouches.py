@@ -150,3 +150,41 @@ async def test_vouch_to_nonexistent_agent(client, registered_agent):
     
     assert response.status_code == 404
 
+
+
+@pytest.mark.asyncio
+async def test_get_vouches_conditional(client, registered_agent, second_agent, third_agent):
+    """Test ETag revalidation of a vouch listing across vouches and flags."""
+    await client.post(
+        "/api/v1/vouches",
+        json={"to_name": "second_agent", "score": 4, "note": "Nice work"},
+        headers={"Authorization": f"Bearer {registered_agent['api_key']}"}
+    )
+    
+    response = await client.get("/api/v1/vouches", params={"target": "second_agent"})
+    etag = response.headers["etag"]
+    
+    response = await client.get(
+        "/api/v1/vouches",
+        params={"target": "second_agent"},
+        headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+    
+    # A flag on one of the agent's vouches changes the listing
+    vouch_id = (await client.get("/api/v1/vouches", params={"target": "second_agent"})).json()["vouches"][0]["id"]
+    await client.post(
+        f"/api/v1/vouches/{vouch_id}/flag",
+        json={"reason": "suspicious"},
+        headers={"Authorization": f"Bearer {third_agent['api_key']}"}
+    )
+    response = await client.get(
+        "/api/v1/vouches",
+        params={"target": "second_agent"},
+        headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["vouches"][0]["flags_count"] == 1